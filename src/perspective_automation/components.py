@@ -1,18 +1,24 @@
 import time
 import random
 from enum import Enum
-from typing import Union, List
+from dataclasses import dataclass
+from typing import Dict, Union, List
 from datetime import datetime
 
 from selenium.common.exceptions import (NoSuchElementException,
 										TimeoutException,
-										ElementClickInterceptedException)
+										ElementClickInterceptedException,
+										StaleElementReferenceException)
 
 from perspective_automation.perspective import (ComponentInteractionException,
 												PerspectiveComponent,
 												PerspectiveElement,
-												ElementNotFoundException)
+												ElementNotFoundException,
+												ElementNotUpdatedException,
+												PROPERTY_TREE_JS)
+from perspective_automation.measurement import LatencySummary, summarize
 from perspective_automation.selenium import Session, SelectAllKeys
+from selenium.webdriver import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webelement import WebElement
@@ -29,6 +35,137 @@ class AccordionHeaderType(Enum):
 	VIEW = 2
 
 
+class FormFieldType(Enum):
+	CHECKBOX = "checkbox"
+	TOGGLE = "toggle"
+	DROPDOWN = "dropdown"
+	DATETIME = "datetime"
+	NUMERIC = "numeric"
+	TEXTAREA = "textarea"
+	TEXT = "text"
+
+
+@dataclass
+class FormFieldResult:
+	"""Outcome of filling a single field with `Form.fill()`.
+
+	Attributes:
+		locator (tuple): The `(By, identifier)` locator of the field.
+		type (FormFieldType): The detected type of the field.
+		previous: The value read before filling.
+		value: The requested value.
+		changed (bool): Whether an interaction was issued for the field.
+		seconds (float): Time spent comparing and interacting with the field.
+		verified (bool): Whether the final state matches the request, None if it cannot be determined.
+		final: The value read after filling.
+	"""
+	locator: tuple
+	type: FormFieldType
+	previous: object
+	value: object
+	changed: bool
+	seconds: float
+	verified: Union[bool, None] = None
+	final: object = None
+
+
+@dataclass
+class ToggleState:
+	"""State of a CheckBox or ToggleSwitch as read by `getToggleStates()`.
+
+	Attributes:
+		checked (bool): Whether the component is checked or switched on.
+		indeterminate (bool): Whether a check box shows its indeterminate icon.
+		disabled (bool): Whether the component is disabled.
+	"""
+	checked: bool
+	indeterminate: bool
+	disabled: bool
+
+
+# Reads the state of a check box or toggle switch element, along with the element that should receive clicks.
+TOGGLE_STATE_JS = """
+	function classOf(el) {
+		return typeof el.className === 'string' ? el.className : el.getAttribute('class') || '';
+	}
+	function toggleState(el) {
+		var cls = classOf(el);
+		var disabled = cls.indexOf('disabled') !== -1 || el.getAttribute('aria-disabled') === 'true'
+			|| el.querySelector('[class*="disabled"]') !== null;
+		if (cls.indexOf('ia_toggleSwitch') !== -1 || el.querySelector('[class*="ia_toggleSwitch"]') !== null) {
+			var track = cls.indexOf('ia_toggleSwitch__track') !== -1 ? el : el.querySelector('.ia_toggleSwitch__track');
+			return {
+				checked: track !== null && classOf(track).indexOf('--selected') !== -1,
+				indeterminate: false,
+				disabled: disabled,
+				target: el
+			};
+		}
+		var icon = el.querySelector('.icon'), checked, indeterminate;
+		if (icon && icon.id) {
+			checked = icon.id === 'check_box';
+			indeterminate = icon.id === 'indeterminate_check_box';
+		} else {
+			checked = el.querySelector('[class*="ia_checkbox__checkedIcon"]') !== null;
+			indeterminate = el.querySelector('[class*="ia_checkbox__indeterminateIcon"]') !== null;
+		}
+		return {
+			checked: checked,
+			indeterminate: indeterminate,
+			disabled: disabled,
+			target: cls === 'ia_checkbox' ? el : el.querySelector('.ia_checkbox') || el
+		};
+	}
+"""
+
+TOGGLE_STATE_SCRIPT = TOGGLE_STATE_JS + """
+	return arguments[0].map(toggleState);
+"""
+
+
+def getToggleStates(session: Session, elements: List[WebElement]) -> List[ToggleState]:
+	"""Reads the state of any number of check boxes and toggle switches with a single script call.
+
+	Args:
+		session (Session): The session the elements belong to.
+		elements (List[WebElement]): The CheckBox or ToggleSwitch elements to read.
+
+	Returns:
+		List[ToggleState]: The state of each element, in the order of `elements`.
+	"""
+	states = session.driver.execute_script(TOGGLE_STATE_SCRIPT, elements)
+	return [ToggleState(state["checked"], state["indeterminate"], state["disabled"]) for state in states]
+
+
+def setToggleValues(session: Session, elements: List[WebElement], values: List[bool]) -> int:
+	"""Sets any number of check boxes and toggle switches, clicking only the ones whose state differs.
+
+	Args:
+		session (Session): The session the elements belong to.
+		elements (List[WebElement]): The CheckBox or ToggleSwitch elements to set.
+		values (List[bool]): The requested value of each element.
+
+	Returns:
+		int: The number of elements that were clicked.
+
+	Raises:
+		ComponentInteractionException: If an element that needs to change is disabled.
+	"""
+	if len(elements) != len(values):
+		raise ComponentInteractionException(
+			"Got %s values for %s elements" % (len(values), len(elements)))
+
+	states = session.driver.execute_script(TOGGLE_STATE_SCRIPT, elements)
+	clicks = 0
+	for state, value in zip(states, values):
+		if state["checked"] != value:
+			if state["disabled"]:
+				raise ComponentInteractionException("Cannot change the state of a disabled element")
+			state["target"].click()
+			clicks += 1
+	return clicks
+
+
 class AccordionHeader(PerspectiveElement):
 	"""Accordion Header is a Perspective Component that can be expanded or collapsed.
 
@@ -110,10 +247,58 @@ class AccordionHeader(PerspectiveElement):
 		return self.text
 
 
+@dataclass
+class AccordionHeaderState:
+	"""State of a single accordion header as read by `Accordion.getHeaderStates()`.
+
+	Attributes:
+		index (int): Position of the header in the accordion.
+		type (AccordionHeaderType): Whether the header is a text or a view header.
+		text (str): Text of the header, None for view headers.
+		expanded (bool): Whether the header is expanded.
+		rendered (bool): Whether the body of an expanded header is present in the page.
+	"""
+	index: int
+	type: AccordionHeaderType
+	text: Union[str, None]
+	expanded: bool
+	rendered: bool
+
+
 class Accordion(PerspectiveComponent):
 	"""The Accodion Perspective Component which consists of dropdown `AccordionHeader` elements and `AccordionBody` elements.
 	"""
 
+	# Reads type, text and expansion of every header, and whether the body of each expanded header is rendered.
+	HEADER_STATE_SCRIPT = """
+		function hasClass(el, name) {
+			return el !== null && (el.getAttribute('class') || '').indexOf(name) !== -1;
+		}
+		var headers = arguments[0].querySelectorAll('.ia_accordionComponent__header');
+		return Array.prototype.map.call(headers, function (header) {
+			var isText = header.querySelector('.ia_accordionComponent__header__text') !== null;
+			var chevron = header.querySelector('[class*="ia_accordionComponent__header__chevron"]');
+			var body = header.nextElementSibling;
+			if (!hasClass(body, 'ia_accordionComponent__body')) {
+				var parent = header.parentElement;
+				body = parent.querySelectorAll('.ia_accordionComponent__header').length === 1
+					? parent.querySelector('.ia_accordionComponent__body') : null;
+			}
+			return {
+				text: isText ? header.innerText : null,
+				view: !isText,
+				expanded: hasClass(chevron, 'expanded'),
+				rendered: body !== null
+			};
+		});
+	"""
+
+	# Clicks the headers at the given indexes in one script call.
+	CLICK_HEADERS_SCRIPT = """
+		var headers = arguments[0].querySelectorAll('.ia_accordionComponent__header');
+		arguments[1].forEach(function (index) { headers[index].click(); });
+	"""
+
 	# Lists are ordered, changeable, and allow duplicate members
 	def getHeaderElements(self) -> List[WebElement]:
 		"""Method that gets Accordion Headers as `WebElement` interface objects.
@@ -149,19 +334,9 @@ class Accordion(PerspectiveComponent):
 		Returns:
 			AccordianHeader (object): The AccordionHeader object that matches the searchText.
 		"""
-		headers = self.getAccordionHeaders()
-		header_dict = {}
-
-		for header in headers:
-			try:
-				header_dict[header.text] = header
-			except ComponentInteractionException:
-				""" This is not a text header """
-				pass
-
-		for key, value in header_dict.items():
-			if searchText in key:
-				return value
+		for state in self.getHeaderStates():
+			if state.type == AccordionHeaderType.TEXT and searchText in state.text:
+				return AccordionHeader(self.session, element=self.getHeaderElements()[state.index])
 		raise ElementNotFoundException(
 			"No header exists with the text \"%s\"." % searchText)
 
@@ -197,13 +372,7 @@ class Accordion(PerspectiveComponent):
 		Returns:
 			None
 		"""
-		headersElements = self.getHeaderElements()  # List of AccordionHeader WebElements
-		headers = [AccordionHeader(self.session, element=element)   # Stores WebElements as AccordionHeader objects
-				   for element in headersElements]
-
-		for header in headers:  # Iterates through AccordionHeader objects and expands them
-			if not header.isExpanded():
-				header.toggleExpansion()
+		self.setExpansions(True)
 
 	def expandBody(self, index: int) -> None:
 		"""Method that reveals body element of an AccordianHeader element.
@@ -214,12 +383,65 @@ class Accordion(PerspectiveComponent):
 		Returns:
 			None
 		"""
-		headersElements = self.getHeaderElements()
-		headers = [AccordionHeader(self.session, element=element)
-				   for element in headersElements]
+		self.setExpansions(True, [index])
+
+	def collapseAll(self) -> None:
+		"""Collapses all AccordionHeader elements in current Accordion.
+
+		Args:
+			None
+
+		Returns:
+			None
+		"""
+		self.setExpansions(False)
+
+	def getHeaderStates(self) -> List[AccordionHeaderState]:
+		"""Reads the type, text and expansion state of every header with a single script call.
+
+		Args:
+			None
+
+		Returns:
+			List[AccordionHeaderState]: The state of each header in the accordion, in page order.
+		"""
+		states = self.session.driver.execute_script(self.HEADER_STATE_SCRIPT, self)
+		return [AccordionHeaderState(index, AccordionHeaderType.VIEW if state["view"] else AccordionHeaderType.TEXT,
+									 state["text"], state["expanded"], state["rendered"])
+				for index, state in enumerate(states)]
+
+	def setExpansions(self, expanded: bool, indexes: List[int] = None, timeout_in_seconds=None) -> List[int]:
+		"""Expands or collapses a set of headers, clicking only those in the wrong state, then waits once for all of them.
+
+		Args:
+			expanded (bool): True to expand the headers, False to collapse them.
+			indexes (List[int]): Indexes of the headers to update, all headers if None.
+			timeout_in_seconds (int): Timeout for the headers and bodies to update, defaults to the session timeout.
+
+		Returns:
+			List[int]: Indexes of the headers that were clicked.
+
+		Raises:
+			ElementNotUpdatedException: If the headers do not reach the requested state within the timeout.
+		"""
+		states = self.waitForMethod(lambda x: self.getHeaderStates(), timeout_in_seconds,
+									ElementNotFoundException("Unable to find accordion headers"))
+		if indexes is None:
+			indexes = [state.index for state in states]
+		toClick = [index for index in indexes if states[index].expanded != expanded]
 
-		if not headers[index].isExpanded():
-			headers[index].toggleExpansion()
+		if toClick:
+			self.session.driver.execute_script(self.CLICK_HEADERS_SCRIPT, self, toClick)
+
+		def settled(driver):
+			states = self.getHeaderStates()
+			return all(states[index].expanded == expanded and (states[index].rendered or not expanded)
+					   for index in indexes)
+
+		raiseable_exception = ElementNotUpdatedException(
+			"Accordion headers %s did not %s" % (indexes, "expand" if expanded else "collapse"))
+		self.waitForMethod(settled, timeout_in_seconds, raiseable_exception)
+		return toClick
 
 
 class Button(PerspectiveComponent):
@@ -233,6 +455,21 @@ class CheckBox(PerspectiveComponent):
 		state (bool): Current state of the CheckBox.
 	"""
 
+	_click_target = None
+
+	def getState(self) -> ToggleState:
+		"""Gets the checked, indeterminate and disabled state of the checkbox with a single script call.
+
+		Args:
+			None
+
+		Returns:
+			ToggleState: The current state of the checkbox.
+		"""
+		state = self.session.driver.execute_script(TOGGLE_STATE_SCRIPT, [self])[0]
+		self._click_target = state["target"]
+		return ToggleState(state["checked"], state["indeterminate"], state["disabled"])
+
 	def getValue(self) -> bool:
 		"""Gets the current state of the checkbox.
 
@@ -240,34 +477,12 @@ class CheckBox(PerspectiveComponent):
 			None
 
 		Returns:
-			bool: True if the checkbox is checked, False if the checkbox is unchecked.
-
-		Raises:
-			NoSuchElementException: If the checkbox is not found after attepting to located by partial/class name.
+			bool: True if the checkbox is checked, False if the checkbox is unchecked, None if it is indeterminate.
 		"""
-		try:
-			checkboxId = self.find_element_by_class_name(
-				"icon").get_attribute("id")
-			checkboxState = {
-				"check_box": True,
-				"check_box_outline_blank": False
-				# "ia_checkbox__uncheckedIcon"
-			}
-			return checkboxState.get(checkboxId)
-
-		except NoSuchElementException:
-			"""Lets try another class set"""
-			try:
-				checkbox = self.find_element_by_partial_class_name(
-					"ia_checkbox__uncheckedIcon")
-				return False
-			except NoSuchElementException:
-				checkbox = self.find_element_by_partial_class_name(
-					"ia_checkbox__checkedIcon")
-				return True
-		except Exception as e:
-			""" Raise the original exception """
-			raise e
+		state = self.getState()
+		if state.indeterminate:
+			return None
+		return state.checked
 
 	def toggle(self) -> bool:
 		"""Toggles the state of the checkbox.
@@ -279,24 +494,38 @@ class CheckBox(PerspectiveComponent):
 			bool: The updated state of the checkbox after the toggle.
 
 		"""
-		if self.get_attribute('class') == 'ia_checkbox':
-			self.click()
-		else:
-			self.find_element_by_class_name("ia_checkbox").click()
+		if self._click_target is None:
+			self.getState()
+		try:
+			self._click_target.click()
+		except StaleElementReferenceException:
+			# The checkbox re-rendered since the target was read
+			self.getState()
+			self._click_target.click()
 
 		return self.getValue()
 
 	def setValue(self, value: bool) -> None:
-		"""Method to manually update the state of the checkbox to the specified value.
+		"""Method to manually update the state of the checkbox to the specified value. An indeterminate checkbox
+		may need more than one click to reach the value.
 
 		Args:
 			value (bool): The value to set the checkbox to.
 
 		Returns:
 			None
+
+		Raises:
+			ElementNotUpdatedException: If the checkbox does not reach the value after cycling through its states.
 		"""
-		if self.getValue() != value:
-			self.toggle()
+		current = self.getValue()
+		# Checked, unchecked and indeterminate are reached within two clicks
+		for _ in range(2):
+			if current == value:
+				return
+			current = self.toggle()
+		if current != value:
+			raise ElementNotUpdatedException("Checkbox did not reach the value %s." % value)
 
 
 class Dropdown(PerspectiveComponent):
@@ -307,6 +536,18 @@ class Dropdown(PerspectiveComponent):
 			Value: The value of the dropdown option that will be returned.
 	"""
 
+	# Reads the label of every option in the open options modal.
+	OPTION_TEXTS_SCRIPT = """
+		var options = document.querySelector('.iaDropdownCommon_options');
+		return options ? Array.prototype.map.call(options.children, function (option) {
+			return option.innerText.trim();
+		}) : null;
+	"""
+
+	OPTIONS_OPEN_SCRIPT = """
+		return document.querySelector('.iaDropdownCommon_options') !== null;
+	"""
+
 	def getValue(self) -> WebElement:
 		"""Method that will return the value of the targeted dropdown option.
 
@@ -417,9 +658,35 @@ class Dropdown(PerspectiveComponent):
 		Returns:
 			List[str]: A list of all the labels in the dropdown options.
 		"""
+		if self.session.preferBulkReads():
+			return self._readOptionTexts()
 		dropdown_options = self.getOptions()
 		return [dropdown_option.text for dropdown_option in dropdown_options]
 
+	def closeOptions(self) -> None:
+		"""Closes the options modal of the dropdown if it is open."""
+		if self.session.driver.execute_script(self.OPTIONS_OPEN_SCRIPT):
+			self.click()
+
+	def _readOptionTexts(self, timeout_in_seconds=None) -> List[str]:
+		"""Opens the options modal, reads every label with a single script call per poll and closes it again.
+		A modal that renders without options returns an empty list instead of waiting out the timeout."""
+		texts = []
+
+		def readTexts(driver):
+			found = driver.execute_script(self.OPTION_TEXTS_SCRIPT)
+			if found is None:
+				return False
+			texts.extend(found)
+			return True
+
+		self.click()
+		try:
+			self.waitForMethod(readTexts, timeout_in_seconds, ElementNotFoundException("Unable to find the dropdown options"))
+		finally:
+			self.closeOptions()
+		return texts
+
 	def setValues(self, option_texts: List[str]) -> None:
 		"""Set multiple values to a dropdown element. Specific to behavior for a multiSelect dropdown.
 
@@ -660,6 +927,431 @@ class DateTimeInput(PerspectiveComponent):
 		self._setDayInCurrentMonth(dateTime.day)
 
 
+class _VirtualizedList(PerspectiveComponent):
+	"""A private base class for components that only render the items inside their scroll viewport.
+	Items are harvested window by window, scrolling the component between script calls."""
+
+	item_selector = None
+	label_selector = None
+	expander_selector = None
+	cell_selector = None
+
+	# Helpers shared by the scripts below. Items are identified by their offset from the top of the scroll content.
+	LIST_FUNCTIONS = """
+		var root = arguments[0], itemSelector = arguments[1], labelSelector = arguments[2];
+		var expanderSelector = arguments[3];
+		var container = root;
+		for (var el = root.querySelector(itemSelector); el && el !== root.parentElement; el = el.parentElement) {
+			var overflow = getComputedStyle(el).overflowY;
+			if ((overflow === 'auto' || overflow === 'scroll') && el.scrollHeight > el.clientHeight) { container = el; break; }
+		}
+		var base = container.getBoundingClientRect().top - container.scrollTop;
+		var items = root.querySelectorAll(itemSelector);
+		function depthOf(item) {
+			if (item.hasAttribute('aria-level')) { return parseInt(item.getAttribute('aria-level'), 10) - 1; }
+			if (item.hasAttribute('data-depth')) { return parseInt(item.getAttribute('data-depth'), 10); }
+			var depth = 0;
+			for (var parent = item.parentElement; parent && parent !== root; parent = parent.parentElement) {
+				if (parent.matches(itemSelector)) { depth++; }
+			}
+			return depth;
+		}
+		function expansion(item) {
+			var expander = expanderSelector ? item.querySelector(expanderSelector) : null;
+			var expanded = item.getAttribute('aria-expanded');
+			if (expanded !== null) { return {expander: expander || item, expanded: expanded === 'true'}; }
+			if (!expander) { return null; }
+			return {expander: expander, expanded: (expander.getAttribute('class') || '').indexOf('expanded') !== -1};
+		}
+		function topOf(item) {
+			return Math.round(item.getBoundingClientRect().top - base);
+		}
+	"""
+
+	# Scrolls to the top when `reset` is set. Otherwise expands collapsed items of the window above `maxDepth`
+	# (-1 for all) and returns early when it clicked any, then reads the rendered items. With `advance` set it
+	# scrolls one viewport further once the window is fully rendered, so the next call reads the next window.
+	# With a `cellSelector`, items without a matching cell are skipped and the cell texts are read as well.
+	HARVEST_SCRIPT = LIST_FUNCTIONS + """
+		var maxDepth = arguments[4], reset = arguments[5], advance = arguments[6], cellSelector = arguments[7];
+		if (cellSelector) {
+			items = Array.prototype.filter.call(items, function (item) { return item.querySelector(cellSelector) !== null; });
+		}
+		if (reset) {
+			container.scrollTop = 0;
+			return {clicked: 0, items: [], atEnd: false};
+		}
+		if (maxDepth !== null) {
+			var clicked = 0;
+			for (var i = 0; i < items.length; i++) {
+				var state = expansion(items[i]);
+				if (state && !state.expanded && (maxDepth < 0 || depthOf(items[i]) < maxDepth)) {
+					state.expander.click();
+					clicked++;
+				}
+			}
+			if (clicked > 0) { return {clicked: clicked, rendered: items.length}; }
+		}
+		var bottom = 0;
+		var read = Array.prototype.map.call(items, function (item) {
+			var label = labelSelector ? item.querySelector(labelSelector) : null, state = expansion(item);
+			bottom = Math.max(bottom, item.getBoundingClientRect().bottom - base);
+			return {
+				top: topOf(item),
+				text: (label || item).innerText.trim(),
+				depth: depthOf(item),
+				expandable: state !== null,
+				expanded: state !== null && state.expanded,
+				cells: cellSelector ? Array.prototype.map.call(item.querySelectorAll(cellSelector), function (cell) {
+					return cell.innerText.trim();
+				}) : null
+			};
+		});
+		var atEnd = container.scrollTop + container.clientHeight >= container.scrollHeight - 1;
+		if (advance && !atEnd && bottom >= container.scrollTop + container.clientHeight - 1) {
+			container.scrollTop += Math.max(1, Math.floor(container.clientHeight * 0.9));
+		}
+		return {clicked: 0, items: read, atEnd: atEnd};
+	"""
+
+	# Scrolls the item at the given offset into view and clicks its expander. When the item is not rendered the
+	# container is scrolled to its offset instead and false is returned, so the next call finds it.
+	CLICK_EXPANDER_SCRIPT = LIST_FUNCTIONS + """
+		var offset = arguments[4];
+		for (var i = 0; i < items.length; i++) {
+			var state = expansion(items[i]);
+			if (state && topOf(items[i]) === offset) {
+				items[i].scrollIntoView({block: 'nearest'});
+				state.expander.click();
+				return true;
+			}
+		}
+		container.scrollTop = Math.max(0, offset - Math.floor(container.clientHeight / 2));
+		return false;
+	"""
+
+	def _harvest(self, max_depth=None, from_top: bool = True, timeout_in_seconds=None):
+		"""Yields every item of the component once, in order, scrolling through the virtualized viewport.
+		Only the current window is held in memory; items are told apart by their offset in the scroll content.
+
+		Args:
+			max_depth (int): Expand collapsed items above this depth before reading each window,
+				-1 to expand everything, None to leave expansion untouched.
+			from_top (bool): Whether to scroll back to the top before harvesting.
+			timeout_in_seconds (int): How long a window may stay unchanged before harvesting stops,
+				defaults to the session timeout.
+
+		Yields:
+			dict: `top`, `text`, `depth`, `expandable` and `expanded` of each item, and `cells` when the component
+				has a `cell_selector`.
+
+		Raises:
+			ElementNotUpdatedException: If no new items render within the timeout, including when expanders keep
+				being clicked without rendering new items.
+		"""
+		timeout = timeout_in_seconds or self.session.wait_timeout_in_seconds
+		last_top = None
+		rendered = None
+		stalled_since = time.monotonic()
+
+		if from_top:
+			self.session.driver.execute_script(self.HARVEST_SCRIPT, self, self.item_selector, self.label_selector,
+											   self.expander_selector, None, True, False, self.cell_selector)
+		while True:
+			window = self.session.driver.execute_script(self.HARVEST_SCRIPT, self, self.item_selector, self.label_selector,
+														self.expander_selector, max_depth, False, True, self.cell_selector)
+			if window["clicked"]:
+				# Expanding only counts as progress when it renders more items
+				if window["rendered"] != rendered:
+					rendered = window["rendered"]
+					stalled_since = time.monotonic()
+				elif time.monotonic() - stalled_since > timeout:
+					raise ElementNotUpdatedException(
+						"Component %s kept expanding items without rendering new ones" % self.id)
+				continue
+
+			progressed = False
+			for item in window["items"]:
+				if last_top is None or item["top"] > last_top:
+					last_top = item["top"]
+					progressed = True
+					yield item
+
+			if window["atEnd"] and not progressed:
+				return
+			if progressed:
+				stalled_since = time.monotonic()
+			elif time.monotonic() - stalled_since > timeout:
+				raise ElementNotUpdatedException(
+					"Component %s stopped rendering new items before reaching the end" % self.id)
+
+
+class FlexRepeater(_VirtualizedList):
+	"""Class that represents the Flex Repeater perspective component.
+	Instances are enumerated from the component's props, and rendered instances are read window by window."""
+
+	item_selector = ':scope > *'
+
+	INSTANCES_SCRIPT = PROPERTY_TREE_JS + """
+		var tree = propertyTree(arguments[0]);
+		return tree === null ? null : readProp(tree, 'instances') || [];
+	"""
+
+	def getInstanceParams(self) -> List[dict]:
+		"""Returns the parameters of every instance from the `instances` prop with a single script call,
+		including instances that are not rendered.
+
+		Raises:
+			ComponentInteractionException: If the component's props cannot be read.
+		"""
+		instances = self.session.driver.execute_script(self.INSTANCES_SCRIPT, self)
+		if instances is None:
+			raise ComponentInteractionException("Unable to read the instances of flex repeater %s" % self.id)
+		return instances
+
+	def getInstanceCount(self) -> int:
+		"""Returns the number of instances configured on the flex repeater."""
+		return len(self.getInstanceParams())
+
+	def getRenderedInstances(self) -> List[WebElement]:
+		"""Returns the instance views currently rendered by the flex repeater."""
+		return self.getChildren()
+
+	def iterInstanceTexts(self, timeout_in_seconds=None):
+		"""Yields the text of every instance in order, scrolling the repeater so virtualized instances render.
+
+		Yields:
+			str: The text of each instance.
+		"""
+		for item in self._harvest(timeout_in_seconds=timeout_in_seconds):
+			yield item["text"]
+
+
+class Form(PerspectiveComponent):
+	"""A container of input components that can be filled declaratively with `fill()`.
+
+	Fields are addressed by `(By, identifier)` tuples, or by a plain string which is treated as an element id.
+	"""
+
+	# Shared JS helpers: locating a field under the form root, classifying it and reading its current value.
+	FIELD_FUNCTIONS = TOGGLE_STATE_JS + PerspectiveComponent.INPUT_ELEMENT_JS + """
+		function hasClass(el, name) {
+			return classOf(el).indexOf(name) !== -1;
+		}
+		function locate(root, by, value) {
+			switch (by) {
+				case 'id': return root.querySelector('#' + CSS.escape(value));
+				case 'name': return root.querySelector('[name="' + CSS.escape(value) + '"]');
+				case 'class name': return root.getElementsByClassName(value)[0] || null;
+				case 'tag name': return root.getElementsByTagName(value)[0] || null;
+				case 'css selector': return root.querySelector(value);
+				case 'xpath': return document.evaluate(value, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+			}
+			return null;
+		}
+		var KINDS = [
+			['checkbox', 'ia_checkbox'],
+			['toggle', 'ia_toggleSwitch'],
+			['dropdown', 'iaDropdownCommon'],
+			['datetime', 'ia_dateTimeInputComponent'],
+			['numeric', 'ia-numeral-input'],
+			['numeric', 'ia_numeralInput'],
+			['textarea', 'ia_textArea']
+		];
+		function fieldKind(el) {
+			for (var i = 0; i < KINDS.length; i++) {
+				if (hasClass(el, KINDS[i][1])) { return KINDS[i][0]; }
+			}
+			for (var j = 0; j < KINDS.length; j++) {
+				if (el.querySelector('[class*="' + KINDS[j][1] + '"]')) { return KINDS[j][0]; }
+			}
+			if (el.tagName === 'TEXTAREA' || el.querySelector('textarea')) { return 'textarea'; }
+			return 'text';
+		}
+		function fieldState(el) {
+			var kind = fieldKind(el), value = null, target = el;
+			if (kind === 'checkbox' || kind === 'toggle') {
+				var state = toggleState(el);
+				value = state.checked;
+				target = state.target;
+			} else if (kind === 'dropdown') {
+				if (hasClass(el, 'iaDropdownCommon_multi-select')) {
+					value = Array.prototype.map.call(el.querySelectorAll('.ia_dropdown__valuePill'), function (pill) { return pill.innerText; });
+				} else {
+					var single = el.querySelector('.ia_dropdown__valueSingle');
+					value = single ? single.innerText : '';
+				}
+			} else {
+				target = inputOf(el);
+				value = target ? target.value : null;
+			}
+			return {kind: kind, value: value, target: target};
+		}
+	"""
+
+	DISCOVER_SCRIPT = FIELD_FUNCTIONS + """
+		var root = arguments[0], locators = arguments[1], fields = [];
+		for (var i = 0; i < locators.length; i++) {
+			var el = locate(root, locators[i][0], locators[i][1]);
+			if (el === null) { return {missing: locators[i]}; }
+			var state = fieldState(el);
+			state.element = el;
+			fields.push(state);
+		}
+		return {fields: fields};
+	"""
+
+	# Locates the fields again on every call, as a re-render may have replaced them, null for missing fields.
+	READ_SCRIPT = FIELD_FUNCTIONS + """
+		var root = arguments[0];
+		return arguments[1].map(function (locator) {
+			var el = locate(root, locator[0], locator[1]);
+			if (el === null) { return null; }
+			var state = fieldState(el);
+			return {kind: state.kind, value: state.value};
+		});
+	"""
+
+	def fill(self, values: dict, verify: bool = True, timeout_in_seconds=None) -> List[FormFieldResult]:
+		"""Sets every field of the form to the requested value, interacting only with the fields that differ.
+
+		All fields are located and read in one script call, changed fields are updated through their component
+		wrappers and the final state is confirmed with one batched read per poll.
+
+		Args:
+			values (dict): Mapping of locator to desired value. Locators are `(By, identifier)` tuples or element ids.
+				Values are `bool` for check boxes and toggle switches, `str` or `List[str]` for dropdowns, numbers for
+				numeric inputs, `datetime` for date time inputs and `str` for text fields.
+			verify (bool): Whether to wait for the final state to match the requested values.
+			timeout_in_seconds (int): Timeout for locating and verifying the fields, defaults to the session timeout.
+
+		Returns:
+			List[FormFieldResult]: One result per field, in the order of `values`.
+
+		Raises:
+			ElementNotFoundException: If a field cannot be located within the timeout.
+			ComponentInteractionException: If a date time input is given a value that is not a `datetime`, before
+				any field is changed.
+		"""
+		locators = [self._normalizeLocator(locator) for locator in values]
+		desired = list(values.values())
+		fields = self._discoverFields(locators, timeout_in_seconds)
+		for locator, value, field in zip(locators, desired, fields):
+			if FormFieldType(field["kind"]) == FormFieldType.DATETIME and not isinstance(value, datetime):
+				raise ComponentInteractionException(
+					"The date time input %s: %s can only be set to a datetime" % locator)
+
+		results = []
+		for locator, value, field in zip(locators, desired, fields):
+			kind = FormFieldType(field["kind"])
+			start = time.perf_counter()
+			changed = not self._valueMatches(kind, field["value"], value)
+			if changed:
+				self._applyValue(kind, field, value)
+			results.append(FormFieldResult(locator, kind, field["value"], value, changed, time.perf_counter() - start))
+
+		if verify:
+			self._verifyFields(results, timeout_in_seconds)
+		return results
+
+	def readValues(self, locators: list) -> List:
+		"""Reads the current value of several fields with a single script call.
+
+		Args:
+			locators (list): Locators of the fields, as accepted by `fill()`.
+
+		Returns:
+			List: The current value of each field, in the order of `locators`.
+		"""
+		fields = self._discoverFields([self._normalizeLocator(locator) for locator in locators], None)
+		return [field["value"] for field in fields]
+
+	def _normalizeLocator(self, locator) -> tuple:
+		"""Turns a bare identifier into an id locator."""
+		if isinstance(locator, tuple):
+			return locator
+		return (By.ID, locator)
+
+	def _discoverFields(self, locators: List[tuple], timeout_in_seconds) -> List[dict]:
+		"""Locates and reads all fields in one script call, polling until every locator resolves."""
+		result = {}
+
+		def discover(driver):
+			result.update(driver.execute_script(self.DISCOVER_SCRIPT, self, [list(locator) for locator in locators]))
+			return "fields" in result
+
+		missing = ElementNotFoundException("Unable to verify presence of form fields")
+		try:
+			self.waitForMethod(discover, timeout_in_seconds, missing)
+		except ElementNotFoundException:
+			raise ElementNotFoundException(
+				"Unable to verify presence of %s: %s" % tuple(result.get("missing", ("form field", ""))))
+		return result["fields"]
+
+	def _valueMatches(self, kind: FormFieldType, current, value) -> bool:
+		"""Compares a field's current value with a requested value according to the field type."""
+		if current is None:
+			return False
+		if kind in (FormFieldType.CHECKBOX, FormFieldType.TOGGLE):
+			return bool(current) == bool(value)
+		if kind == FormFieldType.DROPDOWN:
+			if isinstance(value, (list, tuple)):
+				return isinstance(current, list) and sorted(current) == sorted(value)
+			return current == str(value)
+		if kind == FormFieldType.NUMERIC:
+			try:
+				return float(str(current).replace(",", "")) == float(value)
+			except ValueError:
+				return False
+		if isinstance(value, datetime):
+			# The displayed format depends on the component configuration, so a datetime is always applied.
+			return False
+		return current == str(value)
+
+	def _applyValue(self, kind: FormFieldType, field: dict, value) -> None:
+		"""Updates one field through its component wrapper."""
+		element = field["element"]
+		if kind in (FormFieldType.CHECKBOX, FormFieldType.TOGGLE):
+			field["target"].click()
+		elif kind == FormFieldType.DROPDOWN:
+			dropdown = Dropdown(self.session, element=element)
+			if isinstance(value, (list, tuple)):
+				dropdown.clearData()
+				dropdown.setValues(list(value))
+			else:
+				dropdown.setValue(str(value))
+		elif kind == FormFieldType.DATETIME:
+			DateTimeInput(self.session, element=element).setDateTime(value)
+		else:
+			componentClass = {FormFieldType.NUMERIC: NumericInput, FormFieldType.TEXTAREA: TextArea}.get(kind, TextBox)
+			componentClass(self.session, element=element).fastFill(str(value), verify=False, inputElement=field["target"])
+
+	def _verifyFields(self, results: List[FormFieldResult], timeout_in_seconds) -> None:
+		"""Polls the final state of all fields with one script call per poll and records it on the results."""
+		locators = [list(result.locator) for result in results]
+		states = []
+
+		def allMatch(driver):
+			states[:] = [state or {"value": None} for state in driver.execute_script(self.READ_SCRIPT, self, locators)]
+			return all(self._resultMatches(result, state["value"]) is not False
+					   for result, state in zip(results, states))
+
+		try:
+			self.waitForMethod(allMatch, timeout_in_seconds, ElementNotUpdatedException())
+		except ElementNotUpdatedException:
+			""" Mismatches are reported on the results """
+
+		for result, state in zip(results, states):
+			result.final = state["value"]
+			result.verified = self._resultMatches(result, state["value"])
+
+	def _resultMatches(self, result: FormFieldResult, current) -> Union[bool, None]:
+		"""Returns whether a field holds its requested value, or None when that cannot be determined."""
+		if isinstance(result.value, datetime):
+			return None
+		return self._valueMatches(result.type, current, result.value)
+
+
 class Icon(PerspectiveComponent):
 	pass
 
@@ -680,6 +1372,18 @@ class MenuTree(PerspectiveComponent):
 	menu_invisible_class = "item-invisible"
 	back_button_class = "menu-back-action"
 
+	# Reads the label of every menu item, skipping items with the invisible class when one is given.
+	ITEM_TEXTS_SCRIPT = """
+		var items = arguments[0].getElementsByClassName(arguments[1]), labelClass = arguments[2], invisibleClass = arguments[3];
+		var texts = [];
+		for (var i = 0; i < items.length; i++) {
+			if (invisibleClass && items[i].classList.contains(invisibleClass)) { continue; }
+			var label = items[i].getElementsByClassName(labelClass)[0];
+			texts.push(label ? label.innerText : '');
+		}
+		return texts;
+	"""
+
 	def getItems(self, include_invisible=False) -> List[WebElement]:
 		"""Gets the menu items in the menu tree each as `WebElement`.
 
@@ -719,6 +1423,11 @@ class MenuTree(PerspectiveComponent):
 		Raises:
 			ElementNotFoundException: If the menu items cannot be found.        
 		"""
+		if self.session.preferBulkReads():
+			return self.waitForMethod(lambda driver: driver.execute_script(
+				self.ITEM_TEXTS_SCRIPT, self, self.menu_item_class, self.menu_label_class,
+				None if include_invisible else self.menu_invisible_class) or None,
+				exception=ElementNotFoundException("Unable to find menu items"))
 		try:
 			menu_items = self.getItems(include_invisible=include_invisible)
 			return [item.find_element(By.CLASS_NAME, self.menu_label_class).text for item in menu_items]
@@ -760,6 +1469,8 @@ class MenuTree(PerspectiveComponent):
 class NumericInput(PerspectiveComponent):
 	"""A perspective component class for interacting with numeric input components."""
 
+	value_prop = "value"
+
 	def getInputBox(self) -> WebElement:
 		"""Method that gets the input box of the numeric input component.
 
@@ -811,14 +1522,34 @@ class NumericInput(PerspectiveComponent):
 		"""Method to clear the value of the input box."""
 		self.send_keys(self.session.select_all_keys + Keys.DELETE)
 
-	def setValue(self, value: Union[int, float], withSubmit: bool = False, replace: bool = True) -> None:
-		if replace:
-			self.clearValue()
-		self.send_keys(str(value))
+	def setValue(self, value: Union[int, float], withSubmit: bool = False, replace: bool = True, fast: bool = False) -> None:
+		"""Method that sets the value of the numeric input.
+
+		Args:
+			value (Union[int, float]): The value to enter.
+			withSubmit (bool): Whether to submit the input box afterwards.
+			replace (bool): Whether to replace the current value.
+			fast (bool): Insert the value in one script call instead of typing it, see `fastFill()`.
+		"""
+		if fast:
+			self.fastFill(str(value), replace=replace)
+		else:
+			if replace:
+				self.clearValue()
+			self.send_keys(str(value))
 
 		if withSubmit:
 			self.getInputBox().submit()
 
+	def fastFillMatches(self, actual: str, expected: str) -> bool:
+		"""Compares numerically, as the input may reformat the value once it is committed."""
+		if actual is None:
+			return False
+		try:
+			return float(str(actual).replace(",", "")) == float(expected)
+		except ValueError:
+			return str(actual) == expected
+
 	def getValue(self, forceFloat: bool = False) -> Union[int, float]:
 		"""Method that collects value of the numeric input.
 
@@ -863,35 +1594,122 @@ class TabContainer(PerspectiveComponent):
 	active_tab_class_name = "tab-active"
 	tab_container_content_class_name = "ia_tabContainerComponent__content"
 
+	# Returns the text of every tab and the position of the active one.
+	TAB_INDEX_SCRIPT = """
+		var tabs = arguments[0].querySelectorAll('[class*="' + arguments[1] + '"]');
+		var names = [], active = -1;
+		for (var i = 0; i < tabs.length; i++) {
+			names.push(tabs[i].innerText.trim());
+			if ((tabs[i].getAttribute('class') || '').indexOf(arguments[2]) !== -1) { active = i; }
+		}
+		return {names: names, active: active};
+	"""
+
+	# Marks the view being replaced, so the switch can be detected in the page without holding element handles.
+	previous_content_attribute = "data-automation-previous-tab"
+
+	# Clicks the tab at a position if it still has the expected name and is not active yet, tagging the current
+	# content first. Returns the tab, or null when the tab at that position has a different name.
+	SWITCH_TAB_SCRIPT = """
+		var root = arguments[0], tabs = root.querySelectorAll('[class*="' + arguments[1] + '"]');
+		var tab = tabs[arguments[4]];
+		if (!tab || tab.innerText.trim() !== arguments[5]) { return null; }
+		if ((tab.getAttribute('class') || '').indexOf(arguments[2]) === -1) {
+			var content = root.querySelector('[class*="' + arguments[3] + '"]');
+			if (content && content.firstElementChild) { content.firstElementChild.setAttribute(arguments[6], ''); }
+			tab.click();
+		}
+		return tab;
+	"""
+
+	# Checks that the tab at a position is active and the content container shows a view without the previous
+	# content tag, locating both again on every call.
+	TAB_SWITCHED_SCRIPT = """
+		var root = arguments[0], tab = root.querySelectorAll('[class*="' + arguments[1] + '"]')[arguments[4]];
+		if (!tab || (tab.getAttribute('class') || '').indexOf(arguments[2]) === -1) { return null; }
+		var content = root.querySelector('[class*="' + arguments[3] + '"]');
+		var child = content ? content.firstElementChild : null;
+		return child !== null && !child.hasAttribute(arguments[5]) ? child : null;
+	"""
+
+	_tab_index = None
+
 	def getTabs(self) -> List[WebElement]:
 		"""Method that gets all the tabs in the tab container as a list of WebElements."""
 		return self.find_elements_by_partial_class_name(self.tab_class_name)
 
 	def getTabNames(self) -> List[str]:
 		"""Method that gets all the tab names in the tab container as a list of strings."""
-		tabs = self.getTabs()
-		return [tab.text for tab in tabs]
+		names = self.session.driver.execute_script(
+			self.TAB_INDEX_SCRIPT, self, self.tab_class_name, self.active_tab_class_name)["names"]
+		self._buildTabIndex(names)
+		return names
+
+	def getTabIndex(self, refresh: bool = False) -> dict:
+		"""Method that maps each tab name to its position, reading all tabs in a single script call.
+		The index is cached and reused by later calls until `refresh` is True.
+
+		Args:
+			refresh (bool): Whether to rebuild the index from the page.
+
+		Returns:
+			dict: Tab names mapped to their position in the tab container.
+		"""
+		if refresh or self._tab_index is None:
+			self.getTabNames()
+		return self._tab_index
+
+	def _buildTabIndex(self, names: List[str]) -> None:
+		"""Maps each tab name to its first position."""
+		self._tab_index = {}
+		for position, name in enumerate(names):
+			self._tab_index.setdefault(name, position)
 
 	def getActiveTab(self) -> WebElement:
 		"""Method that returns the active tab in the tab container as a WebElement."""
 		return self.find_element_by_partial_class_name(self.active_tab_class_name)
 
-	def switchToTab(self, name: str) -> WebElement:
-		"""Method that switches to the specified tab in the tab container."""
-		tabs = self.getTabs()
-		for tab in tabs:
-			if tab.text == name:
-				tab.click()
-				return tab
-		raise ElementNotFoundException(
-			"No tab exists with the name \"%s\"." % name)
+	def switchToTab(self, name: str, timeout_in_seconds=None) -> WebElement:
+		"""Method that switches to the specified tab in the tab container.
+		Waits until the tab is active and its content has replaced the previous content.
+
+		Args:
+			name (str): The name of the tab to switch to.
+			timeout_in_seconds (int): Timeout for the switch to complete, defaults to the session timeout.
+
+		Returns:
+			WebElement: The tab that was switched to.
+
+		Raises:
+			ElementNotFoundException: If no tab exists with the given name.
+			ElementNotUpdatedException: If the tab does not become active or its content does not appear.
+		"""
+		tab = position = None
+		for refresh in (False, True):
+			position = self.getTabIndex(refresh=refresh).get(name)
+			if position is not None:
+				tab = self.session.driver.execute_script(
+					self.SWITCH_TAB_SCRIPT, self, self.tab_class_name, self.active_tab_class_name,
+					self.tab_container_content_class_name, position, name, self.previous_content_attribute)
+			if tab:
+				break
+		if not tab:
+			raise ElementNotFoundException(
+				"No tab exists with the name \"%s\"." % name)
+
+		raiseable_exception = ElementNotUpdatedException(
+			"Tab \"%s\" did not become active" % name)
+		self.waitForMethod(lambda driver: driver.execute_script(
+			self.TAB_SWITCHED_SCRIPT, self, self.tab_class_name, self.active_tab_class_name,
+			self.tab_container_content_class_name, position, self.previous_content_attribute),
+			timeout_in_seconds, raiseable_exception)
+		return tab
 
 	def getContent(self) -> WebElement:
 		"""Method that returns the content of the active tab in the tab container as a WebElement."""
 		containerContent = PerspectiveElement(
-			self.session, self.find_element_by_partial_class_name(self.tab_container_content_class_name))
-		elemInContainer = containerContent.getFirstChild()
-		return elemInContainer
+			self.session, element=self.find_element_by_partial_class_name(self.tab_container_content_class_name))
+		return containerContent.getFirstChild()
 
 
 class _Pager(PerspectiveComponent):
@@ -1111,15 +1929,21 @@ class Popup(PerspectiveElement):
 	"""Perspective element class for popups."""
 
 	def __init__(self, session: Session, identifier: str = None) -> None:
-		super().__init__(session, By.ID, "popup-%s" % identifier)
+		self.identifier = identifier
+		if session.popups is not None:
+			super().__init__(session, element=session.popups.waitForOpen(identifier))
+		else:
+			super().__init__(session, By.ID, "popup-%s" % identifier)
 
 	def getRoot(self) -> WebElement:
 		"""Method that gets the root element of the popup."""
 		return self.parent.parent.parent
 
 	def close(self) -> None:
-		"""Method that closes the popup."""
+		"""Method that closes the popup, waiting for it to be removed when the session tracks popups."""
 		self.find_element_by_class_name("close-icon").click()
+		if self.session.popups is not None:
+			self.session.popups.waitForClose(self.identifier)
 
 
 class TableRowGroup(PerspectiveElement):
@@ -1152,6 +1976,24 @@ class Table(PerspectiveComponent):
 	pager_class_name = "ia_pager"
 	_pager = None
 
+	# Reads the column ids, header texts and cell texts of every rendered row.
+	ROWS_SCRIPT = """
+		var root = arguments[0], headerClass = arguments[1], rowClass = arguments[2], cellClass = arguments[3];
+		var headers = root.querySelectorAll('.' + headerClass);
+		var rows = Array.prototype.map.call(root.querySelectorAll('.' + rowClass), function (row) {
+			var cells = {};
+			Array.prototype.forEach.call(row.querySelectorAll('.' + cellClass), function (cell) {
+				cells[cell.getAttribute('data-column-id')] = (cell.querySelector('.content') || cell).innerText.trim();
+			});
+			return cells;
+		});
+		return {
+			columns: Array.prototype.map.call(headers, function (header) { return header.getAttribute('data-column-id'); }),
+			headers: Array.prototype.map.call(headers, function (header) { return header.innerText; }),
+			rows: rows
+		};
+	"""
+
 	def __init__(self, session: Session, locator: By = ..., identifier: str = None, element: WebElement = None, parent: WebElement = None, timeout_in_seconds=None):
 		super().__init__(session, locator, identifier, element, parent, timeout_in_seconds)
 		# Locating web element pager on the table perspective component
@@ -1227,6 +2069,8 @@ class Table(PerspectiveComponent):
 
 	def getHeaderTexts(self) -> List[str]:
 		"""Method that gets the text of the headers as a list of strings."""
+		if self.session.preferBulkReads():
+			return [text.strip() for text in self._readRows(self.header_cell_class_name)["headers"]]
 		headerElements = self.waitForElements(
 			By.CLASS_NAME, self.header_cell_class_name)
 		return [element.text for element in headerElements]
@@ -1278,11 +2122,15 @@ class Table(PerspectiveComponent):
 
 	def getColumnTextsAsList(self, dataId: str = None, columnIndex: int = None) -> List[str]:
 		"""Returns a list of strings for the column specified by dataId or columnIndex."""
+		if dataId and self.session.preferBulkReads():
+			return [row[dataId] for row in self._readRows()["rows"] if dataId in row]
 		columnCells = self.getColumnAsList(dataId, columnIndex)
 		return [cell.text for cell in columnCells]
 
 	def getCurrentPageData(self) -> List[dict]:
 		"""Collects the data from the current page of the table and returns it as a list of dictionaries."""
+		if self.session.preferBulkReads():
+			return self._readRows()["rows"]
 		rowGroups = self.getRowData()
 		rows = []
 
@@ -1360,10 +2208,271 @@ class Table(PerspectiveComponent):
 		except ElementNotFoundException as e:
 			raise e
 
+	def _readRows(self, wait_class_name: str = None) -> dict:
+		"""Reads the headers and rendered rows of the table with a single script call, once an element of
+		`wait_class_name` has rendered, a row group by default."""
+		self.waitForElements(By.CLASS_NAME, wait_class_name or self.row_group_class_name)
+		return self.session.driver.execute_script(
+			self.ROWS_SCRIPT, self, self.header_cell_class_name, self.row_group_class_name, self.cell_class_name)
+
+
+@dataclass
+class AlarmIngestionReport:
+	"""Result of an `AlarmStatusTable` ingestion measurement.
+
+	Attributes:
+		appeared (dict): Row key mapped to the epoch time in seconds at which the row first rendered.
+		latencies (dict): Row key mapped to the seconds between the alarm being raised and its row rendering.
+		summary (LatencySummary): Distribution of `latencies`.
+		rate (float): Rows rendered per second over the measurement.
+	"""
+	appeared: dict
+	latencies: dict
+	summary: LatencySummary
+	rate: float
+
+
+class AlarmStatusTable(Table):
+	"""Perspective component class for the Alarm Status Table.
+	Rows are read in bulk, and acknowledge/shelve act on several rows at once."""
+
+	state_column_id = "state"
+	key_column_id = "source"
+	acknowledge_action_text = "Acknowledge"
+	shelve_action_text = "Shelve"
+	active_tab_text = "Active"
+	shelved_tab_text = "Shelved"
+
+	# Returns the rendered rows at the given indexes.
+	ROW_ELEMENTS_SCRIPT = """
+		var rows = arguments[0].querySelectorAll('.' + arguments[1]);
+		return arguments[2].map(function (index) { return rows[index] || null; });
+	"""
+
+	# Clicks the first element whose text, title or aria-label equals the given text, searching `arguments[0]`.
+	CLICK_BY_TEXT_SCRIPT = """
+		var text = arguments[1].toLowerCase();
+		var candidates = arguments[0].querySelectorAll('button, [role="button"], [role="tab"], [title], [aria-label], [class*="tab"], [class*="option"], [class*="action"]');
+		for (var i = 0; i < candidates.length; i++) {
+			var el = candidates[i];
+			var labels = [el.innerText, el.getAttribute('title'), el.getAttribute('aria-label')];
+			for (var j = 0; j < labels.length; j++) {
+				if (labels[j] && labels[j].trim().toLowerCase() === text) {
+					el.click();
+					return true;
+				}
+			}
+		}
+		return false;
+	"""
+
+	# Records the epoch time at which each row key first renders, ignoring rows present when the observer starts.
+	START_INGESTION_SCRIPT = """
+		var root = arguments[0], rowClass = arguments[1], cellSelector = arguments[2];
+		if (root.__ingestionObserver) { root.__ingestionObserver.disconnect(); }
+		var state = {seen: {}, known: {}};
+		function scan(record) {
+			var rows = root.getElementsByClassName(rowClass), now = Date.now();
+			for (var i = 0; i < rows.length; i++) {
+				var cell = rows[i].querySelector(cellSelector);
+				var key = cell ? cell.innerText.trim() : null;
+				if (key && !state.known[key]) {
+					state.known[key] = true;
+					if (record) { state.seen[key] = now; }
+				}
+			}
+		}
+		scan(false);
+		root.__ingestion = state;
+		root.__ingestionObserver = new MutationObserver(function () { scan(true); });
+		root.__ingestionObserver.observe(root, {childList: true, subtree: true, characterData: true});
+		return Date.now();
+	"""
+
+	STOP_INGESTION_SCRIPT = """
+		var root = arguments[0];
+		if (!root.__ingestionObserver) { return null; }
+		root.__ingestionObserver.disconnect();
+		root.__ingestionObserver = null;
+		return {seen: root.__ingestion.seen, stopped: Date.now()};
+	"""
+
+	_ingestion_started = None
+
+	def getAlarms(self) -> List[dict]:
+		"""Reads the alarms rendered on the current page and tab with a single script call.
+
+		Returns:
+			List[dict]: One dictionary per row, keyed by column id.
+		"""
+		data = self.session.driver.execute_script(
+			self.ROWS_SCRIPT, self, self.header_cell_class_name, self.row_group_class_name, self.cell_class_name)
+		return data["rows"]
+
+	def getAllAlarms(self, timeout_in_seconds=None) -> List[dict]:
+		"""Reads the alarms of every page of the current tab, with one script call per page.
+		After each page turn the rows are only read once they differ from the rows of the previous page.
+
+		Args:
+			timeout_in_seconds (int): Timeout for the rows to change after a page turn, defaults to the session timeout.
+
+		Raises:
+			ElementNotUpdatedException: If the rows do not change after a page turn.
+		"""
+		if not self.hasPager():
+			return self.getAlarms()
+
+		START_PAGE = self.getCurrentPage()
+		if START_PAGE != 1:
+			self._turnPage(self.firstPage, timeout_in_seconds)
+		rows: List[dict] = []
+		while True:
+			rows.extend(self.getAlarms())
+			try:
+				self._turnPage(self.nextPage, timeout_in_seconds)
+			except ComponentInteractionException:
+				break
+		if self.getCurrentPage() != START_PAGE:
+			self.jumpToPage(START_PAGE)
+		return rows
+
+	def getActiveAlarms(self) -> List[dict]:
+		"""Returns the rendered alarms whose state is active."""
+		return [row for row in self.getAlarms() if "Active" in row.get(self.state_column_id, "")]
+
+	def getAcknowledgedAlarms(self) -> List[dict]:
+		"""Returns the rendered alarms whose state is acknowledged."""
+		return [row for row in self.getAlarms()
+				if "Acknowledged" in row.get(self.state_column_id, "").replace("Unacknowledged", "")]
+
+	def getUnacknowledgedAlarms(self) -> List[dict]:
+		"""Returns the rendered alarms whose state is unacknowledged."""
+		return [row for row in self.getAlarms() if "Unacknowledged" in row.get(self.state_column_id, "")]
+
+	def getShelvedAlarms(self, timeout_in_seconds=None) -> List[dict]:
+		"""Switches to the shelved tab, reads its alarms and switches back to the active tab.
+
+		Args:
+			timeout_in_seconds (int): How long to wait for shelved alarms to render, defaults to the session timeout.
+				An empty shelved tab is only reported once this has passed.
+		"""
+		self._clickByText(self, self.shelved_tab_text)
+		try:
+			return self.waitForMethod(lambda x: self.getAlarms() or None, timeout_in_seconds, ElementNotFoundException())
+		except ElementNotFoundException:
+			return []
+		finally:
+			self._clickByText(self, self.active_tab_text)
+
+	def acknowledge(self, rowIndexes: List[int]) -> None:
+		"""Selects the rows at the given indexes in one action sequence and acknowledges them together.
+
+		Args:
+			rowIndexes (List[int]): Indexes of the rendered rows to acknowledge.
+		"""
+		self.selectRows(rowIndexes)
+		self._clickByText(self, self.acknowledge_action_text)
+
+	def shelve(self, rowIndexes: List[int], duration: str) -> None:
+		"""Selects the rows at the given indexes in one action sequence and shelves them together.
+
+		Args:
+			rowIndexes (List[int]): Indexes of the rendered rows to shelve.
+			duration (str): Text of the shelve duration option to choose, e.g. "1 hour".
+		"""
+		self.selectRows(rowIndexes)
+		self._clickByText(self, self.shelve_action_text)
+		raiseable_exception = ElementNotFoundException("Shelve option not found: %s" % duration)
+		self.waitForMethod(lambda driver: driver.execute_script(
+			self.CLICK_BY_TEXT_SCRIPT, driver.find_element_by_tag_name("body"), duration), exception=raiseable_exception)
+
+	def selectRows(self, rowIndexes: List[int]) -> None:
+		"""Selects several rendered rows with a single action sequence, holding CONTROL after the first click.
+
+		Raises:
+			ComponentInteractionException: If an index is out of range.
+		"""
+		rows = self.session.driver.execute_script(self.ROW_ELEMENTS_SCRIPT, self, self.row_group_class_name, rowIndexes)
+		if None in rows:
+			raise ComponentInteractionException(
+				"Row index out of range: %s" % rowIndexes[rows.index(None)])
+
+		actions = ActionChains(self.session.driver)
+		for position, row in enumerate(rows):
+			if position == 1:
+				actions.key_down(Keys.CONTROL)
+			actions.click(row)
+		if len(rows) > 1:
+			actions.key_up(Keys.CONTROL)
+		actions.perform()
+
+	def startIngestionMeasurement(self) -> float:
+		"""Starts recording when new alarm rows render, using a MutationObserver in the page.
+		Rows already present are ignored, rows are identified by the `key_column_id` column.
+
+		Returns:
+			float: The epoch time in seconds at which recording started.
+		"""
+		cellSelector = '.%s[data-column-id="%s"]' % (self.cell_class_name, self.key_column_id)
+		started = self.session.driver.execute_script(
+			self.START_INGESTION_SCRIPT, self, self.row_group_class_name, cellSelector)
+		self._ingestion_started = started / 1000
+		return self._ingestion_started
+
+	def stopIngestionMeasurement(self, raised_at: dict = None) -> AlarmIngestionReport:
+		"""Stops recording and reports how quickly the new alarms rendered.
+
+		Args:
+			raised_at (dict): Row key mapped to the epoch time in seconds at which the alarm was raised.
+				When omitted, latencies are measured from the start of the measurement.
+
+		Returns:
+			AlarmIngestionReport: When each row appeared, the per-row latencies and their distribution.
+
+		Raises:
+			ComponentInteractionException: If no measurement is running.
+		"""
+		result = self.session.driver.execute_script(self.STOP_INGESTION_SCRIPT, self)
+		if result is None:
+			raise ComponentInteractionException("No ingestion measurement is running")
+
+		appeared = {key: seen / 1000 for key, seen in result["seen"].items()}
+		if raised_at is None:
+			latencies = {key: seen - self._ingestion_started for key, seen in appeared.items()}
+		else:
+			latencies = {key: appeared[key] - raised for key, raised in raised_at.items() if key in appeared}
+		duration = result["stopped"] / 1000 - self._ingestion_started
+		self._ingestion_started = None
+		return AlarmIngestionReport(appeared, latencies, summarize(list(latencies.values())),
+									len(appeared) / duration if duration > 0 else 0.0)
+
+	def _turnPage(self, turn, timeout_in_seconds=None) -> None:
+		"""Turns the page and waits until the rendered rows differ from the rows shown before.
+
+		Raises:
+			ComponentInteractionException: If the page cannot be turned.
+			ElementNotUpdatedException: If the rows do not change within the timeout.
+		"""
+		before = self.getAlarms()
+		turn()
+		raiseable_exception = ElementNotUpdatedException("The rows of alarm table %s did not change page" % self.id)
+		self.waitForMethod(lambda driver: self.getAlarms() != before, timeout_in_seconds, raiseable_exception)
+
+	def _clickByText(self, parent: WebElement, text: str) -> None:
+		"""Clicks the first element under `parent` labelled with `text`.
+
+		Raises:
+			ElementNotFoundException: If no such element exists.
+		"""
+		if not self.session.driver.execute_script(self.CLICK_BY_TEXT_SCRIPT, parent, text):
+			raise ElementNotFoundException("No element found with the text \"%s\"." % text)
+
 
 class TextArea(PerspectiveComponent):
 	"""Class that represents a text area perspective component."""
 
+	value_prop = "text"
+
 	def clearText(self) -> None:
 		self.selectAll()
 		self.send_keys(Keys.DELETE)
@@ -1372,8 +2481,18 @@ class TextArea(PerspectiveComponent):
 		"""Method that returns True if the text area is readonly, False otherwise."""
 		return self.get_attribute("readonly") == "true"
 
-	def setText(self, text: str, replace: bool = True) -> None:
-		"""Method that sets the text of the text area."""
+	def setText(self, text: str, replace: bool = True, fast: bool = False) -> None:
+		"""Method that sets the text of the text area.
+
+		Args:
+			text (str): The text to enter.
+			replace (bool): Whether to replace the current text.
+			fast (bool): Insert the text in one script call instead of typing it, see `fastFill()`.
+		"""
+		if fast:
+			self.fastFill(text, replace=replace)
+			return
+
 		if replace:
 			self.clearText()
 
@@ -1383,31 +2502,124 @@ class TextArea(PerspectiveComponent):
 class TextBox(PerspectiveComponent):
 	"""Class that represents a text box perspective component."""
 
+	value_prop = "text"
+
 	def clearText(self) -> None:
 		"""Method that clears the text of the text box."""
 		self.click()
 		self.selectAll()
 		self.send_keys(Keys.DELETE)
 
-	def setText(self, text: str, withSubmit: bool = False, replace: bool = True) -> None:
-		"""Method that sets the text of the text box with provided text argument."""
-		if replace:
-			self.clearText()
+	def setText(self, text: str, withSubmit: bool = False, replace: bool = True, fast: bool = False) -> None:
+		"""Method that sets the text of the text box with provided text argument.
+
+		Args:
+			text (str): The text to enter.
+			withSubmit (bool): Whether to submit the text box afterwards.
+			replace (bool): Whether to replace the current text.
+			fast (bool): Insert the text in one script call instead of typing it, see `fastFill()`.
+		"""
+		if fast:
+			self.fastFill(text, replace=replace)
 		else:
-			self.click()
-		self.send_keys(str(text))
+			if replace:
+				self.clearText()
+			else:
+				self.click()
+			self.send_keys(str(text))
 		if withSubmit:
 			self.submit()
 
 
+class TimeSeriesChart(PerspectiveComponent):
+	"""Class that represents the Time Series Chart and XY Chart perspective components.
+	Reads the plotted data from the component's props instead of the rendered SVG."""
+
+	# Reads the chart's props through the component's property tree and converts every
+	# pen into an array of [timestamp in ms, value] pairs in the browser, so only plain arrays are transferred.
+	SERIES_SCRIPT = PROPERTY_TREE_JS + """
+		var tree = propertyTree(arguments[0]);
+		if (tree === null) { return null; }
+		function read(path) {
+			return readProp(tree, path);
+		}
+		function time(value) {
+			var parsed = typeof value === 'number' ? value : Date.parse(value);
+			return isNaN(parsed) ? value : parsed;
+		}
+		function pairs(rows, x, y) {
+			var out = new Array(rows.length);
+			for (var i = 0; i < rows.length; i++) { out[i] = [time(rows[i][x]), rows[i][y]]; }
+			return out;
+		}
+		var pens = {}, series = read('series') || [], dataSources = read('dataSources');
+		if (dataSources) {
+			series.forEach(function (entry, index) {
+				var fields = entry.data || {}, rows = dataSources[fields.source] || [];
+				pens[entry.name || String(index)] = pairs(rows, fields.x, fields.y);
+			});
+			return pens;
+		}
+		series.forEach(function (dataset, index) {
+			var name = dataset.name || String(index), rows = Array.isArray(dataset) ? dataset : dataset.data || [];
+			if (rows.length === 0) { return; }
+			var columns = Object.keys(rows[0]);
+			var timeKey = ['t', 't_stamp', 'time', 'timestamp'].filter(function (column) {
+				return columns.indexOf(column) !== -1;
+			})[0] || columns[0];
+			columns.forEach(function (column) {
+				if (column !== timeKey) { pens[name + '/' + column] = pairs(rows, timeKey, column); }
+			});
+		});
+		return pens;
+	"""
+
+	def getSeries(self) -> Dict[str, List[List[float]]]:
+		"""Reads every plotted pen with a single script call.
+
+		Time Series Chart pens are named `<series name>/<column>`, XY Chart pens by their series name, reading the
+		data source and columns bound in `series[i].data`. Each pen is a list of `[timestamp, value]` pairs with the
+		timestamp in epoch milliseconds, which can be handed to `numpy.array()` directly. XY Chart x values that are
+		not dates are kept as they are.
+
+		Returns:
+			Dict[str, List[List[float]]]: The data of each pen.
+
+		Raises:
+			ComponentInteractionException: If the chart's props cannot be read.
+		"""
+		pens = self.session.driver.execute_script(self.SERIES_SCRIPT, self)
+		if pens is None:
+			raise ComponentInteractionException("Unable to read the series of chart %s" % self.id)
+		return pens
+
+	def getPenNames(self) -> List[str]:
+		"""Method that returns the names of all pens in the chart."""
+		return list(self.getSeries())
+
+	def getPen(self, name: str) -> List[List[float]]:
+		"""Method that returns the `[timestamp, value]` pairs of a single pen.
+
+		Raises:
+			ElementNotFoundException: If the chart has no pen with the given name.
+		"""
+		pens = self.getSeries()
+		if name not in pens:
+			raise ElementNotFoundException("No pen exists with the name \"%s\"." % name)
+		return pens[name]
+
+
 class ToggleSwitch(PerspectiveComponent):
 	"""Class that represents a toggle switch perspective component.
 	Can be used to toggle the switch and get/set the current value."""
 
+	def getState(self) -> ToggleState:
+		"""Method that reads the selected and disabled state of the toggle switch with a single script call."""
+		return getToggleStates(self.session, [self])[0]
+
 	def getValue(self) -> bool:
-		track: WebElement = self.find_element_by_class_name(
-			"ia_toggleSwitch__track")
-		return "--selected" in track.get_attribute("class")
+		"""Method that returns True if the toggle switch is selected."""
+		return self.getState().checked
 
 	def toggle(self) -> bool:
 		"""Method that toggles the toggle switch."""
@@ -1420,10 +2632,205 @@ class ToggleSwitch(PerspectiveComponent):
 			self.toggle()
 
 
+@dataclass
+class TreeNode:
+	"""A node of a Tree component as read by `Tree.getVisibleNodes()` or `Tree.iterNodes()`.
+
+	Attributes:
+		path (List[str]): Labels of the node's ancestors followed by its own label.
+		label (str): The label of the node.
+		depth (int): Depth of the node, 0 for root items.
+		expandable (bool): Whether the node has children.
+		expanded (bool): Whether the node is expanded.
+	"""
+	path: List[str]
+	label: str
+	depth: int
+	expandable: bool
+	expanded: bool
+
+
+class Tree(_VirtualizedList):
+	"""Class that represents the Tree perspective component."""
+
+	item_selector = '[role="treeitem"], .ia_treeComponent__node'
+	label_selector = '.ia_treeComponent__node__label'
+	expander_selector = '.ia_treeComponent__node__expandIcon'
+
+	def getVisibleNodes(self) -> List[TreeNode]:
+		"""Reads the nodes rendered in the tree's viewport with a single script call, without scrolling or expanding.
+		Paths of nodes whose ancestors are scrolled out of view start with None."""
+		window = self.session.driver.execute_script(self.HARVEST_SCRIPT, self, self.item_selector,
+													self.label_selector, self.expander_selector, None, False, False)
+		return [node for node, item in self._toNodes(window["items"])]
+
+	def iterNodes(self, expand: bool = True, max_depth: int = None, timeout_in_seconds=None):
+		"""Walks the whole tree in order, expanding branches as they come into view and scrolling through the
+		virtualized viewport. Nodes are yielded as they are read, so memory stays bounded by the tree's depth.
+
+		Args:
+			expand (bool): Whether to expand collapsed branches.
+			max_depth (int): Do not expand nodes at this depth or deeper, None for no limit.
+			timeout_in_seconds (int): How long the tree may stop rendering new nodes, defaults to the session timeout.
+
+		Yields:
+			TreeNode: Every node of the tree.
+		"""
+		if not expand:
+			depth = None
+		elif max_depth is None:
+			depth = -1
+		else:
+			depth = max_depth
+		for node, _ in self._toNodes(self._harvest(depth, timeout_in_seconds=timeout_in_seconds)):
+			yield node
+
+	def expandPath(self, path: List[str], timeout_in_seconds=None) -> TreeNode:
+		"""Expands the branches along a path of labels, only clicking the ones that are collapsed.
+
+		Args:
+			path (List[str]): Labels from a root item down to the node to reveal.
+			timeout_in_seconds (int): Timeout for each branch to render its children, defaults to the session timeout.
+
+		Returns:
+			TreeNode: The node at the end of the path.
+
+		Raises:
+			ElementNotFoundException: If a label on the path does not exist.
+			ComponentInteractionException: If the expander of a branch on the path cannot be clicked.
+		"""
+		for depth in range(1, len(path) + 1):
+			node, item = self._findNode(path[:depth], timeout_in_seconds)
+			if depth < len(path) and node.expandable and not node.expanded:
+				raiseable_exception = ComponentInteractionException(
+					"Unable to expand \"%s\" of tree path \"%s\"." % (path[depth - 1], "/".join(path)))
+				self.waitForMethod(lambda driver: driver.execute_script(
+					self.CLICK_EXPANDER_SCRIPT, self, self.item_selector, self.label_selector, self.expander_selector,
+					item["top"]), timeout_in_seconds, raiseable_exception)
+		return node
+
+	def _findNode(self, path: List[str], timeout_in_seconds=None) -> tuple:
+		"""Scans the tree from the top without expanding anything until the node at `path` is found, waiting for
+		the node to render after its parent was expanded."""
+		def find(driver):
+			for node, item in self._toNodes(self._harvest(timeout_in_seconds=timeout_in_seconds)):
+				if node.path == path:
+					return node, item
+			return False
+
+		raiseable_exception = ElementNotFoundException("No tree node exists at \"%s\"." % "/".join(path))
+		return self.waitForMethod(find, timeout_in_seconds, raiseable_exception)
+
+	def _toNodes(self, items):
+		"""Turns harvested items into TreeNodes paired with their item, tracking the ancestor labels by depth."""
+		ancestors = []
+		for item in items:
+			depth = item["depth"]
+			del ancestors[depth:]
+			ancestors.extend([None] * (depth - len(ancestors)))
+			ancestors.append(item["text"])
+			yield TreeNode(list(ancestors), item["text"], depth, item["expandable"], item["expanded"]), item
+
+
 class View(PerspectiveElement):
 	pass
 
 
+@dataclass
+class DashboardArea:
+	"""A rectangle of the dashboard grid in CSS grid-area coordinates, the end row and column are exclusive.
+
+	Attributes:
+		row_start (int): First row of the area, starting at 1.
+		column_start (int): First column of the area, starting at 1.
+		row_end (int): Row after the last row of the area.
+		column_end (int): Column after the last column of the area.
+		element (WebElement): The cell or widget element occupying the area.
+	"""
+	row_start: int
+	column_start: int
+	row_end: int
+	column_end: int
+	element: WebElement = None
+
+	def contains(self, row: int, col: int) -> bool:
+		"""Returns True if the given cell lies within the area."""
+		return self.row_start <= row < self.row_end and self.column_start <= col < self.column_end
+
+
+class DashboardGrid(object):
+	"""Snapshot of a dashboard's grid, its empty cells and its widgets, read by `Dashboard.getGrid()`.
+
+	Cells are indexed by `(row, col)` and widget occupancy is tracked per cell, so lookups do not touch the browser.
+	"""
+
+	def __init__(self, rows: int, columns: int, cells: List[DashboardArea], widgets: List[DashboardArea]) -> None:
+		self.rows = rows
+		self.columns = columns
+		self.widgets = widgets
+		self.cells = {(cell.row_start, cell.column_start): cell.element for cell in cells}
+		self.occupied = {}
+		for widget in widgets:
+			self.occupy(widget)
+
+	def occupy(self, area: DashboardArea) -> None:
+		"""Marks every cell of the area as used by the area's element.
+
+		Raises:
+			ValueError: If the area has no element, as its cells would be taken without a widget to return for them.
+		"""
+		if area.element is None:
+			raise ValueError("Cannot occupy (%s, %s) without a widget element." % (area.row_start, area.column_start))
+		for row in range(area.row_start, area.row_end):
+			for col in range(area.column_start, area.column_end):
+				self.occupied[(row, col)] = area.element
+
+	def inBounds(self, row: int, col: int) -> bool:
+		"""Returns True if the cell lies within the grid."""
+		return 1 <= row <= self.rows and 1 <= col <= self.columns
+
+	def getCell(self, row: int, col: int) -> Union[WebElement, None]:
+		"""Returns the empty cell element at the given position, or None if there is none."""
+		return self.cells.get((row, col))
+
+	def getWidgetAt(self, row: int, col: int) -> Union[WebElement, None]:
+		"""Returns the widget element covering the given cell, or None if the cell is free."""
+		return self.occupied.get((row, col))
+
+	def isFree(self, row: int, col: int, row_span: int = 1, col_span: int = 1) -> bool:
+		"""Returns True if every cell of the area starting at `(row, col)` is inside the grid and unoccupied."""
+		if not (self.inBounds(row, col) and self.inBounds(row + row_span - 1, col + col_span - 1)):
+			return False
+		return all((r, c) not in self.occupied
+				   for r in range(row, row + row_span) for c in range(col, col + col_span))
+
+	def getFreeCells(self, row_span: int = 1, col_span: int = 1) -> List[tuple]:
+		"""Returns the `(row, col)` positions where an area of the given span fits, in row-major order."""
+		return [(row, col) for row in range(1, self.rows + 1) for col in range(1, self.columns + 1)
+				if self.isFree(row, col, row_span, col_span)]
+
+	def findFreeArea(self, row_span: int = 1, col_span: int = 1) -> Union[tuple, None]:
+		"""Returns the first `(row, col)` position where an area of the given span fits, or None if the grid is full."""
+		freeCells = self.getFreeCells(row_span, col_span)
+		return freeCells[0] if freeCells else None
+
+
+@dataclass
+class DashboardPlacement:
+	"""Outcome of placing one widget with `Dashboard.applyLayout()`.
+
+	Attributes:
+		widget (str): The name of the placed widget.
+		row (int): The row the widget was placed at.
+		col (int): The column the widget was placed at.
+		seconds (float): Time spent placing the widget.
+	"""
+	widget: str
+	row: int
+	col: int
+	seconds: float
+
+
 class Dashboard(PerspectiveElement):
 	"""Class containing methods for interacting and retreiving components from a dashboard element.
 	"""
@@ -1432,31 +2839,134 @@ class Dashboard(PerspectiveElement):
 	MODAL_ENTRY_CLASS = 'ia_dashboardComponent__addWidgetModal__menu__category__item'
 	MODAL_ENTRY_TITLE_CLASS = 'widgetMenuItemTitle'
 	DASHBOARD_COMPONENT_CLASS = 'ia_dashboardComponent__widget'
+	GRID_CLASS = 'gridCommon__grid'
+	GRID_CELL_CLASS = 'gridCommon__grid__cell'
+
+	# Reads the grid template, every empty cell's area and every widget's area in one call.
+	GRID_SCRIPT = """
+		var root = arguments[0];
+		var grid = root.querySelector('div.' + arguments[1]);
+		function count(template) {
+			var repeat = /repeat\\(\\s*(\\d+)/.exec(template || '');
+			if (repeat) { return parseInt(repeat[1], 10); }
+			return template ? template.trim().split(/\\s+/).length : 0;
+		}
+		function end(value, start) {
+			value = (value || '').trim();
+			if (value.indexOf('span') === 0) { return start + parseInt(value.slice(4), 10); }
+			var line = parseInt(value, 10);
+			return isNaN(line) ? start + 1 : line;
+		}
+		function area(el) {
+			var rowStart = parseInt(el.style.gridRowStart, 10), columnStart = parseInt(el.style.gridColumnStart, 10);
+			return [rowStart, columnStart, end(el.style.gridRowEnd, rowStart), end(el.style.gridColumnEnd, columnStart), el];
+		}
+		if (grid === null) { return null; }
+		return {
+			rows: count(grid.style.gridTemplateRows),
+			columns: count(grid.style.gridTemplateColumns),
+			cells: Array.prototype.map.call(root.querySelectorAll('div.' + arguments[2]), area),
+			widgets: Array.prototype.map.call(root.querySelectorAll('.' + arguments[3]), area)
+		};
+	"""
+
+	# Selects a widget in the open AddWidget modal. The catalog position of the widget is tried first; the full list
+	# of titles is only read and returned when that position does not hold the widget.
+	SELECT_WIDGET_SCRIPT = """
+		var modal = document.querySelector('.' + arguments[0]);
+		var entries = modal ? modal.getElementsByClassName(arguments[1]) : [];
+		if (entries.length === 0) { return null; }
+		var titleClass = arguments[2], name = arguments[3], index = arguments[4], titles = null;
+		function title(entry) {
+			var titleElement = entry.getElementsByClassName(titleClass)[0];
+			return titleElement ? titleElement.innerText.trim() : null;
+		}
+		if (index < 0 || index >= entries.length || title(entries[index]) !== name) {
+			titles = Array.prototype.map.call(entries, title);
+			index = titles.indexOf(name);
+		}
+		if (index >= 0) {
+			entries[index].click();
+		}
+		return {index: index, titles: titles};
+	"""
+
+	# Confirms the open AddWidget modal once its primary button is enabled.
+	CONFIRM_WIDGET_SCRIPT = """
+		var modal = document.querySelector('.' + arguments[0]);
+		var button = modal ? modal.querySelector('button.ia_button--primary') : null;
+		if (button === null || button.disabled) { return false; }
+		button.click();
+		return true;
+	"""
+
+	# Returns the widget placed at a cell once it covers the requested end row and column. A widget with another
+	# span is resized by writing its position to the dashboard props, and null is returned until it re-renders.
+	RESIZE_WIDGET_SCRIPT = PROPERTY_TREE_JS + """
+		var root = arguments[0], row = arguments[2], col = arguments[3], rowEnd = arguments[4], columnEnd = arguments[5];
+		var widgets = root.querySelectorAll('.' + arguments[1]), widget = null;
+		for (var i = 0; i < widgets.length && widget === null; i++) {
+			var style = widgets[i].style;
+			if (parseInt(style.gridRowStart, 10) === row && parseInt(style.gridColumnStart, 10) === col) {
+				widget = widgets[i];
+			}
+		}
+		if (widget === null) { return null; }
+		var rowSpan = /span\\s*(\\d+)/.exec(widget.style.gridRowEnd), columnSpan = /span\\s*(\\d+)/.exec(widget.style.gridColumnEnd);
+		var currentRowEnd = rowSpan ? row + parseInt(rowSpan[1], 10) : (parseInt(widget.style.gridRowEnd, 10) || row + 1);
+		var currentColumnEnd = columnSpan ? col + parseInt(columnSpan[1], 10) : (parseInt(widget.style.gridColumnEnd, 10) || col + 1);
+		if (currentRowEnd === rowEnd && currentColumnEnd === columnEnd) { return widget; }
+		var tree = propertyTree(root), positions = tree ? readProp(tree, 'widgets') || [] : [];
+		for (var j = 0; j < positions.length; j++) {
+			var position = positions[j].position || {};
+			if (position.rowStart === row && position.columnStart === col) {
+				tree.write('widgets[' + j + '].position.rowEnd', rowEnd);
+				tree.write('widgets[' + j + '].position.columnEnd', columnEnd);
+			}
+		}
+		return null;
+	"""
+
+	_grid = None
+	_widget_catalog = None
+
+	def getGrid(self, refresh: bool = False) -> DashboardGrid:
+		"""Returns the model of the dashboard grid, reading it with a single script call when not cached.
+
+		Args:
+			refresh (bool): Whether to read the grid again instead of using the cached model.
+
+		Returns:
+			DashboardGrid: The grid dimensions, cells and widget occupancy.
+
+		Raises:
+			ElementNotFoundException: If the dashboard has no grid, e.g. when it is not in edit mode.
+		"""
+		if refresh or self._grid is None:
+			grid = self.session.driver.execute_script(
+				self.GRID_SCRIPT, self, self.GRID_CLASS, self.GRID_CELL_CLASS, self.DASHBOARD_COMPONENT_CLASS)
+			if grid is None:
+				raise ElementNotFoundException("Dashboard grid not found.")
+			self._grid = DashboardGrid(grid["rows"], grid["columns"],
+									   [DashboardArea(*area) for area in grid["cells"]],
+									   [DashboardArea(*area) for area in grid["widgets"]])
+		return self._grid
 
 	def getDashboardColumns(self) -> int:
 		"""Returns the amount columns in the dashboards grid array as an int."""
-		# creating a local variable 'grid_array' of WebElement type to use .find_element(By.) method
-		grid_array: WebElement = self.find_element(
-			By.CSS_SELECTOR, "div.gridCommon__grid")
-		s = grid_array.get_attribute("style").split(';')
-
-		if "grid-template-columns" in s[1]:
-			return int(s[1].split(":")[1].split("repeat(")[1].split(",")[0])
+		return self.getGrid(refresh=True).columns
 
 	def getDashboardRows(self) -> int:
 		"""Returns the rows in the dashboards grid array."""
-		grid_array: WebElement = self.find_element(
-			By.CSS_SELECTOR, "div.gridCommon__grid")
-		s = grid_array.get_attribute("style").split(';')
-
-		if "grid-template-rows" in s[2]:
-			return int(s[2].split(":")[1].split("repeat(")[1].split(",")[0])
+		return self.getGrid(refresh=True).rows
 
 	def openWidgetModal(self, row: int, col: int) -> None:
 		"""Opens the widget modal by clicking where row/col specify on the dashboard."""
 		add_cell = self._getCell(row, col)
 		# gets the specified cell or a cell that is empty
 		add_cell.click()
+		# The widget added through the modal changes the occupancy of the grid
+		self._grid = None
 
 	def closeWidgetModal(self) -> None:
 		"""Closes the widget modal by clicking the close button."""
@@ -1475,38 +2985,76 @@ class Dashboard(PerspectiveElement):
 			col (int): The column to add the widget to.
 			new_widget (str): The name of the widget to add.
 
+		Raises:
+			ComponentInteractionException: If a widget already occupies the cell.
 		"""
 		self.openWidgetModal(row, col)
+		self._selectWidget(new_widget)
 
-		try:
-			# Retrieve a list of all the widget entries in the modal
-			widget_modal = self._getAddWidgetModal()
-			widget_entries = self._getWidgetModalEntries(widget_modal)
+	def applyLayout(self, layout: List[tuple], timeout_in_seconds=None) -> List[DashboardPlacement]:
+		"""Places a list of widgets on the dashboard in one sequence.
 
-			for entry in widget_entries:
-				title = entry.find_element(
-					By.CLASS_NAME, self.MODAL_ENTRY_TITLE_CLASS).text
+		The grid is read once and occupancy is tracked locally between placements, and the widget catalog read on
+		the first modal open is reused to select every later widget with a single script call.
 
-				if title == new_widget:
-					print(title)
-					entry.click()
-					break
+		Args:
+			layout (List[tuple]): Entries of `(widget_name, row, col, span)`. `span` is a `(row_span, col_span)` tuple
+				the placed widget is resized to, and may be omitted for a single cell. When `row` or `col` is None the
+				first free area of the given span is used.
+			timeout_in_seconds (int): Timeout for each modal interaction, defaults to the session timeout.
 
-			widget_modal.find_element(
-				By.CSS_SELECTOR, "button.ia_button--primary").click()
+		Returns:
+			List[DashboardPlacement]: The position and time spent for each widget, in the order of `layout`.
 
-		except ElementNotFoundException:
-			raise ElementNotFoundException("Widget modal not found.")
+		Raises:
+			ComponentInteractionException: If a requested area is occupied, no free area is left or a placed widget
+				cannot be resized to its span.
+			ElementNotFoundException: If a widget is not in the widget catalog.
+		"""
+		grid = self.getGrid(refresh=True)
+		placements = []
+
+		for item in layout:
+			widget, row, col, span = (tuple(item) + (None, None, None))[:4]
+			row_span, col_span = span or (1, 1)
+			start = time.perf_counter()
+
+			if row is None or col is None:
+				position = grid.findFreeArea(row_span, col_span)
+				if position is None:
+					raise ComponentInteractionException(
+						"No free %sx%s area left for widget \"%s\"." % (row_span, col_span, widget))
+				row, col = position
+			elif not grid.isFree(row, col, row_span, col_span):
+				raise ComponentInteractionException(
+					"The %sx%s area at (%s, %s) is not free for widget \"%s\"." % (row_span, col_span, row, col, widget))
+
+			grid = self._clickGridCell(grid, row, col, timeout_in_seconds)
+			self._selectWidget(widget, timeout_in_seconds)
+			element = self._resizeWidget(row, col, row_span, col_span, timeout_in_seconds)
+			grid.occupy(DashboardArea(row, col, row + row_span, col + col_span, element))
+			placements.append(DashboardPlacement(widget, row, col, time.perf_counter() - start))
+
+		self._grid = None
+		return placements
+
+	def getWidgetCatalog(self) -> List[str]:
+		"""Returns the names of the widgets offered by the AddWidget modal, as cached by the last widget selection."""
+		if self._widget_catalog is None:
+			return []
+		return sorted(self._widget_catalog, key=self._widget_catalog.get)
 
 	def addRandomWidget(self) -> None:
-		"""Automatically add a widget to a random spot if no row and col are specified.
-		Current implementation may break if selenium tries to click on a cell that already has a widget.
+		"""Automatically add a random widget to a random free cell of the dashboard.
+
+		Raises:
+			ComponentInteractionException: If every cell of the dashboard is occupied.
 		"""
-		# Selects a random cell within the dashboard area.
-		dashboard_index = [random.randrange(0, self.getDashboardRows()),
-			random.randrange(0, self.getDashboardColumns())]
+		freeCells = self.getGrid(refresh=True).getFreeCells()
+		if not freeCells:
+			raise ComponentInteractionException("No free cell left on the dashboard.")
 
-		self.openWidgetModal(dashboard_index[0], dashboard_index[1])
+		self.openWidgetModal(*random.choice(freeCells))
 
 		try:
 			widget_modal = self._getAddWidgetModal()
@@ -1520,6 +3068,84 @@ class Dashboard(PerspectiveElement):
 			raise ElementNotFoundException("Widget modal not found.")
 
 
+	def _clickGridCell(self, grid: DashboardGrid, row: int, col: int, timeout_in_seconds=None) -> DashboardGrid:
+		"""Clicks an empty cell, waiting out a closing modal and re-reading the grid if the cell was re-rendered.
+
+		Returns:
+			DashboardGrid: The grid model the clicked cell came from.
+		"""
+		grids = [grid]
+
+		def clickCell(driver):
+			cell = grids[0].getCell(row, col)
+			if cell is None:
+				# The cell may have been re-created, read the grid again
+				grids[0] = self.getGrid(refresh=True)
+				return False
+			try:
+				cell.click()
+				return True
+			except ElementClickInterceptedException:
+				return False
+			except StaleElementReferenceException:
+				grids[0] = self.getGrid(refresh=True)
+				return False
+
+		raiseable_exception = ElementNotFoundException("No dashboard cell found at (%s, %s)." % (row, col))
+		self.waitForMethod(clickCell, timeout_in_seconds, raiseable_exception)
+		return grids[0]
+
+	def _resizeWidget(self, row: int, col: int, row_span: int, col_span: int, timeout_in_seconds=None) -> WebElement:
+		"""Waits for the widget placed at a cell and resizes it to the given span.
+
+		Returns:
+			WebElement: The placed widget.
+
+		Raises:
+			ComponentInteractionException: If the widget does not appear with the given span within the timeout.
+		"""
+		raiseable_exception = ComponentInteractionException(
+			"The widget at (%s, %s) could not be sized to %sx%s." % (row, col, row_span, col_span))
+		return self.waitForMethod(lambda driver: driver.execute_script(
+			self.RESIZE_WIDGET_SCRIPT, self, self.DASHBOARD_COMPONENT_CLASS, row, col, row + row_span, col + col_span),
+			timeout_in_seconds, raiseable_exception)
+
+	def _selectWidget(self, new_widget: str, timeout_in_seconds=None) -> None:
+		"""Selects a widget in the open AddWidget modal and confirms it once the modal accepts the selection.
+
+		Args:
+			new_widget (str): The name of the widget to add.
+			timeout_in_seconds (int): Timeout for the modal to appear, defaults to the session timeout.
+
+		Raises:
+			ElementNotFoundException: If the modal does not appear or does not offer the widget.
+		"""
+		catalog = self._widget_catalog or {}
+		result = {}
+
+		def selectWidget(driver):
+			result.update(driver.execute_script(
+				self.SELECT_WIDGET_SCRIPT, self.MODAL_CLASS, self.MODAL_ENTRY_CLASS, self.MODAL_ENTRY_TITLE_CLASS,
+				new_widget, catalog.get(new_widget, -1)) or {})
+			return bool(result)
+
+		self.waitForMethod(selectWidget, timeout_in_seconds, ElementNotFoundException("Widget modal not found."))
+
+		if result["titles"] is not None:
+			self._widget_catalog = {}
+			for index, title in enumerate(result["titles"]):
+				self._widget_catalog.setdefault(title, index)
+
+		if result["index"] < 0:
+			self.closeWidgetModal()
+			raise ElementNotFoundException(
+				"No widget named \"%s\" in the widget modal." % new_widget)
+
+		raiseable_exception = ComponentInteractionException(
+			"The widget modal did not accept \"%s\"." % new_widget)
+		self.waitForMethod(lambda driver: driver.execute_script(
+			self.CONFIRM_WIDGET_SCRIPT, self.MODAL_CLASS), timeout_in_seconds, raiseable_exception)
+
 	def _getAddWidgetModal(self) -> PerspectiveElement:
 		"""Gets the AddWidget modal that appears when an empty cell is clicked.
 
@@ -1543,52 +3169,30 @@ class Dashboard(PerspectiveElement):
 		return widget_modal.waitForElements(By.CLASS_NAME, self.MODAL_ENTRY_CLASS)
 
 	def _getCell(self, row: int, col: int) -> WebElement:
+		"""Gets the empty cell at the given position from a freshly read grid model.
 
-		# TODO: Check that a widget is not already in the specified cell, check
-		# the size of the widget in cases where the area is larger than X1 / Y1 / X2 / Y2
+		Args:
+			row (int): The row of the cell, starting at 1.
+			col (int): The column of the cell, starting at 1.
 
-		# NOTE: Functional for .placeWidget() but does not have automatic placement for .addRandomWidget()
+		Returns:
+			WebElement: The cell element to click to open the AddWidget modal.
 
-		# Retrieve a random spot within the dashboard area
-		dashboard_area = [self.getDashboardRows(), self.getDashboardColumns()]
+		Raises:
+			ComponentInteractionException: If a widget already occupies the cell.
+		"""
+		grid = self.getGrid(refresh=True)
 
-		if row > dashboard_area[0] or col > dashboard_area[1]:
+		if not grid.inBounds(row, col):
 			print("Row or column is out of bounds. Resetting to first cell.")
 			row = 1
 			col = 1
 
-		# Coordinates that should match the style attribute of the specified cell
-		coordinates = ("grid-area: " + str(row) + " / " +
-						str(col) + " / " + str(row + 1) + " / " + str(col + 1))
-
-		# Collects all clickable cells from the dashboard grid
-		empty_cells = self.find_elements(
-			By.CSS_SELECTOR, "div.gridCommon__grid__cell")
-
-		# Check if there is a dashboard widget already in the specified cell
-		# TODO: Instead of comparing the style for each cell, compare the starting/ ending coordinates.
-		# Have to split the coordinates from the style to make comparison easier. 
-		try:
-			# Retrieves all cells that are already used by a widget as a list of WebElements
-			used_cells = self.find_elements(
-				By.CLASS_NAME, self.DASHBOARD_COMPONENT_CLASS)
-
-			for widget_element in used_cells:
-				widget_style = widget_element.get_attribute("style")
-				# print(widget_style)
-
-				if coordinates in widget_style:
-					print("Widget already exists in this cell.")
-
-
-		except ElementNotFoundException:
-			print("No widgets found on dashboard returning first cell.")
-			return empty_cells[0]
-
-		# Retrieve the style for each 
-		for element in empty_cells:
-			# loop through each retrieved empty element and get the style attribute
-			style = element.get_attribute("style")
+		if grid.getWidgetAt(row, col) is not None:
+			raise ComponentInteractionException(
+				"Widget already exists in cell (%s, %s)." % (row, col))
 
-			if coordinates in style:
-				return element         
+		cell = grid.getCell(row, col)
+		if cell is None:
+			raise ElementNotFoundException("No dashboard cell found at (%s, %s)." % (row, col))
+		return cell
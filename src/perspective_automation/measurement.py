@@ -0,0 +1,74 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, List
+
+
+@dataclass
+class LatencySummary:
+	"""Distribution of a set of latency samples, all values use the unit of the samples.
+
+	Attributes:
+		count (int): Number of samples.
+		minimum (float): Smallest sample.
+		mean (float): Arithmetic mean of the samples.
+		p50 (float): Median.
+		p90 (float): 90th percentile.
+		p99 (float): 99th percentile.
+		maximum (float): Largest sample.
+	"""
+	count: int
+	minimum: float
+	mean: float
+	p50: float
+	p90: float
+	p99: float
+	maximum: float
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+	"""Returns the nearest-rank percentile of the samples.
+
+	Args:
+		samples (List[float]): The samples, in any order.
+		fraction (float): The percentile as a fraction between 0 and 1, e.g. 0.99.
+
+	Returns:
+		float: The sample at the requested rank, None if there are no samples.
+	"""
+	if not samples:
+		return None
+	ordered = sorted(samples)
+	rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+	return ordered[rank]
+
+
+def summarize(samples: List[float]) -> LatencySummary:
+	"""Summarizes latency samples into count, mean and percentiles.
+
+	Args:
+		samples (List[float]): The samples, in any order.
+
+	Returns:
+		LatencySummary: The summary, with None values if there are no samples.
+	"""
+	if not samples:
+		return LatencySummary(0, None, None, None, None, None, None)
+	return LatencySummary(len(samples), min(samples), sum(samples) / len(samples), percentile(samples, 0.5),
+						  percentile(samples, 0.9), percentile(samples, 0.99), max(samples))
+
+
+def histogram(samples: List[float], bucket_width: float) -> Dict[float, int]:
+	"""Counts the samples falling into each bucket of the given width.
+
+	Args:
+		samples (List[float]): The samples, in any order.
+		bucket_width (float): The width of every bucket, in the unit of the samples.
+
+	Returns:
+		Dict[float, int]: The lower bound of every non-empty bucket mapped to its count, in ascending order.
+	"""
+	counts = {}
+	for sample in samples:
+		bucket = math.floor(sample / bucket_width) * bucket_width
+		counts[bucket] = counts.get(bucket, 0) + 1
+	return dict(sorted(counts.items()))
@@ -1,6 +1,6 @@
 from typing import Union
 from perspective_automation.selenium import Session
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
@@ -22,6 +22,27 @@ class ElementNotUpdatedException(Exception):
 	pass
 
 
+# Reads Perspective props from the React fiber of a rendered element: `propertyTree(el)` finds the props tree of the
+# nearest component and `readProp(tree, path)` returns a JSON copy of the value at a path such as "text".
+PROPERTY_TREE_JS = """
+	function propertyTree(el) {
+		var fiber = null;
+		for (var key in el) {
+			if (key.indexOf('__reactInternalInstance') === 0 || key.indexOf('__reactFiber') === 0) { fiber = el[key]; }
+		}
+		for (var depth = 0; fiber && depth < 50; depth++, fiber = fiber.return) {
+			var props = fiber.memoizedProps;
+			if (props && props.props && typeof props.props.read === 'function') { return props.props; }
+		}
+		return null;
+	}
+	function readProp(tree, path) {
+		var value = tree.read(path);
+		return value === undefined ? null : JSON.parse(JSON.stringify(value));
+	}
+"""
+
+
 class ElementTextChanges(object):
 	"""An expectation for checking that an element's text attribute has changed.
 	
@@ -106,7 +127,8 @@ class PerspectiveElement(WebElement):
 			bool: True if the method executes within the timeout period, False otherwise.
 
 		Raises:
-			Exception: If the method is not found within the timeout period.
+			Exception: If the method is not found within the timeout period. The exceptions of this module raised by
+				the method itself are passed through unchanged.
 		"""
 		try:
 			if not timeout_in_seconds:  # If timeout is None, the statement will be True
@@ -115,6 +137,8 @@ class PerspectiveElement(WebElement):
 				return WebDriverWait(self.session.driver, timeout_in_seconds).until(method)
 		except TimeoutException:
 			raise exception
+		except (ComponentInteractionException, ElementNotFoundException, ElementNotUpdatedException):
+			raise
 		except Exception as e:
 			raise Exception("Error waiting for method: %s" % (e))
 
@@ -206,6 +230,223 @@ class PerspectiveElement(WebElement):
 
 
 class PerspectiveComponent(PerspectiveElement):
+	# Resolves the native <input>/<textarea> of a component, which may be the component element itself.
+	INPUT_ELEMENT_JS = """
+		function inputOf(el) {
+			if (el.tagName === 'INPUT' || el.tagName === 'TEXTAREA') {
+				return el;
+			}
+			return el.querySelector('input, textarea');
+		}
+	"""
+
+	INPUT_ELEMENT_SCRIPT = INPUT_ELEMENT_JS + """
+		return inputOf(arguments[0]);
+	"""
+
+	# Writes the whole value at once through the native setter so React notices the change,
+	# then fires the events Perspective listens for. Blurring commits deferred updates.
+	FAST_FILL_SCRIPT = """
+		var el = arguments[0], text = arguments[1], replace = arguments[2], commit = arguments[3];
+		var proto = el.tagName === 'TEXTAREA' ? window.HTMLTextAreaElement.prototype : window.HTMLInputElement.prototype;
+		var setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+		var value = replace ? text : el.value + text;
+		el.focus();
+		setter.call(el, value);
+		el.dispatchEvent(new Event('input', {bubbles: true}));
+		el.dispatchEvent(new Event('change', {bubbles: true}));
+		if (commit) {
+			el.blur();
+		}
+		return value;
+	"""
+
+	# Reads the bound value prop of the component, or the value of its input when the props cannot be read
+	# or no prop is given. The input is located again on every call, as a re-render may replace it.
+	FILLED_VALUE_SCRIPT = PROPERTY_TREE_JS + INPUT_ELEMENT_JS + """
+		var root = arguments[0], path = arguments[1], el = inputOf(root);
+		var tree = path ? propertyTree(el || root) : null;
+		if (tree !== null) {
+			return {prop: true, value: readProp(tree, path)};
+		}
+		return el ? {prop: false, value: el.value} : null;
+	"""
+
+	# Path of the prop holding the value that `fastFill()` writes, e.g. "text"
+	value_prop = None
+
+	_input_element = None
+
 	def selectAll(self) -> None:
 		"""Selects all elements in the component."""
 		self.send_keys(self.session.select_all_keys)
+
+	def getInputElement(self, refresh: bool = False) -> WebElement:
+		"""Returns the native input element of the component, caching the handle for later calls.
+
+		Args:
+			refresh: Discard the cached handle and locate the input again.
+
+		Returns:
+			WebElement: The `input` or `textarea` element of the component.
+
+		Raises:
+			ElementNotFoundException: If the component does not contain an input element.
+		"""
+		if refresh or self._input_element is None:
+			inputElement = self.session.driver.execute_script(self.INPUT_ELEMENT_SCRIPT, self)
+			if inputElement is None:
+				raise ElementNotFoundException("No input element found in component %s" % self.id)
+			self._input_element = inputElement
+		return self._input_element
+
+	def fastFill(self, text: str, replace: bool = True, commit: bool = True, verify: bool = True, timeout_in_seconds=None,
+				 inputElement: WebElement = None) -> str:
+		"""Inserts text into the component's input in a single script call instead of typing it key by key.
+
+		Args:
+			text: The text to insert.
+			replace: Replace the current value when True, append to it otherwise.
+			commit: Blur the input afterwards so components with deferred updates write their props.
+			verify: Wait until the component's `value_prop` holds the inserted value. Without `commit`, or when the
+				props cannot be read, wait until the input holds it after Perspective re-renders.
+			timeout_in_seconds: Timeout for the verification, defaults to the session timeout.
+			inputElement: The input to write to when it is already known, located from the component otherwise.
+
+		Returns:
+			str: The value written to the input.
+
+		Raises:
+			ElementNotUpdatedException: If the prop or the input does not take the inserted value.
+		"""
+		try:
+			value = self.session.driver.execute_script(
+				self.FAST_FILL_SCRIPT, inputElement or self.getInputElement(), str(text), replace, commit)
+		except StaleElementReferenceException:
+			value = self.session.driver.execute_script(
+				self.FAST_FILL_SCRIPT, self.getInputElement(refresh=True), str(text), replace, commit)
+
+		if verify:
+			prop_path = self.value_prop if commit else None
+			raiseable_exception = ElementNotUpdatedException(
+				"The %s of Element %s was not updated to \"%s\"" % (
+					"prop %s" % prop_path if prop_path else "value", self.id, value))
+			self.waitForMethod(lambda driver: self._filledValueMatches(prop_path, value),
+							   timeout_in_seconds, raiseable_exception)
+		return value
+
+	def _filledValueMatches(self, prop_path: str, expected: str) -> bool:
+		try:
+			filled = self.session.driver.execute_script(self.FILLED_VALUE_SCRIPT, self, prop_path)
+		except StaleElementReferenceException:
+			return False
+		return filled is not None and self.fastFillMatches(filled["value"], expected)
+
+	def fastFillMatches(self, actual: str, expected: str) -> bool:
+		"""Compares the value read back from the input with the value written by `fastFill()`.
+
+		Args:
+			actual: The current value of the prop or input.
+			expected: The value that was written.
+
+		Returns:
+			bool: True if the prop or input holds the expected value.
+		"""
+		return actual is not None and str(actual) == expected
+
+
+class ActionBatch(object):
+	"""Records clicks, double clicks, key input and drags across several elements and performs them together.
+	With a W3C driver the whole sequence is sent as a single actions request, one round trip however many steps.
+
+	Params:
+		session: The `Session` whose driver performs the actions.
+
+	Example:
+		ActionBatch(session).click(nameField).sendKeys("Line 1").doubleClick(row).dragAndDrop(card, lane).perform()
+	"""
+
+	def __init__(self, session: Session) -> None:
+		self.session = session
+		self._chain = ActionChains(session.driver)
+		self._steps = 0
+
+	def __len__(self) -> int:
+		return self._steps
+
+	def click(self, element: WebElement = None) -> "ActionBatch":
+		"""Records a click on the element, or at the current pointer position."""
+		self._chain.click(element)
+		self._steps += 1
+		return self
+
+	def doubleClick(self, element: WebElement = None) -> "ActionBatch":
+		"""Records a double click on the element, or at the current pointer position."""
+		self._chain.double_click(element)
+		self._steps += 1
+		return self
+
+	def contextClick(self, element: WebElement = None) -> "ActionBatch":
+		"""Records a right click on the element, or at the current pointer position."""
+		self._chain.context_click(element)
+		self._steps += 1
+		return self
+
+	def sendKeys(self, keys: str, element: WebElement = None) -> "ActionBatch":
+		"""Records typing the keys, into the element after clicking it or into the focused element."""
+		if element is None:
+			self._chain.send_keys(keys)
+		else:
+			self._chain.send_keys_to_element(element, keys)
+		self._steps += 1
+		return self
+
+	def dragAndDrop(self, source: WebElement, target: WebElement) -> "ActionBatch":
+		"""Records dragging the source element onto the target element."""
+		self._chain.drag_and_drop(source, target)
+		self._steps += 1
+		return self
+
+	def dragAndDropByOffset(self, source: WebElement, x_offset: int, y_offset: int) -> "ActionBatch":
+		"""Records dragging the source element by an offset in pixels."""
+		self._chain.drag_and_drop_by_offset(source, x_offset, y_offset)
+		self._steps += 1
+		return self
+
+	def pause(self, seconds: float) -> "ActionBatch":
+		"""Records a pause inside the sequence, e.g. for an animation between two steps."""
+		self._chain.pause(seconds)
+		return self
+
+	def perform(self, verify=None, timeout_in_seconds=None):
+		"""Performs every recorded action in one request and optionally waits for the resulting state.
+		The batch is cleared afterwards so it can be reused.
+
+		Args:
+			verify: Either a callable taking the driver, or a JavaScript expression, that is truthy once the
+				sequence had its effect.
+			timeout_in_seconds: Timeout for the verification, defaults to the session timeout.
+
+		Returns:
+			The truthy value returned by `verify`, None without verification.
+
+		Raises:
+			ElementNotUpdatedException: If the verification does not pass within the timeout.
+		"""
+		try:
+			self._chain.perform()
+		finally:
+			# A W3C chain keeps its queued actions after reset_actions(), so start a new one
+			self._chain = ActionChains(self.session.driver)
+			self._steps = 0
+
+		if verify is None:
+			return None
+
+		if isinstance(verify, str):
+			expression = verify
+			verify = lambda driver: driver.execute_script("return (%s);" % expression)
+		try:
+			return WebDriverWait(self.session.driver, timeout_in_seconds or self.session.wait_timeout_in_seconds).until(verify)
+		except TimeoutException:
+			raise ElementNotUpdatedException("The action sequence did not reach the expected state")
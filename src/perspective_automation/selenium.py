@@ -1,17 +1,36 @@
+import atexit
+import json
+import shutil
+import subprocess
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from enum import Enum
 from dataclasses import dataclass
+from functools import lru_cache
 from platform import system
-from typing import List
+from typing import Iterator, List
 
+import urllib3
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.ui import WebDriverWait
 
+from perspective_automation.measurement import LatencySummary, histogram, summarize
+
 
 class ElementNotFoundException(Exception):
 	pass
@@ -32,6 +51,7 @@ class LogSource(Enum):
 	DRIVER = "driver"
 	CLIENT = "client"
 	SERVER = "server"
+	PERFORMANCE = "performance"
 
 
 class SelectAllKeys(Enum):
@@ -40,6 +60,146 @@ class SelectAllKeys(Enum):
 	DARWIN = Keys.COMMAND + "a"
 
 
+_chrome_services = {}
+_chrome_services_lock = threading.Lock()
+
+
+def getChromeDriverService(executable_path="chromedriver") -> ChromeService:
+	"""Returns the chromedriver service shared by every Chrome session using `executable_path`.
+	The service is started on first use, restarted if its process has exited, and stopped on interpreter exit."""
+	with _chrome_services_lock:
+		service = _chrome_services.get(executable_path)
+		if service is None or service.process is None or service.process.poll() is not None:
+			service = ChromeService(executable_path)
+			service.start()
+			_chrome_services[executable_path] = service
+		return service
+
+
+@atexit.register
+def stopChromeDriverServices() -> None:
+	"""Stops every shared chromedriver service."""
+	with _chrome_services_lock:
+		for service in _chrome_services.values():
+			service.stop()
+		_chrome_services.clear()
+
+
+class ProfileCloneChrome(webdriver.Chrome):
+	"""A Chrome WebDriver that removes its copy of a profile template, see `cloneProfileTemplate`, when it quits.
+
+	Attributes:
+		profile_clone_dir (str): The copied user-data-dir, None when the browser does not use a copy.
+	"""
+
+	profile_clone_dir = None
+
+	def quit(self):
+		try:
+			super().quit()
+		finally:
+			removeProfileClone(self.profile_clone_dir)
+
+
+class SharedServiceChrome(ProfileCloneChrome):
+	"""A Chrome WebDriver attached to a shared chromedriver service, which keeps running after `quit()`."""
+
+	def __init__(self, service: ChromeService, options: webdriver.ChromeOptions):
+		self.service = service
+		WebDriver.__init__(
+			self,
+			command_executor=ChromeRemoteConnection(remote_server_addr=service.service_url, keep_alive=True),
+			desired_capabilities=options.to_capabilities())
+		self._is_remote = False
+
+	def quit(self):
+		try:
+			WebDriver.quit(self)
+		finally:
+			removeProfileClone(self.profile_clone_dir)
+
+
+# Chrome flags applied by the `performance_profile` option, favouring automation throughput over fidelity.
+PERFORMANCE_PROFILE_ARGUMENTS = [
+	"--disable-extensions",
+	"--disable-background-timer-throttling",
+	"--disable-backgrounding-occluded-windows",
+	"--disable-renderer-backgrounding",
+	"--disable-background-networking",
+	"--no-first-run",
+	"--no-default-browser-check",
+]
+PERFORMANCE_PROFILE_HEADLESS_ARGUMENTS = ["--disable-gpu"]
+PERFORMANCE_PROFILE_WINDOW_SIZE = (1280, 800)
+
+
+_profile_clones = []
+
+
+def cloneProfileTemplate(template_dir) -> str:
+	"""Copies a Chrome user-data-dir into a new temporary directory, removed by `removeProfileClone` when the
+	browser using it quits, or on interpreter exit. Uses a copy-on-write clone where the file system supports it,
+	and a plain copy otherwise.
+
+	Returns:
+		str: The path of the copy.
+	"""
+	parent_dir = tempfile.mkdtemp(prefix="perspective-profile-")
+	_profile_clones.append(parent_dir)
+	clone_dir = os.path.join(parent_dir, "profile")
+	clone_command = {"LINUX": ["cp", "-R", "--reflink=auto"], "DARWIN": ["cp", "-c", "-R"]}.get(system().upper())
+	if not clone_command or subprocess.run(clone_command + [template_dir, clone_dir], stderr=subprocess.DEVNULL).returncode != 0:
+		shutil.rmtree(clone_dir, ignore_errors=True)
+		shutil.copytree(template_dir, clone_dir, symlinks=True)
+	# Chrome refuses a profile whose lock files point at another, possibly running, browser
+	for lock in ("SingletonLock", "SingletonSocket", "SingletonCookie"):
+		if os.path.lexists(os.path.join(clone_dir, lock)):
+			os.remove(os.path.join(clone_dir, lock))
+	return clone_dir
+
+
+def removeProfileClone(clone_dir) -> None:
+	"""Removes a user-data-dir copied by `cloneProfileTemplate`. Other paths are left alone."""
+	parent_dir = os.path.dirname(clone_dir) if clone_dir else None
+	if parent_dir in _profile_clones:
+		_profile_clones.remove(parent_dir)
+		shutil.rmtree(parent_dir, ignore_errors=True)
+
+
+@atexit.register
+def removeProfileClones() -> None:
+	"""Removes every user-data-dir copied by `cloneProfileTemplate`."""
+	while _profile_clones:
+		shutil.rmtree(_profile_clones.pop(), ignore_errors=True)
+
+
+def warmProfileTemplate(template_dir, url, timeout_in_seconds=60, **kwargs) -> float:
+	"""Loads `url` once in a Chrome using `template_dir` as its user-data-dir, so that the Perspective client
+	bundles land in the template's disk cache. Sessions started with `template_profile=template_dir` then load
+	them from disk.
+
+	Args:
+		template_dir (str): The directory to warm, created if it does not exist.
+		url (str): A Perspective page of the gateway under test.
+		timeout_in_seconds (int): How long to wait for the page to finish loading.
+		kwargs: Further `getChromeDriver` options.
+
+	Returns:
+		float: The seconds the cold page load took.
+	"""
+	os.makedirs(template_dir, exist_ok=True)
+	kwargs = dict(kwargs, user_data_dir=template_dir, template_profile=None)
+	driver = getChromeDriver(**kwargs)
+	try:
+		start = time.perf_counter()
+		driver.get(url)
+		WebDriverWait(driver, timeout_in_seconds).until(
+			lambda driver: driver.execute_script("return document.readyState") == "complete")
+		return time.perf_counter() - start
+	finally:
+		driver.quit()
+
+
 def getChromeDriver(**kwargs) -> WebDriver:
 	chrome_options = webdriver.ChromeOptions()
 
@@ -51,6 +211,25 @@ def getChromeDriver(**kwargs) -> WebDriver:
 	if kwargs.get('headless', True):
 		chrome_options.add_argument("--headless")
 
+	if kwargs.get('performance_profile'):
+		for argument in PERFORMANCE_PROFILE_ARGUMENTS:
+			chrome_options.add_argument(argument)
+		if kwargs.get('headless', True):
+			for argument in PERFORMANCE_PROFILE_HEADLESS_ARGUMENTS:
+				chrome_options.add_argument(argument)
+		chrome_options.add_argument("--window-size=%s,%s" % tuple(kwargs.get('window_size', PERFORMANCE_PROFILE_WINDOW_SIZE)))
+
+	page_load_strategy = kwargs.get('page_load_strategy') or ('eager' if kwargs.get('performance_profile') else None)
+	if page_load_strategy:
+		chrome_options.set_capability('pageLoadStrategy', page_load_strategy)
+
+	profile_clone_dir = None
+	if kwargs.get('template_profile'):
+		profile_clone_dir = cloneProfileTemplate(kwargs.get('template_profile'))
+		chrome_options.add_argument("--user-data-dir=%s" % profile_clone_dir)
+	elif kwargs.get('user_data_dir'):
+		chrome_options.add_argument("--user-data-dir=%s" % kwargs.get('user_data_dir'))
+
 	# log_sources
 	logSourceCapability = {}
 	logSourceList = kwargs.get('log_sources', [])
@@ -58,12 +237,17 @@ def getChromeDriver(**kwargs) -> WebDriver:
 		logSourceCapability.setdefault(logSource, 'ALL')
 	chrome_options.set_capability('goog:loggingPrefs', logSourceCapability)
 
-	if kwargs.get('browser_executable_path'):
-		return webdriver.Chrome(
-			executable_path=kwargs.get('browser_executable_path'), options=chrome_options
-		)
-	else:
-		return webdriver.Chrome(options=chrome_options)
+	executable_path = kwargs.get('browser_executable_path') or "chromedriver"
+	try:
+		if kwargs.get('shared_service', True):
+			driver = SharedServiceChrome(getChromeDriverService(executable_path), chrome_options)
+		else:
+			driver = ProfileCloneChrome(executable_path=executable_path, options=chrome_options)
+	except Exception:
+		removeProfileClone(profile_clone_dir)
+		raise
+	driver.profile_clone_dir = profile_clone_dir
+	return driver
 
 
 def getSafariDriver(**kwargs) -> WebDriver:
@@ -73,6 +257,51 @@ def getSafariDriver(**kwargs) -> WebDriver:
 	return webdriver.Safari()
 
 
+class LatencyTrackingConnection(RemoteConnection):
+	"""A `RemoteConnection` for high-latency grids that keeps its HTTP connections alive in a sized pool,
+	asks for compressed responses and records the round trip time of every command.
+
+	Args:
+		remote_server_addr (str): URL of the remote server.
+		pool_maxsize (int): Number of connections kept alive to the server.
+		compress (bool): Whether to ask for gzip compressed responses, e.g. for screenshots and page source.
+		rtt_threshold_ms (float): Median round trip time above which the connection counts as slow.
+		sample_size (int): Number of recent round trips kept for the median.
+	"""
+
+	def __init__(self, remote_server_addr, pool_maxsize=4, compress=True, rtt_threshold_ms=20, sample_size=50):
+		super().__init__(remote_server_addr, keep_alive=True)
+		self._conn = urllib3.PoolManager(timeout=self._timeout, maxsize=pool_maxsize, block=False)
+		self.compress = compress
+		self.rtt_threshold_ms = rtt_threshold_ms
+		self.round_trips = deque(maxlen=sample_size)
+		self.command_counts = {}
+
+	def get_remote_connection_headers(self, parsed_url, keep_alive=False):
+		headers = super().get_remote_connection_headers(parsed_url, keep_alive)
+		if self.compress:
+			headers['Accept-Encoding'] = 'gzip, deflate'
+		return headers
+
+	def execute(self, command, params):
+		start = time.perf_counter()
+		try:
+			return super().execute(command, params)
+		finally:
+			self.round_trips.append((time.perf_counter() - start) * 1000)
+			self.command_counts[command] = self.command_counts.get(command, 0) + 1
+
+	def getRoundTripSummary(self) -> LatencySummary:
+		"""Summarizes the recent command round trip times in milliseconds."""
+		return summarize(list(self.round_trips))
+
+	def isSlow(self) -> bool:
+		"""Returns True once the median recent round trip time exceeds `rtt_threshold_ms`."""
+		if not self.round_trips:
+			return False
+		return self.getRoundTripSummary().p50 > self.rtt_threshold_ms
+
+
 def getRemoteChromeDriver(**kwargs) -> WebDriver:
 	chrome_options = webdriver.ChromeOptions()
 
@@ -83,8 +312,18 @@ def getRemoteChromeDriver(**kwargs) -> WebDriver:
 	if remote_options.get('insecure', False):
 		chrome_options.set_capability('acceptInsecureCerts', True)
 
+	if kwargs.get('page_load_strategy'):
+		chrome_options.set_capability('pageLoadStrategy', kwargs.get('page_load_strategy'))
+
 	command_executor = remote_options.get('command_executor')
-	if command_executor:
+	if remote_options.get('latency_mode', False):
+		connection = LatencyTrackingConnection(
+			command_executor or 'http://127.0.0.1:4444/wd/hub',
+			pool_maxsize=remote_options.get('pool_maxsize', 4),
+			compress=remote_options.get('compress', True),
+			rtt_threshold_ms=remote_options.get('rtt_threshold_ms', 20))
+		return webdriver.Remote(connection, options=chrome_options)
+	elif command_executor:
 		return webdriver.Remote(command_executor, options=chrome_options)
 	else:
 		"""
@@ -101,48 +340,1228 @@ BROWSERS = {
 }
 
 
+@dataclass
+class BrowserBenchmark:
+	"""Startup and navigation times of one browser configuration, in seconds.
+
+	Attributes:
+		startup (LatencySummary): Time from requesting the driver until the browser session exists.
+		navigation (LatencySummary): Time for `driver.get` of the benchmark URL to return.
+		shutdown (LatencySummary): Time for the browser session to quit.
+	"""
+	startup: LatencySummary
+	navigation: LatencySummary
+	shutdown: LatencySummary
+
+
+def _timeBrowserRun(url, **kwargs) -> tuple:
+	"""Starts a browser, navigates to `url` and quits, returning the seconds each step took."""
+	start = time.perf_counter()
+	driver = BROWSERS[kwargs.get('browser', 'chrome')](**kwargs)
+	started = time.perf_counter()
+	try:
+		driver.get(url)
+	finally:
+		navigated = time.perf_counter()
+		driver.quit()
+	return started - start, navigated - started, time.perf_counter() - navigated
+
+
+def compareBrowserProfiles(url, profiles: dict = None, runs=5) -> dict:
+	"""Benchmarks browser startup and navigation for several driver configurations against the same page.
+	The configurations take turns on every run so that drift on the machine affects each of them alike.
+
+	Args:
+		url (str): The page to navigate to.
+		profiles (dict): Profile name mapped to its driver options, e.g. `{"fast": {"performance_profile": True}}`.
+			Defaults to Chrome with and without the performance profile.
+		runs (int): The number of browsers started per profile.
+
+	Returns:
+		dict: Profile name mapped to its `BrowserBenchmark`.
+	"""
+	profiles = profiles or {"default": {}, "performance": {"performance_profile": True}}
+	samples = {name: [] for name in profiles}
+	for _ in range(runs):
+		for name, options in profiles.items():
+			samples[name].append(_timeBrowserRun(url, **options))
+	return {name: BrowserBenchmark(*(summarize(list(step)) for step in zip(*runs_of_profile)))
+			for name, runs_of_profile in samples.items()}
+
+
+class RequestRuleAction(Enum):
+	"""What a `RequestRule` does with matching requests.
+
+	Stubbing responses or serving them from a local cache would need `Fetch.requestPaused` events, which
+	`execute_cdp_cmd` cannot receive, so neither is offered. For cached assets start the browser from a warmed
+	profile template instead, see `warmProfileTemplate` and the `template_profile` option.
+	"""
+	BLOCK = "block"
+	OBSERVE = "observe"
+
+
+@lru_cache(maxsize=None)
+def _wildcardPattern(pattern: str):
+	"""Compiles a URL pattern where only `*` is special, matching any characters, like `Network.setBlockedURLs`."""
+	return re.compile(".*".join(re.escape(part) for part in pattern.split("*")), re.DOTALL)
+
+
+@dataclass
+class RequestRule:
+	"""A URL pattern applied to every request the browser makes, see `Session.setRequestRules`.
+
+	Attributes:
+		pattern (str): URL pattern where `*` matches any characters, e.g. `*/res/perspective/fonts/*`. All other
+			characters, including `?` and `[`, match themselves.
+		action (RequestRuleAction): BLOCK fails matching requests before they are sent, OBSERVE only counts them.
+		hits (int): Number of requests that matched the rule, also counted when another rule matched them too.
+		bytes (int): Bytes received for matching requests that were not blocked.
+	"""
+	pattern: str
+	action: RequestRuleAction = RequestRuleAction.BLOCK
+	hits: int = 0
+	bytes: int = 0
+
+	def matches(self, url: str) -> bool:
+		return _wildcardPattern(self.pattern).fullmatch(url) is not None
+
+
+def compareProfileLoadTimes(url, template_dir, runs=3, **kwargs) -> dict:
+	"""Benchmarks Chrome with an empty profile against Chrome with a copy of a warmed profile template.
+
+	Args:
+		url (str): The page to navigate to, normally the one the template was warmed with.
+		template_dir (str): A template prepared with `warmProfileTemplate`.
+		runs (int): The number of browsers started per profile.
+		kwargs: Further `getChromeDriver` options shared by both profiles.
+
+	Returns:
+		dict: `BrowserBenchmark` results keyed by "cold" and "warm".
+	"""
+	return compareBrowserProfiles(url, {"cold": kwargs, "warm": dict(kwargs, template_profile=template_dir)}, runs)
+
+
+@dataclass
+class PopupEvent:
+	"""A popup opening or closing, as recorded by `PopupTracker`.
+
+	Attributes:
+		popup_id (str): The id of the popup, without the `popup-` prefix.
+		type (str): Either "open" or "close".
+		timestamp (float): Epoch time in seconds at which the popup was added to or removed from the page.
+		since_mark (float): Seconds between the last `PopupTracker.mark()` and the event, None without a mark.
+	"""
+	popup_id: str
+	type: str
+	timestamp: float
+	since_mark: float
+
+
+class PopupTracker(object):
+	"""Watches the page for Perspective popups with a MutationObserver and records when they open and close.
+	Waits are answered by the observer inside the browser instead of polling for `popup-<id>` elements.
+
+	The observer is installed again by any tracker call after a navigation reloads the page.
+	"""
+
+	# Installs the observer once per page. Popups already open are recorded as opened at install time.
+	INSTALL_JS = """
+		if (!window.__popupTracker) {
+			var tracker = window.__popupTracker = {events: [], open: {}, waiters: [], mark: null};
+			var record = function (type, el) {
+				var id = el.id.slice('popup-'.length), now = performance.now();
+				if ((type === 'open') === (id in tracker.open)) { return; }
+				if (type === 'open') { tracker.open[id] = el; } else { delete tracker.open[id]; }
+				tracker.events.push({
+					id: id, type: type, time: performance.timeOrigin + now,
+					sinceMark: tracker.mark === null ? null : now - tracker.mark
+				});
+			};
+			var visit = function (type, node) {
+				if (node.nodeType !== 1) { return; }
+				if (node.id && node.id.indexOf('popup-') === 0) { record(type, node); }
+				Array.prototype.forEach.call(node.querySelectorAll('[id^="popup-"]'), function (el) { record(type, el); });
+			};
+			Array.prototype.forEach.call(document.querySelectorAll('[id^="popup-"]'), function (el) { record('open', el); });
+			new MutationObserver(function (mutations) {
+				mutations.forEach(function (mutation) {
+					Array.prototype.forEach.call(mutation.removedNodes, function (node) { visit('close', node); });
+					Array.prototype.forEach.call(mutation.addedNodes, function (node) { visit('open', node); });
+				});
+				tracker.waiters = tracker.waiters.filter(function (waiter) { return !waiter(); });
+			}).observe(document.body, {childList: true, subtree: true});
+		}
+		var tracker = window.__popupTracker;
+	"""
+
+	# Calls back as soon as the requested condition holds, checking again after every observed mutation.
+	# Pending checks carry a token, so a timed out wait can be removed.
+	WAIT_SCRIPT = INSTALL_JS + """
+		var condition = arguments[0], id = arguments[1], done = arguments[arguments.length - 1];
+		var check = function () {
+			if (condition === 'open' && id in tracker.open) { done(tracker.open[id]); return true; }
+			if (condition === 'close' && !(id in tracker.open)) { done(true); return true; }
+			if (condition === 'allClosed' && Object.keys(tracker.open).length === 0) { done(true); return true; }
+			return false;
+		};
+		check.token = arguments[2];
+		if (!check()) { tracker.waiters.push(check); }
+	"""
+
+	CANCEL_WAIT_SCRIPT = INSTALL_JS + """
+		var token = arguments[0];
+		tracker.waiters = tracker.waiters.filter(function (waiter) { return waiter.token !== token; });
+	"""
+
+	EVENTS_SCRIPT = INSTALL_JS + """
+		return tracker.events.map(function (event) { return [event.id, event.type, event.time, event.sinceMark]; });
+	"""
+
+	MARK_SCRIPT = INSTALL_JS + """
+		tracker.mark = performance.now();
+		return Object.keys(tracker.open);
+	"""
+
+	OPEN_POPUPS_SCRIPT = INSTALL_JS + """
+		return Object.keys(tracker.open);
+	"""
+
+	def __init__(self, session) -> None:
+		self.session = session
+		self._wait_count = 0
+		self.session.driver.execute_script(self.OPEN_POPUPS_SCRIPT)
+
+	def mark(self) -> None:
+		"""Marks the moment an action that opens popups is triggered, `since_mark` of later events counts from here."""
+		self.session.driver.execute_script(self.MARK_SCRIPT)
+
+	def getEvents(self) -> List[PopupEvent]:
+		"""Returns every popup event recorded on the current page, in order."""
+		events = self.session.driver.execute_script(self.EVENTS_SCRIPT)
+		return [PopupEvent(popup_id, type, time / 1000, None if since_mark is None else since_mark / 1000)
+				for popup_id, type, time, since_mark in events]
+
+	def getOpenPopups(self) -> List[str]:
+		"""Returns the ids of the popups currently open."""
+		return self.session.driver.execute_script(self.OPEN_POPUPS_SCRIPT)
+
+	def getOpenTimes(self) -> dict:
+		"""Returns the seconds each popup took to open after the preceding mark, keyed by popup id."""
+		return {event.popup_id: event.since_mark for event in self.getEvents()
+				if event.type == "open" and event.since_mark is not None}
+
+	def waitForOpen(self, popup_id: str, timeout_in_seconds=None) -> WebElement:
+		"""Blocks until the popup is open.
+
+		Returns:
+			WebElement: The popup's `popup-<id>` element.
+
+		Raises:
+			ElementNotFoundException: If the popup does not open within the timeout.
+		"""
+		return self._wait("open", popup_id, timeout_in_seconds,
+						  "Popup %s did not open" % popup_id)
+
+	def waitForClose(self, popup_id: str, timeout_in_seconds=None) -> None:
+		"""Blocks until the popup is closed.
+
+		Raises:
+			ElementNotFoundException: If the popup is still open after the timeout.
+		"""
+		self._wait("close", popup_id, timeout_in_seconds, "Popup %s did not close" % popup_id)
+
+	def waitForAllClosed(self, timeout_in_seconds=None) -> None:
+		"""Blocks until no popup is open.
+
+		Raises:
+			ElementNotFoundException: If a popup is still open after the timeout.
+		"""
+		self._wait("allClosed", None, timeout_in_seconds, "Popups are still open")
+
+	def _wait(self, condition: str, popup_id: str, timeout_in_seconds, message: str):
+		"""Runs the asynchronous wait script with the script timeout set to the wait timeout, restoring the
+		previous script timeout afterwards and removing the pending check from the page when the wait times out."""
+		self._wait_count += 1
+		token = self._wait_count
+		previous_timeout = self.session.setScriptTimeout(timeout_in_seconds or self.session.wait_timeout_in_seconds)
+		try:
+			return self.session.driver.execute_async_script(self.WAIT_SCRIPT, condition, popup_id, token)
+		except TimeoutException:
+			self.session.driver.execute_script(self.CANCEL_WAIT_SCRIPT, token)
+			raise ElementNotFoundException(message)
+		finally:
+			self.session.setScriptTimeout(previous_timeout)
+
+
+@dataclass
+class TabMemory:
+	"""JavaScript heap usage of one pooled window, in bytes.
+
+	Attributes:
+		window_handle (str): The handle of the window.
+		url (str): The page open in the window.
+		used_js_heap (int): Bytes used by live JavaScript objects.
+		total_js_heap (int): Bytes allocated for the JavaScript heap.
+	"""
+	window_handle: str
+	url: str
+	used_js_heap: int
+	total_js_heap: int
+
+
+class _PooledBrowser(object):
+	"""One browser of a `BrowserPool` and the bookkeeping of its windows."""
+
+	def __init__(self, driver: WebDriver) -> None:
+		self.driver = driver
+		self.lock = threading.RLock()
+		self.current_handle = driver.current_window_handle
+		self.free_handles = [self.current_handle]
+		self.used_handles = set()
+
+	def switchTo(self, handle: str) -> None:
+		if handle != self.current_handle:
+			self.driver.execute(Command.SWITCH_TO_WINDOW, {'handle': handle} if self.driver.w3c else {'name': handle})
+			self.current_handle = handle
+
+
+class PooledWindowDriver(WebDriver):
+	"""A WebDriver bound to one window of a browser shared through a `BrowserPool`.
+	Every command first switches the browser to this window, so pooled drivers can be used like separate browsers.
+	Elements found through the driver belong to it and switch windows the same way.
+
+	Attributes:
+		window_handle (str): The window commands are sent to, changed when the session switches windows.
+		acquired_handle (str): The pool window the driver was given, returned to the pool on `quit()`.
+		opened_handles (Set[str]): Other windows the session switched to, e.g. popups opened by the page, closed
+			on `quit()`.
+	"""
+
+	# Chrome specific commands of the shared browser
+	execute_cdp_cmd = webdriver.Chrome.execute_cdp_cmd
+
+	def __init__(self, pool, browser: _PooledBrowser, window_handle: str) -> None:
+		self.pool = pool
+		self.browser = browser
+		self.window_handle = window_handle
+		self.acquired_handle = window_handle
+		self.opened_handles = set()
+		super().__init__(command_executor=browser.driver.command_executor)
+		self._is_remote = browser.driver._is_remote
+
+	def start_session(self, capabilities, browser_profile=None) -> None:
+		"""Shares the session of the pooled browser instead of starting a new one."""
+		self.session_id = self.browser.driver.session_id
+		self.capabilities = self.browser.driver.capabilities
+		self.w3c = self.browser.driver.w3c
+
+	def execute(self, driver_command, params=None):
+		with self.browser.lock:
+			self.browser.switchTo(self.window_handle)
+			response = WebDriver.execute(self, driver_command, params)
+			if driver_command == Command.SWITCH_TO_WINDOW:
+				# Follows the logical session into the window it switched to, e.g. one opened by the page
+				self.window_handle = self.browser.current_handle = params.get('handle', params.get('name'))
+				if self.window_handle != self.acquired_handle:
+					self.opened_handles.add(self.window_handle)
+			elif driver_command == Command.CLOSE:
+				self.browser.current_handle = None
+			return response
+
+	def quit(self) -> None:
+		"""Returns the window to the pool instead of ending the browser session."""
+		self.pool.release(self)
+
+
+class BrowserPool(object):
+	"""Multiplexes many logical sessions onto the windows of a few browsers, trading a window switch per command
+	for the memory of a browser per session. Pass the pool to `Session` with the `pool` kwarg.
+
+	Commands of different sessions sharing a browser are serialized, a session blocked in a long wait delays the
+	others in its browser.
+
+	Args:
+		max_browsers (int): The number of browsers the pool may start.
+		windows_per_browser (int): The number of sessions sharing each browser.
+		kwargs: The `BROWSERS` options of the pooled browsers. `performance_profile` defaults to True, as it stops
+			Chrome from throttling the windows in the background.
+	"""
+
+	# Opens a blank window the driver can switch to.
+	OPEN_WINDOW_SCRIPT = "window.open('about:blank', '_blank');"
+
+	MEMORY_SCRIPT = """
+		var memory = performance.memory || {};
+		return [window.location.href, memory.usedJSHeapSize || null, memory.totalJSHeapSize || null];
+	"""
+
+	def __init__(self, max_browsers=2, windows_per_browser=8, **kwargs) -> None:
+		self.max_browsers = max_browsers
+		self.windows_per_browser = windows_per_browser
+		self.browser_kwargs = dict(kwargs, performance_profile=kwargs.get('performance_profile', True))
+		self.browsers: List[_PooledBrowser] = []
+		self.drivers: List[PooledWindowDriver] = []
+		self._lock = threading.Lock()
+
+	def acquire(self) -> PooledWindowDriver:
+		"""Returns a driver for a free window, opening a window or starting a browser when none is free.
+
+		Raises:
+			SessionConfigurationException: If every browser is at `windows_per_browser` and `max_browsers` are running.
+		"""
+		with self._lock:
+			browser = min(self.browsers, key=lambda browser: len(browser.used_handles), default=None)
+			if browser is None or len(browser.used_handles) >= self.windows_per_browser:
+				if len(self.browsers) >= self.max_browsers:
+					raise SessionConfigurationException(
+						"The browser pool is full with %s sessions." % (self.max_browsers * self.windows_per_browser))
+				browser = _PooledBrowser(BROWSERS[self.browser_kwargs.get('browser', 'chrome')](**self.browser_kwargs))
+				self.browsers.append(browser)
+
+			with browser.lock:
+				if not browser.free_handles:
+					browser.free_handles.append(self._openWindow(browser, browser.driver.window_handles))
+				handle = browser.free_handles.pop()
+				browser.used_handles.add(handle)
+
+		driver = PooledWindowDriver(self, browser, handle)
+		self.drivers.append(driver)
+		return driver
+
+	def release(self, driver: PooledWindowDriver) -> None:
+		"""Closes the other windows the session switched to, then blanks the window it acquired and keeps it open
+		for the next session. An acquired window the session closed itself is replaced with a new one."""
+		browser = driver.browser
+		with browser.lock:
+			handles = browser.driver.window_handles
+			pool_handles = browser.used_handles.union(browser.free_handles)
+			for handle in driver.opened_handles - pool_handles:
+				if handle in handles:
+					browser.switchTo(handle)
+					browser.driver.execute(Command.CLOSE)
+					browser.current_handle = None
+			driver.opened_handles.clear()
+
+			handles = browser.driver.window_handles
+			driver.window_handle = driver.acquired_handle
+			if driver.acquired_handle in handles:
+				driver.get("about:blank")
+				handle = driver.acquired_handle
+			else:
+				handle = self._openWindow(browser, handles)
+			browser.used_handles.discard(driver.acquired_handle)
+			browser.free_handles.append(handle)
+		if driver in self.drivers:
+			self.drivers.remove(driver)
+
+	def _openWindow(self, browser: _PooledBrowser, handles: List[str]) -> str:
+		"""Opens a blank window from one of the browser's open windows and returns its handle."""
+		browser.switchTo(handles[0])
+		browser.driver.execute_script(self.OPEN_WINDOW_SCRIPT)
+		return (set(browser.driver.window_handles) - set(handles)).pop()
+
+	def getMemoryUsage(self) -> List[TabMemory]:
+		"""Reads the JavaScript heap usage of the window of every acquired driver."""
+		return [TabMemory(driver.window_handle, *driver.execute_script(self.MEMORY_SCRIPT)) for driver in list(self.drivers)]
+
+	def close(self) -> None:
+		"""Quits every browser of the pool."""
+		with self._lock:
+			for browser in self.browsers:
+				browser.driver.quit()
+			self.browsers = []
+			self.drivers = []
+
+
+@dataclass
+class NavigationTiming:
+	"""Timing of one `Session.navigateToUrl` call.
+
+	Attributes:
+		url (str): The URL navigated to.
+		seconds (float): Time until the call returned.
+		reload_banner (bool): Whether a reload banner was dismissed first, None when navigating in the default mode.
+		response_start (float): Milliseconds from the navigation start until the first response byte, None if unknown.
+		dom_interactive (float): Milliseconds from the navigation start until the document became interactive.
+	"""
+	url: str
+	seconds: float
+	reload_banner: bool
+	response_start: float = None
+	dom_interactive: float = None
+
+
+# Chrome log levels from least to most severe
+LOG_LEVELS = ["ALL", "DEBUG", "INFO", "WARNING", "SEVERE"]
+
+
+@dataclass
+class LogEntry:
+	"""An entry read by a `LogCollector`.
+
+	Attributes:
+		sequence (int): Position of the entry among everything the collector read, starting at 1.
+		source (str): The log source, e.g. "browser".
+		level (str): The log level, e.g. "SEVERE".
+		message (str): The logged message.
+		timestamp (float): Epoch time in seconds at which the browser logged the entry.
+	"""
+	sequence: int
+	source: str
+	level: str
+	message: str
+	timestamp: float
+
+	def toDict(self) -> dict:
+		"""Returns the entry in the format of `WebDriver.get_log`, plus its source."""
+		return {"level": self.level, "message": self.message, "source": self.source, "timestamp": int(self.timestamp * 1000)}
+
+
+class LogCollector(object):
+	"""Drains the Session's log sources on a background thread into a bounded ring buffer, so that the browser
+	does not drop entries in long tests and reading them stays cheap. Errors are also kept in a buffer of their own.
+	An unexpected failure while draining stops the thread and is kept in `error`, the buffer stays readable.
+
+	Args:
+		session (Session): The session whose logs are collected.
+		sources (List[str]): The sources to drain, defaults to the Session's `log_sources` except "performance",
+			which `Session.getPerformanceEvents` reads.
+		interval_in_seconds (float): Time between two drains.
+		max_entries (int): Entries kept in the ring buffer, the oldest are dropped first.
+		sink_path (str): A file every entry is appended to as a JSON line.
+	"""
+
+	def __init__(self, session, sources: List[str] = None, interval_in_seconds=1.0, max_entries=10000, sink_path=None) -> None:
+		self.session = session
+		self.sources = sources or [source for source in session.log_sources if source != LogSource.PERFORMANCE.value]
+		self.interval_in_seconds = interval_in_seconds
+		self.entries = deque(maxlen=max_entries)
+		self.errors = deque(maxlen=max_entries)
+		self.sequence = 0
+		self.sink_path = sink_path
+		self._sink = None
+		self._lock = threading.Lock()
+		self._stopped = threading.Event()
+		self._thread = None
+		self.error = None
+
+	def start(self) -> "LogCollector":
+		"""Starts draining the logs in the background."""
+		if self.sink_path and self._sink is None:
+			self._sink = open(self.sink_path, "a")
+		self._stopped.clear()
+		self.error = None
+		self._thread = threading.Thread(target=self._run, daemon=True)
+		self._thread.start()
+		return self
+
+	def stop(self) -> None:
+		"""Stops the background thread after a last drain and closes the sink. The last drain is skipped when the
+		thread stopped on an `error`."""
+		self._stopped.set()
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
+		try:
+			if self.error is None:
+				self.poll()
+		finally:
+			if self._sink is not None:
+				self._sink.close()
+				self._sink = None
+
+	def _run(self) -> None:
+		try:
+			while not self._stopped.wait(self.interval_in_seconds):
+				self.poll()
+		except Exception as e:
+			self.error = e
+			self._stopped.set()
+			print("Log collector stopped: %s" % e)
+
+	def poll(self) -> int:
+		"""Drains every source once, returning the number of new entries. Sources that cannot be read at the
+		moment, e.g. while the browser is being recycled, are skipped."""
+		collected = 0
+		if self.session._driver is None:
+			# Leaves a lazy session's browser unstarted
+			return collected
+		with self._lock:
+			for source in self.sources:
+				try:
+					with self.session._backgroundCommands():
+						raw_entries = self.session.driver.get_log(source)
+				except WebDriverException:
+					continue
+				for raw_entry in raw_entries:
+					self.sequence += 1
+					entry = LogEntry(self.sequence, source, raw_entry.get("level"), raw_entry.get("message"),
+									 raw_entry.get("timestamp", 0) / 1000)
+					self.entries.append(entry)
+					if entry.level == "SEVERE":
+						self.errors.append(entry)
+					if self._sink is not None:
+						self._sink.write(json.dumps(entry.toDict()) + "\n")
+					collected += 1
+			if self._sink is not None and collected:
+				self._sink.flush()
+		return collected
+
+	def mark(self) -> int:
+		"""Returns the sequence number of the latest entry, to pass as `since` to later queries."""
+		with self._lock:
+			return self.sequence
+
+	def getEntries(self, source: str = None, level: str = None, since: int = 0) -> List[LogEntry]:
+		"""Returns the buffered entries matching every given filter.
+
+		Args:
+			source (str): Only entries of this source.
+			level (str): Only entries at this level or a more severe one, e.g. "WARNING".
+			since (int): Only entries after this `mark()`.
+		"""
+		minimum = LOG_LEVELS.index(level) if level in LOG_LEVELS else 0
+		with self._lock:
+			return [entry for entry in self.entries
+					if entry.sequence > since and (source is None or entry.source == source)
+					and (entry.level not in LOG_LEVELS or LOG_LEVELS.index(entry.level) >= minimum)]
+
+	def getErrorsSince(self, mark: int = 0) -> List[LogEntry]:
+		"""Returns the SEVERE entries after the given `mark()`, reading only the error buffer."""
+		with self._lock:
+			errors = []
+			for entry in reversed(self.errors):
+				if entry.sequence <= mark:
+					break
+				errors.append(entry)
+		return errors[::-1]
+
+
+@dataclass
+class MetricsCapture:
+	"""Browser performance metrics around a block of code, see `Session.captureMetrics`.
+	Metric names are those of the DevTools `Performance.getMetrics` command, e.g. `LayoutCount`, `LayoutDuration`,
+	`ScriptDuration`, `JSHeapUsedSize` or `Nodes`. Durations are in seconds, sizes in bytes.
+
+	Attributes:
+		before (dict): Metrics at the start of the block.
+		after (dict): Metrics at the end of the block.
+		delta (dict): `after` minus `before` for every metric present in both.
+		seconds (float): Wall time the block took.
+	"""
+	before: dict
+	after: dict = None
+	delta: dict = None
+	seconds: float = None
+
+
+@dataclass
+class WebsocketFrame:
+	"""A websocket frame recorded by `WebsocketTap`.
+
+	Attributes:
+		request_id (str): DevTools id of the websocket the frame belongs to.
+		direction (str): "sent" for client to gateway frames, "received" for gateway to client frames.
+		timestamp (float): Epoch time in seconds at which the browser sent or received the frame.
+		size (int): Payload size in bytes.
+		opcode (int): Websocket opcode, 1 for text and 2 for binary frames.
+	"""
+	request_id: str
+	direction: str
+	timestamp: float
+	size: int
+	opcode: int
+
+
+@dataclass
+class WebsocketLatency:
+	"""Timing of one interaction measured by `WebsocketTap.measure`, as epoch times in seconds on the browser's clock.
+
+	Attributes:
+		mark (float): When `WebsocketTap.mark()` was called, just before the interaction.
+		first_sent (float): The first frame the client sent after the mark, None if it sent none.
+		first_received (float): The first frame received from the gateway after the mark.
+		first_mutation (float): The first DOM mutation after that frame, None if the page did not change.
+		response_seconds (float): From the mark until the first received frame.
+		render_seconds (float): From the first received frame until the DOM mutation, None without a mutation.
+	"""
+	mark: float
+	first_sent: float
+	first_received: float
+	first_mutation: float
+	response_seconds: float
+	render_seconds: float
+
+
+class WebsocketTap(object):
+	"""Records the websocket frames between the Perspective client and the gateway from the DevTools events of the
+	performance log, and times interactions from a mark until the gateway answers and the page updates:
+
+		tap = session.tapWebsockets()
+		tap.mark()
+		button.click()
+		latency = tap.measure()
+
+	Args:
+		session (Session): The session to record, whose `log_sources` must include "performance".
+		max_frames (int): Frames kept, the oldest are dropped first.
+		max_mutations (int): DOM mutations timed after the first frame received following a mark.
+	"""
+
+	# Records the time of the mark and of the mutations following it in the browser. Mutations only count towards
+	# `maxMutations` once the time of the first received frame is known, see MUTATIONS_SCRIPT.
+	MARK_SCRIPT = """
+		var tap = window.__websocketTap = window.__websocketTap || {};
+		if (tap.observer) { tap.observer.disconnect(); }
+		tap.mark = performance.timeOrigin + performance.now();
+		tap.mutations = [];
+		tap.since = null;
+		tap.maxMutations = arguments[0];
+		tap.observer = new MutationObserver(function () {
+			tap.mutations.push(performance.timeOrigin + performance.now());
+			if (tap.since !== null && tap.mutations.length >= tap.maxMutations) { tap.observer.disconnect(); }
+		});
+		tap.observer.observe(document.body, {childList: true, subtree: true, characterData: true, attributes: true});
+		return tap.mark;
+	"""
+
+	# Drops the mutations before the given time and returns the rest; later mutations are counted from there.
+	MUTATIONS_SCRIPT = """
+		var tap = window.__websocketTap;
+		if (!tap) { return []; }
+		tap.since = arguments[0];
+		tap.mutations = tap.mutations.filter(function (time) { return time >= tap.since; });
+		if (tap.observer && tap.mutations.length >= tap.maxMutations) { tap.observer.disconnect(); }
+		return tap.mutations;
+	"""
+
+	STOP_SCRIPT = """
+		var tap = window.__websocketTap;
+		if (tap && tap.observer) { tap.observer.disconnect(); tap.observer = null; }
+	"""
+
+	TIME_ORIGIN_SCRIPT = "return performance.timeOrigin;"
+
+	def __init__(self, session, max_frames=100000, max_mutations=100) -> None:
+		self.session = session
+		self.frames = deque(maxlen=max_frames)
+		self.latencies: List[WebsocketLatency] = []
+		self.max_mutations = max_mutations
+		self.started = time.time()
+		self._mark = None
+		# Offset from the browser's monotonic event timestamps to the page's epoch clock, calibrated on the first
+		# read or else learnt from an event carrying both. Frames wait in `_unconverted` until it is known.
+		self._wall_offset = None
+		self._calibrated = False
+		self._unconverted = []
+
+	def calibrate(self) -> None:
+		"""Learns the offset from the browser's monotonic event timestamps to the page's epoch clock, which also
+		times the mark and the mutations, so that latencies do not depend on the clock of the machine running the
+		test. Chrome's `NavigationStart` metric is the page's `performance.timeOrigin` on the clock of the events,
+		the offset does not depend on round trip times either. Leaves the offset unknown if the browser has no
+		metrics."""
+		self._calibrated = True
+		try:
+			navigation_start = self.session.metrics().get("NavigationStart")
+			with self.session._backgroundCommands():
+				time_origin = self.session.driver.execute_script(self.TIME_ORIGIN_SCRIPT)
+		except (AttributeError, WebDriverException):
+			return
+		if navigation_start and time_origin:
+			self._wall_offset = time_origin / 1000 - navigation_start
+
+	def record(self, events: List[dict]) -> None:
+		"""Records the websocket frames among the given performance log events, see `Session.getPerformanceEvents`."""
+		if not self._calibrated:
+			self.calibrate()
+		for event in events:
+			params = event.get("params", {})
+			if "wallTime" in params and "timestamp" in params:
+				if self._wall_offset is None:
+					# The browser's wall clock, which the page shares, at the time of the event
+					self._wall_offset = params["wallTime"] - params["timestamp"]
+			elif event["method"] in ("Network.webSocketFrameSent", "Network.webSocketFrameReceived"):
+				response = params.get("response", {})
+				payload = response.get("payloadData", "")
+				# Binary payloads are base64 encoded
+				size = len(payload) * 3 // 4 if response.get("opcode") == 2 else len(payload.encode("utf-8"))
+				direction = "sent" if event["method"] == "Network.webSocketFrameSent" else "received"
+				self._unconverted.append(WebsocketFrame(params.get("requestId"), direction, params["timestamp"], size,
+														response.get("opcode")))
+		if self._wall_offset is not None:
+			for frame in self._unconverted:
+				frame.timestamp += self._wall_offset
+				self.frames.append(frame)
+			self._unconverted = []
+
+	def mark(self) -> None:
+		"""Marks the start of an interaction, call it right before the action that should reach the gateway."""
+		self.session.getPerformanceEvents()
+		self._mark = self.session.driver.execute_script(self.MARK_SCRIPT, self.max_mutations) / 1000
+
+	def measure(self, timeout_in_seconds=None) -> WebsocketLatency:
+		"""Waits for the first frame from the gateway after the mark and for the next DOM mutation, and records
+		their timing in `latencies`.
+
+		Raises:
+			TimeoutException: If no frame arrives from the gateway within the timeout.
+		"""
+		mark = self._mark
+		if mark is None:
+			raise SessionConfigurationException("Call mark() before the interaction to measure.")
+
+		def firstReceived(driver):
+			self.session.getPerformanceEvents()
+			return self._firstFrame("received", mark)
+
+		first_received = WebDriverWait(self.session.driver, timeout_in_seconds or self.session.wait_timeout_in_seconds).until(
+			firstReceived, "No websocket frame was received after the mark")
+
+		def firstMutation(driver):
+			mutations = driver.execute_script(self.MUTATIONS_SCRIPT, first_received * 1000)
+			return mutations[0] / 1000 if mutations else None
+
+		try:
+			first_mutation = WebDriverWait(self.session.driver, timeout_in_seconds or self.session.wait_timeout_in_seconds,
+										   poll_frequency=0.05).until(firstMutation)
+		except TimeoutException:
+			first_mutation = None
+		self.session.driver.execute_script(self.STOP_SCRIPT)
+
+		latency = WebsocketLatency(mark, self._firstFrame("sent", mark), first_received, first_mutation,
+								   first_received - mark, None if first_mutation is None else first_mutation - first_received)
+		self.latencies.append(latency)
+		return latency
+
+	def _firstFrame(self, direction: str, since: float) -> float:
+		return next((frame.timestamp for frame in self.frames
+					 if frame.direction == direction and frame.timestamp >= since), None)
+
+	def getFrames(self, direction: str = None) -> List[WebsocketFrame]:
+		"""Returns the recorded frames, only those in the given direction if one is given."""
+		self.session.getPerformanceEvents()
+		return [frame for frame in self.frames if direction is None or frame.direction == direction]
+
+	def getThroughput(self) -> dict:
+		"""Returns the frames and bytes per second in each direction since the tap started.
+
+		Returns:
+			dict: "sent" and "received" mapped to dicts of `frames`, `bytes`, `frames_per_second` and `bytes_per_second`.
+		"""
+		frames = self.getFrames()
+		seconds = max(time.time() - self.started, 1e-9)
+		throughput = {}
+		for direction in ("sent", "received"):
+			directed = [frame for frame in frames if frame.direction == direction]
+			total_bytes = sum(frame.size for frame in directed)
+			throughput[direction] = {"frames": len(directed), "bytes": total_bytes,
+									 "frames_per_second": len(directed) / seconds, "bytes_per_second": total_bytes / seconds}
+		return throughput
+
+	def getLatencySummary(self) -> LatencySummary:
+		"""Summarizes the response seconds of every measured interaction."""
+		return summarize([latency.response_seconds for latency in self.latencies])
+
+	def getLatencyHistogram(self, bucket_in_seconds=0.01) -> dict:
+		"""Counts the measured response seconds per bucket, keyed by the lower bound of the bucket."""
+		return histogram([latency.response_seconds for latency in self.latencies], bucket_in_seconds)
+
+
+@dataclass
+class RecyclePolicy:
+	"""Limits after which `Session` replaces its browser with a fresh one. Limits left as None are not checked.
+	They are checked before every navigation and whenever `Session.maybeRecycle()` is called.
+
+	Attributes:
+		max_commands (int): WebDriver commands sent for the test. Reads of logs, performance events, metrics and
+			the JavaScript heap, including those of a `LogCollector`, are not counted.
+		max_seconds (float): Seconds since the browser started.
+		max_js_heap_bytes (int): JavaScript heap used by the current page.
+	"""
+	max_commands: int = None
+	max_seconds: float = None
+	max_js_heap_bytes: int = None
+
+
+@dataclass
+class RecycleEvent:
+	"""A browser replaced by `Session.recycle`.
+
+	Attributes:
+		timestamp (float): Epoch time in seconds of the recycle.
+		reason (str): The limit that was exceeded, or "manual".
+		commands (int): Commands the replaced browser had run.
+		seconds (float): Seconds the replaced browser had been running.
+		used_js_heap (int): Bytes of JavaScript heap used by the page at the time, None if unknown.
+		total_js_heap (int): Bytes allocated for the JavaScript heap at the time, None if unknown.
+		url (str): The page that was restored in the new browser.
+	"""
+	timestamp: float
+	reason: str
+	commands: int
+	seconds: float
+	used_js_heap: int
+	total_js_heap: int
+	url: str
+
+
 class Session(object):
+	# Present once Perspective has mounted a view, every rendered component carries its path.
+	view_root_selector = "[data-component-path]"
+
+	# WebDriver's default timeout for asynchronous scripts. The timeout cannot be read back from the browser, so the
+	# session tracks it, see `setScriptTimeout()`.
+	default_script_timeout_in_seconds = 30
+
+	# Leaves a marker on the current document, gone once the next document replaces it.
+	MARK_NAVIGATION_SCRIPT = "window.__perspectiveNavigation = true;"
+
+	# Returns the navigation timing once the new document is interactive and, if requested, a view is mounted.
+	NAVIGATION_READY_SCRIPT = """
+		if (window.__perspectiveNavigation || document.readyState === 'loading') { return null; }
+		if (arguments[0] && !document.querySelector(arguments[0])) { return null; }
+		var entry = performance.getEntriesByType('navigation')[0];
+		return entry ? [entry.responseStart, entry.domInteractive] : [null, null];
+	"""
+
 	def __init__(self, base_url, page_path, wait_timeout_in_seconds, **kwargs) -> None:
+		if kwargs.get('fast_navigation'):
+			# Lets driver.get() return before the load event, readiness is then checked by navigateToUrl
+			kwargs.setdefault('page_load_strategy', 'none')
+		request_rules = kwargs.get('request_rules')
+		if (request_rules or kwargs.get('websocket_tap')) and LogSource.PERFORMANCE.value not in kwargs.get('log_sources', []):
+			# The rule hit counters and the websocket frames are read from the performance log
+			kwargs['log_sources'] = kwargs.get('log_sources', []) + [LogSource.PERFORMANCE.value]
 
-		self.driver = BROWSERS[kwargs.get('browser', 'chrome')](**kwargs)
 		self.base_url = base_url
 		self.original_page_url = base_url + page_path
-		self.navigateToUrl(self.original_page_url)
-		self.wait = WebDriverWait(self.driver, wait_timeout_in_seconds)
+		self.request_rules = []
+		self._rule_requests = {}
+		self.wait_timeout_in_seconds = wait_timeout_in_seconds
+		self.script_timeout_in_seconds = self.default_script_timeout_in_seconds
+		self.fast_navigation = kwargs.get('fast_navigation', False)
+		self.navigation_timings = []
 		self.credentials = kwargs.get('credentials')
 		self.platform_version = system().upper()
 		self.select_all_keys = self.getSelectAllKeys()
 		self.log_sources = kwargs.get('log_sources', [])
+		self.popups = None
+		self.recycle_policy = kwargs.get('recycle_policy')
+		self.recycle_events = []
+		self.command_count = 0
+		self._driver_started_at = None
+		self._recycling = False
+		self._has_navigated = False
+		self._metrics_enabled = False
+		self._background_commands = threading.local()
+		self.websocket_tap = WebsocketTap(self) if kwargs.get('websocket_tap') else None
+		self.log_collector = None
+		self._log_read_sequences = {}
+
+		# With `lazy` the browser starts on first use of `driver`, or right away in a background thread with
+		# `start_in_background`, and the first navigation waits for `open()`
+		self.lazy = kwargs.get('lazy', False) or kwargs.get('start_in_background', False)
+		self._driver = None
+		self._driver_kwargs = kwargs
+		self._driver_lock = threading.Lock()
+		self._driver_thread = None
+		self._driver_error = None
+		self._initial_request_rules = request_rules
+		if kwargs.get('start_in_background'):
+			self._driver_thread = threading.Thread(target=self._startDriverInBackground, daemon=True)
+			self._driver_thread.start()
+		elif not self.lazy:
+			self.startDriver()
+			self.navigateToUrl(self.original_page_url)
 
-	def __enter__(self):
+	@property
+	def driver(self) -> WebDriver:
+		"""The session's WebDriver, started on first use in a lazy session."""
+		if self._driver is None or self._driver_thread is not None:
+			self.startDriver()
+		return self._driver
+
+	@driver.setter
+	def driver(self, driver: WebDriver) -> None:
+		self._driver = driver
+		self.wait = WebDriverWait(driver, self.wait_timeout_in_seconds)
+		self.command_count = 0
+		self._driver_started_at = time.perf_counter()
+		self._has_navigated = False
+		self._metrics_enabled = False
+		if self.script_timeout_in_seconds != self.default_script_timeout_in_seconds:
+			# A new browser starts with the default, apply the timeout set on the session
+			driver.set_script_timeout(self.script_timeout_in_seconds)
+		execute = driver.execute
+
+		def countingExecute(driver_command, params=None):
+			if not getattr(self._background_commands, "active", False):
+				self.command_count += 1
+			return execute(driver_command, params)
+		driver.execute = countingExecute
+
+	def startDriver(self) -> WebDriver:
+		"""Starts the browser unless it is already running, waiting for a background start to finish.
+
+		Raises:
+			Exception: Whatever a failed background start raised.
+		"""
+		with self._driver_lock:
+			if self._driver_thread is not None:
+				self._driver_thread.join()
+				self._driver_thread = None
+				if self._driver_error is not None:
+					error, self._driver_error = self._driver_error, None
+					raise error
+			if self._driver is None:
+				self._createDriver()
+		return self._driver
+
+	def _createDriver(self) -> None:
+		# Runs in the background thread for `start_in_background`, so only the new driver is used here: the
+		# `driver` property would wait for this very thread
+		if self._driver_kwargs.get('pool'):
+			driver = self._driver_kwargs.get('pool').acquire()
+		else:
+			driver = BROWSERS[self._driver_kwargs.get('browser', 'chrome')](**self._driver_kwargs)
+		rules = self.request_rules or self._initial_request_rules
+		if rules:
+			try:
+				self._applyRequestRules(driver, rules)
+			except Exception:
+				driver.quit()
+				raise
+		self.driver = driver
+
+	def _startDriverInBackground(self) -> None:
+		try:
+			self._createDriver()
+		except Exception as e:
+			self._driver_error = e
+
+	@contextmanager
+	def _backgroundCommands(self) -> Iterator[None]:
+		"""Keeps the commands sent by the current thread inside the block out of `command_count`."""
+		previous = getattr(self._background_commands, "active", False)
+		self._background_commands.active = True
+		try:
+			yield
+		finally:
+			self._background_commands.active = previous
+
+	def setScriptTimeout(self, seconds: float) -> float:
+		"""Sets the timeout of asynchronous scripts, keeping it across browser restarts.
+		Set the timeout here instead of on the driver, so that it can be restored.
+
+		Returns:
+			float: The previous timeout in seconds.
+		"""
+		previous = self.script_timeout_in_seconds
+		self.driver.set_script_timeout(seconds)
+		self.script_timeout_in_seconds = seconds
+		return previous
+
+	def metrics(self) -> dict:
+		"""Reads the browser's performance metrics for the current page through the DevTools protocol.
+
+		Returns:
+			dict: Metric name mapped to its value, e.g. `LayoutCount`, `RecalcStyleDuration`, `ScriptDuration`,
+				`TaskDuration`, `JSHeapUsedSize` and `Nodes`. Durations are cumulative seconds.
+		"""
+		with self._backgroundCommands():
+			if not self._metrics_enabled:
+				self.driver.execute_cdp_cmd("Performance.enable", {})
+				self._metrics_enabled = True
+			response = self.driver.execute_cdp_cmd("Performance.getMetrics", {})
+		return {metric["name"]: metric["value"] for metric in response["metrics"]}
+
+	@contextmanager
+	def captureMetrics(self) -> Iterator[MetricsCapture]:
+		"""Captures the change of the browser's performance metrics across the `with` block, attributing the
+		client-side work to the interaction inside it, e.g. `Table.getAllData` or `Dropdown.setValues`.
+
+		Yields:
+			MetricsCapture: Filled in with `after`, `delta` and `seconds` when the block exits. When the block raises,
+				only `seconds` is filled in, so that the block's exception is not replaced by a failed metrics read.
+		"""
+		capture = MetricsCapture(self.metrics())
+		start = time.perf_counter()
+		try:
+			yield capture
+		finally:
+			capture.seconds = time.perf_counter() - start
+		capture.after = self.metrics()
+		capture.delta = {name: value - capture.before[name]
+						 for name, value in capture.after.items() if name in capture.before}
+
+	def getJsHeapUsage(self) -> tuple:
+		"""Returns the bytes used and allocated for the JavaScript heap of the current page, None for each if the
+		browser does not report them."""
+		with self._backgroundCommands():
+			return tuple(self.driver.execute_script(
+				"var memory = performance.memory || {}; return [memory.usedJSHeapSize || null, memory.totalJSHeapSize || null];"))
+
+	def getRecycleReason(self, used_js_heap=None) -> str:
+		"""Returns the first limit of the recycle policy the browser has exceeded, None if there is none."""
+		policy = self.recycle_policy
+		if not policy or self._driver is None:
+			return None
+		if policy.max_commands and self.command_count >= policy.max_commands:
+			return "commands"
+		if policy.max_seconds and time.perf_counter() - self._driver_started_at >= policy.max_seconds:
+			return "seconds"
+		if policy.max_js_heap_bytes and (used_js_heap or self.getJsHeapUsage()[0] or 0) >= policy.max_js_heap_bytes:
+			return "js_heap"
+		return None
+
+	def maybeRecycle(self, restore_url=True) -> bool:
+		"""Recycles the browser if it exceeded a limit of the Session's `recycle_policy` kwarg. Every navigation
+		checks the policy; loops that stay on one page should call this between iterations, as the policy is not
+		checked between commands. Elements found before a recycle cannot be used afterwards.
+
+		Returns:
+			bool: Whether the browser was recycled.
+		"""
+		if self._recycling:
+			return False
+		reason = self.getRecycleReason()
+		if reason:
+			self.recycle(reason, restore_url)
+		return reason is not None
+
+	def recycle(self, reason="manual", restore_url=True) -> RecycleEvent:
+		"""Quits the browser and starts a new one, logging in again when the session has credentials and returning
+		to the page that was open. A browser that crashed or stopped responding is replaced as well, returning to
+		the last page the session navigated to.
+
+		Args:
+			reason (str): Why the browser is recycled, recorded in `recycle_events`.
+			restore_url (bool): Whether to navigate back to the page that was open.
+
+		Returns:
+			RecycleEvent: The recorded recycle, also appended to `recycle_events`.
+		"""
+		self._recycling = True
+		try:
+			try:
+				used_js_heap, total_js_heap = self.getJsHeapUsage()
+			except Exception:
+				used_js_heap, total_js_heap = None, None
+			try:
+				with self._backgroundCommands():
+					url = self.driver.current_url
+			except Exception:
+				url = self.navigation_timings[-1].url if self.navigation_timings else self.original_page_url
+			event = RecycleEvent(time.time(), reason, self.command_count,
+								 time.perf_counter() - self._driver_started_at, used_js_heap, total_js_heap, url)
+			print("Recycling browser (%s) after %s commands and %.0f seconds, JS heap %s of %s bytes" % (
+				reason, event.commands, event.seconds, used_js_heap, total_js_heap))
+
+			try:
+				self._driver.quit()
+			except Exception as e:
+				print("Unable to quit the recycled browser: %s" % e)
+			self._driver = None
+			self.startDriver()
+			if self.credentials:
+				self.login()
+			if restore_url and self.driver.current_url != url:
+				self.navigateToUrl(url)
+			self.recycle_events.append(event)
+			return event
+		finally:
+			self._recycling = False
+
+	def open(self) -> None:
+		"""Logs in when the session has credentials, otherwise opens the original page unless a page is already
+		open. Lazy sessions make their first navigation here, once it is known whether a login is needed."""
 		# TODO: SOmeway of verifying if we need credentials or not
-		
 		if self.credentials:
 			print("Authentication required, logging into the app")
 			self.login()
 		else:
 			print("No authentication required, opening page directly")
+			if not self._has_navigated:
+				self.navigateToUrl(self.original_page_url)
+
+	def __enter__(self):
+		self.open()
 		return self
 
 	def __exit__(self, type, value, traceback):
 		self.close()
 
+	def getRoundTripSummary(self) -> LatencySummary:
+		"""Returns the recent command round trip times in milliseconds, None unless the remote latency mode is used."""
+		if isinstance(self.driver.command_executor, LatencyTrackingConnection):
+			return self.driver.command_executor.getRoundTripSummary()
+		return None
+
+	def preferBulkReads(self) -> bool:
+		"""Returns True when read-heavy wrapper calls should use their single-script paths, i.e. when the remote
+		latency mode measures a median round trip time above its threshold."""
+		connection = self.driver.command_executor
+		return isinstance(connection, LatencyTrackingConnection) and connection.isSlow()
+
 	def getSelectAllKeys(self) -> Keys:
 		return SelectAllKeys[self.platform_version].value
 
 	def navigateToUrl(self, url=None) -> None:
-		"""Method that will navigate to the provided URL.
+		"""Method that will navigate to the provided URL. The timing of every navigation is appended to
+		`navigation_timings`.
+
+		With the Session's `fast_navigation` kwarg the browser uses the "none" page load strategy, the reload
+		banner is only checked for once, without waiting, and the call returns as soon as the new document is
+		interactive, or, for Perspective client pages, as soon as a view is mounted.
 
 		Args:
 			url (str): The URL to navigate to.
+
+		Raises:
+			ElementNotFoundException: If a fast navigation does not become ready within the wait timeout.
 		"""
+		url = url or self.base_url
+		# Leaving the page anyway, so a recycle does not need to restore it
+		self.maybeRecycle(restore_url=False)
+		start = time.perf_counter()
+		if self.fast_navigation:
+			self.navigation_timings.append(self._navigateFast(url, start))
+			self._has_navigated = True
+			return
+
+		# A browser that has not navigated yet cannot show the reload banner
+		if self._has_navigated:
+			try:
+				reloadButton = self.waitForElement("reload-button", By.ID)
+				reloadButton.click()
+			except:
+				pass
+
+		self.driver.get(url)
+		self._has_navigated = True
+		self.navigation_timings.append(NavigationTiming(url, time.perf_counter() - start, None))
+
+	def _navigateFast(self, url, start) -> NavigationTiming:
+		reload_buttons = self.driver.find_elements(By.ID, "reload-button")
+		if reload_buttons:
+			reload_buttons[0].click()
+
+		# When only the fragment changes no new document replaces the marker, so there is nothing to wait for
+		same_document = "#" in url and url.split("#")[0] == self.driver.current_url.split("#")[0]
+		if not same_document:
+			self.driver.execute_script(self.MARK_NAVIGATION_SCRIPT)
+		self.driver.get(url)
+		if same_document:
+			return NavigationTiming(url, time.perf_counter() - start, bool(reload_buttons))
+
+		view_root_selector = self.view_root_selector if "/data/perspective/client/" in url else None
 		try:
-			reloadButton = self.waitForElement("reload-button", By.ID)
-			reloadButton.click()
-		except:
-			pass
-
-		self.driver.get(url or self.base_url)
+			response_start, dom_interactive = WebDriverWait(self.driver, self.wait_timeout_in_seconds).until(
+				lambda driver: driver.execute_script(self.NAVIGATION_READY_SCRIPT, view_root_selector))
+		except TimeoutException:
+			raise ElementNotFoundException("Page did not become ready after navigating to %s" % url)
+		return NavigationTiming(url, time.perf_counter() - start, bool(reload_buttons), response_start, dom_interactive)
 
 	def waitForElement(self, identifier, locator=By.CLASS_NAME, timeout_in_seconds=None) -> WebElement:
 		"""Method that waits for webelement to be present on page as selenium scripts move faster than the content appears on the page.
@@ -198,7 +1617,10 @@ class Session(object):
 							(locator, identifier))
 
 	def close(self):
-		self.driver.quit()
+		if self.log_collector is not None:
+			self.log_collector.stop()
+		if self._driver_thread is not None or self._driver is not None:
+			self.driver.quit()
 
 	def login(self) -> None:
 		"""Login method that will handle quick start prompt and expired trials before entering credentials.        
@@ -291,8 +1713,29 @@ class Session(object):
 			raise SessionConfigurationException(
 				f"Cannot get {logSource.value} logs. Please include '{logSource.value}' the Session's 'log_sources' list kwarg to read the {logSource.value} logs."
 			)
+		elif self.log_collector is not None and logSource.value in self.log_collector.sources:
+			# The collector drains the browser's buffer, so entries not returned before come from its ring buffer
+			self.log_collector.poll()
+			entries = self.log_collector.getEntries(
+				source=logSource.value, since=self._log_read_sequences.get(logSource.value, 0))
+			if entries:
+				self._log_read_sequences[logSource.value] = entries[-1].sequence
+			return [entry.toDict() for entry in entries]
 		else:
-			return self.driver.get_log(logSource.value)
+			with self._backgroundCommands():
+				return self.driver.get_log(logSource.value)
+
+	def startLogCollector(self, **kwargs) -> LogCollector:
+		"""Starts draining the Session's `log_sources` in the background, see `LogCollector` for the options.
+		While the collector runs, `getLogsFrom` reads from its buffer. The collector stops when the session closes.
+
+		Returns:
+			LogCollector: The running collector.
+		"""
+		if self.log_collector is not None:
+			self.log_collector.stop()
+		self.log_collector = LogCollector(self, **kwargs).start()
+		return self.log_collector
 
 	def getBrowserLogs(self):
 		return self.getLogsFrom(LogSource.BROWSER)
@@ -306,6 +1749,82 @@ class Session(object):
 	def getServerLogs(self):
 		return self.getLogsFrom(LogSource.SERVER)
 
+	def getPerformanceEvents(self) -> List[dict]:
+		"""Reads the DevTools events collected in the performance log since the last read, updating the request rule
+		counters on the way.
+
+		Returns:
+			List[dict]: The events, each with the DevTools `method` and its `params`.
+		"""
+		events = [json.loads(entry["message"])["message"] for entry in self.getLogsFrom(LogSource.PERFORMANCE)]
+		if self.request_rules:
+			self._countRequestRuleHits(events)
+		if self.websocket_tap is not None:
+			self.websocket_tap.record(events)
+		return events
+
+	def tapWebsockets(self, **kwargs) -> WebsocketTap:
+		"""Starts recording the websocket frames of the page, see `WebsocketTap` for the options. A running tap is
+		kept unless options are given. Requires the performance log, enabled by passing `websocket_tap=True` or by
+		including "performance" in `log_sources`.
+
+		Returns:
+			WebsocketTap: The session's tap.
+		"""
+		if self.websocket_tap is None or kwargs:
+			self.websocket_tap = WebsocketTap(self, **kwargs)
+		self.getPerformanceEvents()
+		return self.websocket_tap
+
+	def setRequestRules(self, rules: List[RequestRule]) -> None:
+		"""Blocks or observes requests by URL pattern through the DevTools protocol. Rules stay in effect across
+		navigations, a request is blocked when any BLOCK rule matches it. The `hits` and `bytes` of every matching
+		rule are counted from the performance log, which is enabled automatically when the rules are passed to the
+		Session as `request_rules`.
+
+		Args:
+			rules (List[RequestRule]): The rules replacing any previous ones.
+		"""
+		self._applyRequestRules(self.driver, rules)
+
+	def _applyRequestRules(self, driver: WebDriver, rules: List[RequestRule]) -> None:
+		self.request_rules = list(rules)
+		self._rule_requests = {}
+		driver.execute_cdp_cmd("Network.enable", {})
+		driver.execute_cdp_cmd("Network.setBlockedURLs", {
+			"urls": [rule.pattern for rule in self.request_rules if rule.action == RequestRuleAction.BLOCK]})
+
+	def getRequestRuleHits(self) -> dict:
+		"""Returns the number of requests that matched each rule, keyed by pattern."""
+		if LogSource.PERFORMANCE.value in self.log_sources:
+			self.getPerformanceEvents()
+		return {rule.pattern: rule.hits for rule in self.request_rules}
+
+	def _countRequestRuleHits(self, events: List[dict]) -> None:
+		for event in events:
+			params = event.get("params", {})
+			if event["method"] == "Network.requestWillBeSent":
+				rules = [rule for rule in self.request_rules if rule.matches(params["request"]["url"])]
+				for rule in rules:
+					rule.hits += 1
+				if rules:
+					self._rule_requests[params["requestId"]] = rules
+			elif event["method"] == "Network.loadingFinished" and params.get("requestId") in self._rule_requests:
+				for rule in self._rule_requests.pop(params["requestId"]):
+					rule.bytes += int(params.get("encodedDataLength", 0))
+			elif event["method"] == "Network.loadingFailed":
+				self._rule_requests.pop(params.get("requestId"), None)
+
+	def trackPopups(self) -> PopupTracker:
+		"""Starts tracking popups on the current page. While tracking, `Popup` waits for its popup through the tracker.
+
+		Returns:
+			PopupTracker: The session's popup tracker.
+		"""
+		if self.popups is None:
+			self.popups = PopupTracker(self)
+		return self.popups
+
 	def getWindowHandles(self) -> List[str]:
 		return self.driver.window_handles
 
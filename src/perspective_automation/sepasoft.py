@@ -1,12 +1,281 @@
 
+import re
+from typing import Dict, List, Union
+
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
+from perspective_automation.components import Dropdown, _Pager, _VirtualizedList
 from perspective_automation.perspective import (ComponentInteractionException,
                                                 PerspectiveComponent,
                                                 PerspectiveElement,
-                                                ElementNotFoundException)
+                                                ElementNotFoundException,
+                                                ElementNotUpdatedException)
 from perspective_automation.selenium import Session, SelectAllKeys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.select import Select
+
+
+class MESTable(_VirtualizedList):
+	"""Base class for the Sepasoft MES table components, e.g. schedule, work order and analysis tables.
+
+	Headers are read with a single script call. Rows are harvested window by window while scrolling the table body,
+	page by page when the table has a pager, so rows outside the viewport are read as well. Grids exposing ARIA roles
+	are read through them, otherwise the Perspective table classes are used.
+
+	The harvested rows are cached and reused by the row accessors until `refresh` is True, call
+	`getRawData(refresh=True)` after the table changed.
+	"""
+
+	aria_header_selector = '[role="columnheader"]'
+	aria_row_selector = '[role="row"]'
+	aria_cell_selector = '[role="gridcell"], [role="cell"]'
+	fallback_header_selector = '.ia_table__head__header__cell'
+	fallback_row_selector = '.ia_table__body__rowGroup'
+	fallback_cell_selector = '.ia_table__cell'
+	pager_class_name = "ia_pager"
+
+	# Returns the column ids and header texts, and whether the ARIA selectors are used; null before anything renders.
+	HEADERS_SCRIPT = """
+		var root = arguments[0], selectors = arguments[1];
+		function read(headerSelector, rowSelector, cellSelector, aria) {
+			var headers = root.querySelectorAll(headerSelector);
+			var rows = Array.prototype.filter.call(root.querySelectorAll(rowSelector), function (row) {
+				return row.querySelector(cellSelector) !== null;
+			});
+			if (headers.length === 0 && rows.length === 0) { return null; }
+			return {
+				aria: aria,
+				columns: Array.prototype.map.call(headers, function (header, index) {
+					return header.getAttribute('data-column-id') || header.innerText.trim() || String(index);
+				}),
+				headers: Array.prototype.map.call(headers, function (header) { return header.innerText.trim(); })
+			};
+		}
+		return read(selectors[0], selectors[1], selectors[2], true) || read(selectors[3], selectors[4], selectors[5], false);
+	"""
+
+	# Returns the cell texts of the first rendered row, tagging the row so its replacement can be told apart.
+	FIRST_ROW_SCRIPT = """
+		var rows = arguments[0].querySelectorAll(arguments[1]);
+		for (var i = 0; i < rows.length; i++) {
+			var cells = rows[i].querySelectorAll(arguments[2]);
+			if (cells.length > 0) {
+				var tagged = rows[i].hasAttribute(arguments[3]);
+				rows[i].setAttribute(arguments[3], '');
+				return {tagged: tagged, cells: Array.prototype.map.call(cells, function (cell) { return cell.innerText.trim(); })};
+			}
+		}
+		return null;
+	"""
+
+	# Marks the first row of the current page, so a page change is detected without holding element handles.
+	page_row_attribute = "data-automation-page-row"
+
+	_raw_data = None
+
+	def getRawData(self, timeout_in_seconds=None, refresh: bool = False) -> dict:
+		"""Returns the column ids, header texts and the cell texts of every row of the table. When not cached, the
+		rows are read by scrolling and paging through the table, which is left on the page it was on.
+
+		Args:
+			timeout_in_seconds (int): Timeout for the table to render and for each window or page to update,
+				defaults to the session timeout.
+			refresh (bool): Whether to read the table again instead of using the cached rows.
+
+		Returns:
+			dict: `columns` and `headers` as lists of strings, and `rows` as a list of lists of cell texts.
+
+		Raises:
+			ElementNotFoundException: If neither headers nor rows render within the timeout.
+			ElementNotUpdatedException: If scrolling or paging stops rendering new rows.
+		"""
+		if refresh or self._raw_data is None:
+			data = self._readHeaders(timeout_in_seconds)
+			self._raw_data = {"columns": data["columns"], "headers": data["headers"],
+							  "rows": self._readAllRows(timeout_in_seconds)}
+		return self._raw_data
+
+	def getHeaderTexts(self, timeout_in_seconds=None) -> List[str]:
+		"""Method that gets the text of the headers as a list of strings, without reading the rows."""
+		return self._readHeaders(timeout_in_seconds)["headers"]
+
+	def getData(self, refresh: bool = False) -> List[dict]:
+		"""Collects every row of the table as a list of dictionaries keyed by column id."""
+		data = self.getRawData(refresh=refresh)
+		return [dict(zip(data["columns"], row)) for row in data["rows"]]
+
+	def getRowCount(self, refresh: bool = False) -> int:
+		"""Method that gets the number of rows in the table, across all pages, as an int."""
+		return len(self.getRawData(refresh=refresh)["rows"])
+
+	def getColumnTexts(self, column: str, refresh: bool = False) -> List[str]:
+		"""Returns the texts of one column, addressed by column id or header text.
+
+		Raises:
+			ElementNotFoundException: If the table has no such column.
+		"""
+		data = self.getRawData(refresh=refresh)
+		index = data["columns"].index(self._columnId(data, column))
+		return [row[index] if index < len(row) else None for row in data["rows"]]
+
+	def findRows(self, **criteria) -> List[dict]:
+		"""Returns the rows whose cells equal every given `column=text` criterion, keyed by column id.
+		Columns are addressed by column id or header text.
+
+		Raises:
+			ElementNotFoundException: If the table has no such column.
+		"""
+		data = self.getRawData()
+		wanted = {self._columnId(data, column): str(value) for column, value in criteria.items()}
+		rows = [dict(zip(data["columns"], row)) for row in data["rows"]]
+		return [row for row in rows if all(row.get(column) == value for column, value in wanted.items())]
+
+	def _readHeaders(self, timeout_in_seconds=None) -> dict:
+		"""Reads the column ids and header texts with a single script call, and picks the row and cell selectors
+		matching the rendered grid.
+
+		Raises:
+			ElementNotFoundException: If neither headers nor rows render within the timeout.
+		"""
+		selectors = [self.aria_header_selector, self.aria_row_selector, self.aria_cell_selector,
+					 self.fallback_header_selector, self.fallback_row_selector, self.fallback_cell_selector]
+		raiseable_exception = ElementNotFoundException("Table %s did not render" % self.id)
+		data = self.waitForMethod(lambda driver: driver.execute_script(self.HEADERS_SCRIPT, self, selectors),
+								  timeout_in_seconds, raiseable_exception)
+		if data["aria"]:
+			self.item_selector, self.cell_selector = self.aria_row_selector, self.aria_cell_selector
+		else:
+			self.item_selector, self.cell_selector = self.fallback_row_selector, self.fallback_cell_selector
+		return data
+
+	def _columnId(self, data: dict, column: str) -> str:
+		"""Resolves a column id or header text to the column id."""
+		if column in data["columns"]:
+			return column
+		if column in data["headers"]:
+			return data["columns"][data["headers"].index(column)]
+		raise ElementNotFoundException("No column exists with the name \"%s\"." % column)
+
+	def _readAllRows(self, timeout_in_seconds=None) -> List[List[str]]:
+		"""Harvests the rows of every page, starting from the first page and returning to the starting page."""
+		pagers = self.find_elements_by_class_name(self.pager_class_name)
+		pager = _Pager(self.session, element=pagers[0]) if pagers else None
+		start_page = pager.getCurrentPage() if pager else 1
+		if start_page != 1:
+			self._turnPage(lambda: pager.jumpToPage(1), timeout_in_seconds)
+
+		rows = []
+		while True:
+			rows.extend(item["cells"] for item in self._harvest(timeout_in_seconds=timeout_in_seconds))
+			if pager is None:
+				break
+			try:
+				self._turnPage(pager.nextPage, timeout_in_seconds)
+			except ComponentInteractionException:
+				# Already on the last page
+				break
+
+		if pager is not None and pager.getCurrentPage() != start_page:
+			self._turnPage(lambda: pager.jumpToPage(start_page), timeout_in_seconds)
+		return rows
+
+	def _turnPage(self, turn, timeout_in_seconds=None) -> None:
+		"""Turns the page and waits until the first row is replaced or shows other cells.
+
+		Raises:
+			ComponentInteractionException: If the page cannot be turned.
+			ElementNotUpdatedException: If the rows do not change within the timeout.
+		"""
+		before = self.session.driver.execute_script(
+			self.FIRST_ROW_SCRIPT, self, self.item_selector, self.cell_selector, self.page_row_attribute)
+		turn()
+		if before is None:
+			return
+
+		def pageChanged(driver):
+			first = driver.execute_script(
+				self.FIRST_ROW_SCRIPT, self, self.item_selector, self.cell_selector, self.page_row_attribute)
+			return first is not None and (not first["tagged"] or first["cells"] != before["cells"])
+
+		raiseable_exception = ElementNotUpdatedException("The rows of table %s did not change page" % self.id)
+		self.waitForMethod(pageChanged, timeout_in_seconds, raiseable_exception)
+
+
+class MESScheduleTable(MESTable):
+	"""Class that represents the MES Schedule and Work Order table components.
+
+	The columns holding the work order and its state are addressed by `work_order_column` and `state_column`, as
+	column id or header text.
+	"""
+
+	work_order_column = "Work Order"
+	state_column = "State"
+
+	def getWorkOrders(self) -> List[str]:
+		"""Returns the work order of every schedule entry, in table order."""
+		return self.getColumnTexts(self.work_order_column)
+
+	def getScheduleEntry(self, work_order: str) -> dict:
+		"""Returns the row of a work order, keyed by column id.
+
+		Raises:
+			ElementNotFoundException: If no entry exists for the work order.
+		"""
+		rows = self.findRows(**{self.work_order_column: work_order})
+		if not rows:
+			raise ElementNotFoundException("No schedule entry exists for work order \"%s\"." % work_order)
+		return rows[0]
+
+	def getEntriesInState(self, state: str) -> List[dict]:
+		"""Returns the rows of every schedule entry in the given state, keyed by column id."""
+		return self.findRows(**{self.state_column: state})
+
+
+class MESAnalysisTable(MESTable):
+	"""Class that represents the MES Analysis table component, which also presents OEE results."""
+
+	def getDataPoint(self, column: str) -> List[Union[float, None]]:
+		"""Returns the numeric values of an analysis data point, e.g. `OEE`, for every row of the analysis.
+		Units, percent signs and thousands separators are dropped; cells without a number are returned as None.
+
+		Raises:
+			ElementNotFoundException: If the analysis has no such data point.
+		"""
+		return [self._toNumber(text) for text in self.getColumnTexts(column)]
+
+	def getDataPointBy(self, column: str, group_by: str) -> Dict[str, Union[float, None]]:
+		"""Returns the numeric values of a data point keyed by the text of a grouping column, e.g. OEE by line.
+
+		Raises:
+			ElementNotFoundException: If the analysis has no such data point or grouping column.
+		"""
+		data = self.getRawData()
+		value_index = data["columns"].index(self._columnId(data, column))
+		key_index = data["columns"].index(self._columnId(data, group_by))
+		return {row[key_index]: self._toNumber(row[value_index]) for row in data["rows"]
+				if max(key_index, value_index) < len(row)}
+
+	def _toNumber(self, text: str) -> Union[float, None]:
+		"""Parses the number in a cell text, or returns None if there is none."""
+		match = re.search(r"-?\d+(?:\.\d+)?", (text or "").replace(",", ""))
+		return float(match.group()) if match else None
+
+
+class MESObjectSelector(Dropdown):
+	"""Class that represents the MES Object Selector component, a dropdown of MES objects."""
+
+	def getOptionTexts(self) -> List[str]:
+		"""Opens the selector, reads every option label with a single script call once the options appear and
+		closes it again.
+
+		Returns:
+			List[str]: A list of all the MES objects offered by the selector, empty when it offers none.
+		"""
+		return self._readOptionTexts()
+
+	def getSelectedObject(self) -> str:
+		"""Returns the name of the selected MES object, or an empty string when nothing is selected."""
+		value = self.getValue()
+		return value.text if value else ''
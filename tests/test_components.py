@@ -0,0 +1,232 @@
+import json
+import shutil
+import subprocess
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.support.wait import WebDriverWait
+
+from perspective_automation.components import (TOGGLE_STATE_SCRIPT, CheckBox, DashboardArea, DashboardGrid, Dropdown,
+                                               Form, FormFieldType, Table, TimeSeriesChart)
+from perspective_automation.perspective import ElementNotFoundException
+
+requires_node = pytest.mark.skipif(shutil.which("node") is None, reason="node is required to run the page scripts")
+
+# Props tree of an XY Chart as recorded from a Perspective session, trimmed to the fields the script reads.
+XY_CHART_PROPS = {
+    "dataSources": {
+        "example": [
+            {"time": "2024-01-01T00:00:00Z", "temperature": 20.5, "humidity": 41},
+            {"time": "2024-01-01T00:01:00Z", "temperature": 21.0, "humidity": 43},
+        ],
+        "batches": [
+            {"batch": "A", "yield": 0.91},
+            {"batch": "B", "yield": 0.87},
+        ],
+    },
+    "series": [
+        {"name": "temperature", "visible": True, "data": {"source": "example", "x": "time", "y": "temperature"}},
+        {"name": "humidity", "visible": True, "data": {"source": "example", "x": "time", "y": "humidity"}},
+        {"name": "yield", "visible": True, "data": {"source": "batches", "x": "batch", "y": "yield"}},
+    ],
+}
+
+
+def runWithProps(script, props):
+    """Runs a page script under node against an element whose React fiber carries the given props tree."""
+    source = """
+        var props = %s;
+        var tree = {read: function (path) { return props[path]; }};
+        var element = {__reactFiber$test: {memoizedProps: {}, return: {memoizedProps: {props: tree}}}};
+        console.log(JSON.stringify(new Function(%s)(element)));
+    """ % (json.dumps(props), json.dumps(script))
+    return json.loads(subprocess.run(["node", "-e", source], capture_output=True, text=True, check=True).stdout)
+
+
+@requires_node
+class TestTimeSeriesChartSeries:
+
+    def test_xy_series_read_their_bound_data_source(self):
+        pens = runWithProps(TimeSeriesChart.SERIES_SCRIPT, XY_CHART_PROPS)
+        assert pens["temperature"] == [[1704067200000, 20.5], [1704067260000, 21.0]]
+        assert pens["humidity"] == [[1704067200000, 41], [1704067260000, 43]]
+
+    def test_xy_category_values_are_kept(self):
+        pens = runWithProps(TimeSeriesChart.SERIES_SCRIPT, XY_CHART_PROPS)
+        assert pens["yield"] == [["A", 0.91], ["B", 0.87]]
+
+    def test_time_series_pens_are_named_by_column(self):
+        props = {"series": [{"name": "line", "data": [{"t_stamp": 1000, "flow": 3}, {"t_stamp": 2000, "flow": 4}]}]}
+        assert runWithProps(TimeSeriesChart.SERIES_SCRIPT, props) == {"line/flow": [[1000, 3], [2000, 4]]}
+
+
+class ScriptDriver:
+    """Answers execute_script() calls from a mapping of script to result, counting the calls per script."""
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = {}
+
+    def execute_script(self, script, *args):
+        self.calls[script] = self.calls.get(script, 0) + 1
+        result = self.results[script]
+        return result() if callable(result) else result
+
+
+class FakeDropdown(Dropdown):
+    """A Dropdown bound to a fake session, whose clicks only toggle the options modal."""
+
+    def __init__(self, options):
+        self.opened = False
+        self.clicks = 0
+        driver = ScriptDriver({
+            Dropdown.OPTION_TEXTS_SCRIPT: lambda: options if self.opened else None,
+            Dropdown.OPTIONS_OPEN_SCRIPT: lambda: self.opened,
+        })
+        self.session = SimpleNamespace(driver=driver, wait=WebDriverWait(driver, 1, poll_frequency=0.01),
+                                       preferBulkReads=lambda: True)
+
+    def click(self):
+        self.clicks += 1
+        self.opened = not self.opened
+
+
+class CheckBoxTarget:
+    """The clickable part of a FakeCheckBox, stale once the checkbox re-rendered."""
+
+    def __init__(self, checkbox):
+        self.checkbox = checkbox
+        self.render = checkbox.render
+
+    def click(self):
+        if self.render != self.checkbox.render:
+            raise StaleElementReferenceException("stale element reference")
+        self.checkbox.clicks += 1
+        self.checkbox.state = "unchecked" if self.checkbox.state == "checked" else "checked"
+
+
+class FakeCheckBox(CheckBox):
+    """A CheckBox bound to a fake session. Clicks cycle indeterminate -> checked -> unchecked -> checked."""
+
+    def __init__(self, state):
+        self.state = state
+        self.render = 0
+        self.clicks = 0
+        driver = ScriptDriver({TOGGLE_STATE_SCRIPT: lambda: [{
+            "checked": self.state == "checked", "indeterminate": self.state == "indeterminate", "disabled": False,
+            "target": CheckBoxTarget(self)}]})
+        self.session = SimpleNamespace(driver=driver)
+
+
+class TestCheckBox:
+
+    def test_toggle_reads_the_target_again_after_a_re_render(self):
+        checkbox = FakeCheckBox("unchecked")
+        checkbox.getState()
+        checkbox.render += 1
+        assert checkbox.toggle() is True
+        assert checkbox.clicks == 1
+
+    def test_set_value_from_indeterminate_clicks_until_reached(self):
+        checkbox = FakeCheckBox("indeterminate")
+        checkbox.setValue(False)
+        assert checkbox.state == "unchecked"
+        assert checkbox.clicks == 2
+
+
+class TestDropdownOptionTexts:
+
+    def test_reads_the_options_and_closes_the_dropdown(self):
+        dropdown = FakeDropdown(["Line 1", "Line 2"])
+        assert dropdown.getOptionTexts() == ["Line 1", "Line 2"]
+        assert not dropdown.opened
+
+    def test_empty_options_return_without_waiting(self):
+        dropdown = FakeDropdown([])
+        assert dropdown.getOptionTexts() == []
+        assert dropdown.session.driver.calls[Dropdown.OPTION_TEXTS_SCRIPT] == 1
+        assert not dropdown.opened
+
+    def test_closes_the_dropdown_when_the_options_do_not_render(self):
+        dropdown = FakeDropdown(None)
+        with pytest.raises(ElementNotFoundException):
+            dropdown.getOptionTexts()
+        assert not dropdown.opened
+
+
+class FakeTable(Table):
+    """A Table bound to a fake session that has rendered its headers but no rows."""
+
+    def __init__(self, headers, bulk):
+        self.headers = headers
+        driver = ScriptDriver({Table.ROWS_SCRIPT: {"columns": headers, "headers": headers, "rows": []}})
+        self.session = SimpleNamespace(driver=driver, wait=WebDriverWait(driver, 0.1, poll_frequency=0.01),
+                                       preferBulkReads=lambda: bulk)
+
+    def find_elements(self, by, value):
+        if value == self.header_cell_class_name:
+            return [SimpleNamespace(text=header) for header in self.headers]
+        return []
+
+
+class TestTableHeaderTexts:
+
+    def test_bulk_reads_of_a_table_without_rows_return_the_headers(self):
+        assert FakeTable(["Line", "State"], bulk=True).getHeaderTexts() == ["Line", "State"]
+        assert FakeTable(["Line", "State"], bulk=False).getHeaderTexts() == ["Line", "State"]
+
+
+class TestDashboardGrid:
+
+    def grid(self):
+        cells = [DashboardArea(1, 1, 2, 2, "cell-1-1"), DashboardArea(3, 3, 4, 4, "cell-3-3")]
+        return DashboardGrid(3, 3, cells, [DashboardArea(1, 2, 3, 4, "chart")])
+
+    def test_widgets_occupy_their_whole_area(self):
+        grid = self.grid()
+        assert [grid.getWidgetAt(row, col) for row, col in [(1, 2), (2, 3), (1, 1), (3, 2)]] == \
+            ["chart", "chart", None, None]
+        assert grid.getCell(3, 3) == "cell-3-3"
+
+    def test_areas_must_fit_inside_the_grid(self):
+        grid = self.grid()
+        assert grid.isFree(2, 1, row_span=2)
+        assert not grid.isFree(1, 1, col_span=2)
+        assert not grid.isFree(3, 3, row_span=2)
+
+    def test_first_free_area_in_row_major_order(self):
+        grid = self.grid()
+        assert grid.findFreeArea() == (1, 1)
+        assert grid.findFreeArea(col_span=2) == (3, 1)
+        assert grid.findFreeArea(row_span=3, col_span=2) is None
+
+    def test_occupied_cells_need_a_widget_element(self):
+        with pytest.raises(ValueError):
+            self.grid().occupy(DashboardArea(3, 1, 4, 2))
+
+
+class TestFormValueMatches:
+
+    def matches(self, kind, current, value):
+        return object.__new__(Form)._valueMatches(kind, current, value)
+
+    def test_unread_values_never_match(self):
+        assert not self.matches(FormFieldType.TEXT, None, "")
+
+    def test_checkboxes_compare_truthiness(self):
+        assert self.matches(FormFieldType.CHECKBOX, True, 1)
+        assert not self.matches(FormFieldType.TOGGLE, False, True)
+
+    def test_multi_select_dropdowns_ignore_order(self):
+        assert self.matches(FormFieldType.DROPDOWN, ["b", "a"], ["a", "b"])
+        assert not self.matches(FormFieldType.DROPDOWN, "a", ["a"])
+        assert self.matches(FormFieldType.DROPDOWN, "3", 3)
+
+    def test_numeric_values_ignore_grouping(self):
+        assert self.matches(FormFieldType.NUMERIC, "1,250.5", 1250.5)
+        assert not self.matches(FormFieldType.NUMERIC, "n/a", 1)
+
+    def test_datetimes_are_always_applied(self):
+        assert not self.matches(FormFieldType.DATETIME, "2024-01-01", datetime(2024, 1, 1))
@@ -0,0 +1,60 @@
+import pytest
+
+from perspective_automation.measurement import LatencySummary, histogram, percentile, summarize
+
+
+class TestPercentile:
+
+    def test_empty_samples(self):
+        assert percentile([], 0.5) is None
+
+    def test_single_sample(self):
+        assert percentile([7.0], 0.0) == 7.0
+        assert percentile([7.0], 0.5) == 7.0
+        assert percentile([7.0], 1.0) == 7.0
+
+    def test_p0_and_p100_are_the_extremes(self):
+        samples = [5, 1, 4, 2, 3]
+        assert percentile(samples, 0.0) == 1
+        assert percentile(samples, 1.0) == 5
+
+    def test_nearest_rank_does_not_interpolate(self):
+        assert percentile([1, 2], 0.5) == 1
+        assert percentile([1, 2, 3, 4], 0.5) == 2
+        assert percentile([1, 2, 3, 4], 0.51) == 3
+
+    def test_rank_rounds_up(self):
+        samples = list(range(1, 101))
+        assert percentile(samples, 0.9) == 90
+        assert percentile(samples, 0.901) == 91
+        assert percentile(samples, 0.99) == 99
+
+
+class TestSummarize:
+
+    def test_empty_samples(self):
+        assert summarize([]) == LatencySummary(0, None, None, None, None, None, None)
+
+    def test_single_sample(self):
+        assert summarize([0.25]) == LatencySummary(1, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25)
+
+    def test_distribution(self):
+        summary = summarize([3, 1, 2, 4])
+        assert (summary.count, summary.minimum, summary.maximum) == (4, 1, 4)
+        assert summary.mean == pytest.approx(2.5)
+        assert (summary.p50, summary.p90, summary.p99) == (2, 4, 4)
+
+
+class TestHistogram:
+
+    def test_empty_samples(self):
+        assert histogram([], 10) == {}
+
+    def test_single_sample(self):
+        assert histogram([12.5], 10) == {10: 1}
+
+    def test_bucket_bounds_are_inclusive_below(self):
+        assert histogram([0, 9.99, 10, 20], 10) == {0: 2, 10: 1, 20: 1}
+
+    def test_buckets_are_sorted_and_skip_empty_ones(self):
+        assert list(histogram([35, 5, 31], 10).items()) == [(0, 1), (30, 2)]
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from selenium.webdriver.remote.command import Command
+
+from perspective_automation.perspective import ActionBatch
+
+
+class RecordingDriver:
+    """Stands in for a W3C WebDriver, recording the commands it is asked to execute."""
+
+    w3c = True
+
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, driver_command, params=None):
+        self.commands.append((driver_command, params))
+        return {"value": None}
+
+
+def keyStrokes(params):
+    """Returns the keys typed by a W3C actions request."""
+    keys = []
+    for source in params["actions"]:
+        if source["type"] == "key":
+            keys.extend(action["value"] for action in source["actions"] if action["type"] == "keyDown")
+    return keys
+
+
+class TestActionBatch:
+
+    def test_second_perform_sends_only_new_steps(self):
+        driver = RecordingDriver()
+        batch = ActionBatch(SimpleNamespace(driver=driver, wait_timeout_in_seconds=1))
+
+        batch.sendKeys("ab").perform()
+        batch.sendKeys("c").perform()
+
+        actions = [params for command, params in driver.commands if command == Command.W3C_ACTIONS]
+        assert [keyStrokes(params) for params in actions] == [["a", "b"], ["c"]]
+
+    def test_perform_clears_the_step_count(self):
+        batch = ActionBatch(SimpleNamespace(driver=RecordingDriver(), wait_timeout_in_seconds=1))
+        batch.sendKeys("a").sendKeys("b")
+        assert len(batch) == 2
+        batch.perform()
+        assert len(batch) == 0
@@ -0,0 +1,512 @@
+import json
+import shutil
+import subprocess
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from perspective_automation import selenium as automation
+from perspective_automation.selenium import (BrowserPool, LogCollector, RecyclePolicy, RequestRule, RequestRuleAction,
+                                             Session, WebsocketTap)
+
+requires_node = pytest.mark.skipif(shutil.which("node") is None, reason="node is required to run the page scripts")
+
+
+class FakeDriver:
+    """Stands in for a started browser, recording the DevTools commands and pages sent to it. A crashed browser
+    fails every command."""
+
+    def __init__(self, fail_cdp=False):
+        self.cdp_commands = []
+        self.fail_cdp = fail_cdp
+        self.quit_called = False
+        self.crashed = False
+        self.url = "about:blank"
+
+    def execute(self, driver_command, params=None):
+        if self.crashed:
+            raise automation.WebDriverException("chrome not reachable")
+        return {"value": None}
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        if self.fail_cdp:
+            raise RuntimeError("DevTools unavailable")
+        self.cdp_commands.append((cmd, cmd_args))
+        return {}
+
+    def execute_script(self, script, *args):
+        return self.execute(Command.EXECUTE_SCRIPT)["value"]
+
+    @property
+    def current_url(self):
+        self.execute(Command.GET_CURRENT_URL)
+        return self.url
+
+    def get(self, url):
+        self.execute(Command.GET, {"url": url})
+        self.url = url
+
+    def quit(self):
+        self.quit_called = True
+        self.execute(Command.QUIT)
+
+
+@pytest.fixture
+def fakeBrowser(monkeypatch):
+    """Registers a "fake" browser and returns the drivers it started."""
+    started = []
+
+    def startFake(**kwargs):
+        started.append(FakeDriver(fail_cdp=kwargs.get('fail_cdp', False)))
+        return started[-1]
+
+    monkeypatch.setitem(automation.BROWSERS, "fake", startFake)
+    return started
+
+
+class TestBackgroundStart:
+
+    def test_request_rules_are_applied_to_a_background_start(self, fakeBrowser):
+        rules = [RequestRule("*/fonts/*"), RequestRule("*/icons/*", RequestRuleAction.OBSERVE)]
+        session = Session("http://gateway", "/data/perspective/client/app", 5, browser="fake",
+                          start_in_background=True, request_rules=rules)
+
+        assert session.driver is fakeBrowser[0]
+        assert session.driver.cdp_commands == [
+            ("Network.enable", {}), ("Network.setBlockedURLs", {"urls": ["*/fonts/*"]})]
+        assert session.request_rules == rules
+
+    def test_failed_rules_quit_the_background_browser(self, fakeBrowser):
+        session = Session("http://gateway", "/data/perspective/client/app", 5, browser="fake", fail_cdp=True,
+                          start_in_background=True, request_rules=[RequestRule("*/fonts/*")])
+
+        with pytest.raises(RuntimeError):
+            session.driver
+        assert fakeBrowser[0].quit_called
+
+
+class TestRecycle:
+
+    def test_a_crashed_browser_is_replaced_on_the_last_page(self, fakeBrowser):
+        session = Session("http://gateway", "/data/perspective/client/app", 5, browser="fake", lazy=True)
+        session.navigateToUrl("http://gateway/data/perspective/client/app/line-1")
+        session.driver.crashed = True
+
+        event = session.recycle("commands")
+        assert fakeBrowser[0].quit_called and len(fakeBrowser) == 2
+        assert event.url == "http://gateway/data/perspective/client/app/line-1"
+        assert session.driver.url == event.url
+
+    def test_commands_are_counted_without_a_command_limit(self, fakeBrowser):
+        session = Session("http://gateway", "/data/perspective/client/app", 5, browser="fake", lazy=True,
+                          recycle_policy=RecyclePolicy(max_seconds=3600))
+        session.navigateToUrl("http://gateway/page")
+        session.driver.current_url
+        assert session.recycle("seconds").commands == 2
+
+
+class FakeBrowser:
+    """Stands in for a pooled browser: tracks its windows and answers the commands of pooled drivers."""
+
+    session_id = "fake-session"
+    capabilities = {"browserName": "chrome"}
+    w3c = True
+    _is_remote = False
+
+    def __init__(self, **kwargs):
+        self.windows = ["window-1"]
+        self.current = "window-1"
+        self.opened = 1
+        self.commands = []
+        self.command_executor = self
+
+    @property
+    def window_handles(self):
+        return list(self.windows)
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    def execute(self, driver_command, params=None):
+        self.commands.append((driver_command, self.current, params))
+        if driver_command == Command.SWITCH_TO_WINDOW:
+            assert params["handle"] in self.windows
+            self.current = params["handle"]
+        elif driver_command == Command.CLOSE:
+            self.windows.remove(self.current)
+            self.current = None
+        elif driver_command == Command.GET:
+            assert self.current in self.windows
+        return {"value": None}
+
+    def execute_script(self, script, *args):
+        assert self.current in self.windows
+        self.opened += 1
+        self.windows.append("window-%s" % self.opened)
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setitem(automation.BROWSERS, "fake", FakeBrowser)
+    pool = BrowserPool(max_browsers=1, windows_per_browser=2, browser="fake")
+    yield pool
+    pool.close()
+
+
+class TestBrowserPool:
+
+    def test_pooled_drivers_share_the_browser_session(self, pool):
+        first, second = pool.acquire(), pool.acquire()
+        assert isinstance(first, WebDriver)
+        assert first.session_id == second.session_id == FakeBrowser.session_id
+        assert first.window_handle != second.window_handle
+
+        second.get("http://gateway/second")
+        first.get("http://gateway/first")
+        browser = pool.browsers[0].driver
+        gets = [(window, params["url"]) for command, window, params in browser.commands if command == Command.GET]
+        assert gets == [(second.window_handle, "http://gateway/second"), (first.window_handle, "http://gateway/first")]
+
+    def test_release_blanks_an_open_window(self, pool):
+        driver = pool.acquire()
+        handle = driver.window_handle
+        driver.quit()
+        assert pool.browsers[0].free_handles == [handle]
+        command, window, params = pool.browsers[0].driver.commands[-1]
+        assert (command, window, params["url"]) == (Command.GET, handle, "about:blank")
+
+    def test_release_replaces_a_window_the_session_closed(self, pool):
+        driver = pool.acquire()
+        other = pool.acquire()
+        closed = driver.window_handle
+        driver.close()
+        driver.quit()
+
+        browser = pool.browsers[0]
+        assert closed not in browser.driver.window_handles
+        assert browser.free_handles and browser.free_handles[0] in browser.driver.window_handles
+        assert browser.used_handles == {other.window_handle}
+
+    def test_release_returns_the_acquired_window_after_following_a_popup(self, monkeypatch):
+        monkeypatch.setitem(automation.BROWSERS, "fake", FakeBrowser)
+        pool = BrowserPool(max_browsers=1, windows_per_browser=1, browser="fake")
+        driver = pool.acquire()
+        acquired = driver.window_handle
+        pool.browsers[0].driver.execute_script("window.open()")
+        popup = [handle for handle in pool.browsers[0].driver.window_handles if handle != acquired][0]
+        driver.switch_to.window(popup)
+        driver.quit()
+
+        browser = pool.browsers[0]
+        assert browser.driver.window_handles == [acquired]
+        assert browser.used_handles == set() and browser.free_handles == [acquired]
+        assert pool.acquire().window_handle == acquired
+        pool.close()
+
+
+class LogDriver:
+    """Returns the queued log entries per source once, like the WebDriver log endpoint."""
+
+    def __init__(self, logs=None, error=None):
+        self.logs = logs or {}
+        self.error = error
+
+    def get_log(self, source):
+        if self.error is not None:
+            raise self.error
+        entries, self.logs[source] = self.logs.get(source, []), []
+        return entries
+
+
+def logSession(driver, sources):
+    return SimpleNamespace(_driver=driver, driver=driver, log_sources=sources, _backgroundCommands=nullcontext)
+
+
+class TestLogCollector:
+
+    def collected(self):
+        driver = LogDriver({
+            "browser": [{"level": "INFO", "message": "loaded", "timestamp": 1000},
+                        {"level": "SEVERE", "message": "failed", "timestamp": 2000}],
+            "driver": [{"level": "WARNING", "message": "slow", "timestamp": 3000}],
+        })
+        collector = LogCollector(logSession(driver, ["browser", "driver"]))
+        collector.poll()
+        return collector
+
+    def test_entries_at_or_above_a_level(self):
+        assert [entry.message for entry in self.collected().getEntries(level="WARNING")] == ["failed", "slow"]
+
+    def test_entries_of_a_source(self):
+        assert [entry.message for entry in self.collected().getEntries(source="driver")] == ["slow"]
+
+    def test_errors_since_a_mark(self):
+        collector = self.collected()
+        mark = collector.mark()
+        collector.session.driver.logs["browser"] = [{"level": "SEVERE", "message": "later", "timestamp": 4000}]
+        collector.poll()
+        assert [entry.message for entry in collector.getErrorsSince()] == ["failed", "later"]
+        assert [entry.message for entry in collector.getErrorsSince(mark)] == ["later"]
+
+    def test_unexpected_errors_stop_the_thread_and_are_kept(self):
+        collector = LogCollector(logSession(LogDriver(error=ValueError("bad entry")), ["browser"]),
+                                 interval_in_seconds=0.01).start()
+        deadline = time.monotonic() + 5
+        while collector.error is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert isinstance(collector.error, ValueError)
+        collector.stop()
+        assert collector._thread is None
+
+
+class MetricsSession(Session):
+    """A Session whose metrics come from a list of readings instead of the browser."""
+
+    def __init__(self, readings):
+        self.readings = list(readings)
+
+    def metrics(self):
+        reading = self.readings.pop(0)
+        if isinstance(reading, Exception):
+            raise reading
+        return reading
+
+
+class TestCaptureMetrics:
+
+    def test_delta_of_the_block(self):
+        session = MetricsSession([{"LayoutCount": 2, "Nodes": 10}, {"LayoutCount": 5, "Nodes": 8}])
+        with session.captureMetrics() as capture:
+            pass
+        assert capture.delta == {"LayoutCount": 3, "Nodes": -2}
+        assert capture.seconds >= 0
+
+    def test_block_errors_are_not_masked_by_the_end_reading(self):
+        session = MetricsSession([{"LayoutCount": 2}, RuntimeError("browser gone")])
+        with pytest.raises(ValueError):
+            with session.captureMetrics() as capture:
+                raise ValueError("interaction failed")
+        assert capture.after is None and capture.seconds is not None
+
+
+def runTapScripts(mutation_times, frame_time, max_mutations):
+    """Runs the tap's mark script under node, fires mutations at the given page times, then reads the mutations
+    after the frame. Returns the mutations read and whether the observer is still connected."""
+    source = """
+        var clock = 0, callback = null, connected = false;
+        var window = {}, document = {body: {}};
+        var performance = {timeOrigin: 0, now: function () { return clock; }};
+        function MutationObserver(fn) { callback = fn; }
+        MutationObserver.prototype.observe = function () { connected = true; };
+        MutationObserver.prototype.disconnect = function () { connected = false; };
+        new Function(%s)(%d);
+        %s.forEach(function (time) { clock = time; if (connected) { callback(); } });
+        var mutations = new Function(%s)(%d);
+        console.log(JSON.stringify({mutations: mutations, connected: connected}));
+    """ % (json.dumps(WebsocketTap.MARK_SCRIPT), max_mutations, json.dumps(mutation_times),
+           json.dumps(WebsocketTap.MUTATIONS_SCRIPT), frame_time)
+    return json.loads(subprocess.run(["node", "-e", source], capture_output=True, text=True, check=True).stdout)
+
+
+@requires_node
+class TestWebsocketTapMutations:
+
+    def test_mutations_before_the_frame_do_not_use_up_the_cap(self):
+        result = runTapScripts([10, 20, 30, 40, 50], frame_time=45, max_mutations=3)
+        assert result == {"mutations": [50], "connected": True}
+
+    def test_observer_stops_after_the_cap_counted_from_the_frame(self):
+        result = runTapScripts([10, 50, 60, 70], frame_time=45, max_mutations=3)
+        assert result == {"mutations": [50, 60, 70], "connected": False}
+
+
+class TapDriver:
+    """Answers the tap's page scripts from a browser whose clock started at `time_origin` milliseconds."""
+
+    def __init__(self, time_origin, mark, mutations):
+        self.results = {WebsocketTap.TIME_ORIGIN_SCRIPT: time_origin, WebsocketTap.MARK_SCRIPT: mark,
+                        WebsocketTap.MUTATIONS_SCRIPT: mutations, WebsocketTap.STOP_SCRIPT: None}
+
+    def execute_script(self, script, *args):
+        return self.results[script]
+
+
+class TapSession:
+    """Answers the tap's metrics read with the browser's navigation start, on the clock of the DevTools events,
+    and hands queued events to the tap like `Session.getPerformanceEvents`."""
+
+    def __init__(self, navigation_start, driver=None):
+        self.navigation_start = navigation_start
+        self.driver = driver or TapDriver(1700000000000, None, [])
+        self.wait_timeout_in_seconds = 1
+        self.websocket_tap = None
+        self.events = []
+        self._backgroundCommands = nullcontext
+
+    def metrics(self):
+        if self.navigation_start is None:
+            raise AttributeError("execute_cdp_cmd")
+        return {"NavigationStart": self.navigation_start}
+
+    def getPerformanceEvents(self):
+        events, self.events = self.events, []
+        if self.websocket_tap is not None:
+            self.websocket_tap.record(events)
+        return events
+
+
+def frameEvent(method, timestamp, payload="ok"):
+    return {"method": method, "params": {"requestId": "1", "timestamp": timestamp,
+                                         "response": {"opcode": 1, "payloadData": payload}}}
+
+
+class TestWebsocketTapRecord:
+
+    def test_frames_are_converted_to_the_page_clock(self):
+        tap = WebsocketTap(TapSession(500.0))
+        tap.record([frameEvent("Network.webSocketFrameReceived", 501.5)])
+        assert len(tap.frames) == 1
+        assert tap.frames[0].timestamp == pytest.approx(1700000001.5)
+        assert (tap.frames[0].direction, tap.frames[0].size) == ("received", 2)
+
+    def test_a_calibrated_offset_is_kept(self):
+        tap = WebsocketTap(TapSession(500.0))
+        tap.record([{"method": "Network.requestWillBeSent", "params": {"timestamp": 6.0, "wallTime": 1006.0}},
+                    frameEvent("Network.webSocketFrameSent", 502.0)])
+        assert tap.frames[0].timestamp == pytest.approx(1700000002.0)
+
+    def test_frames_wait_for_a_wall_time_without_calibration(self):
+        tap = WebsocketTap(TapSession(None))
+        tap.record([frameEvent("Network.webSocketFrameSent", 5.0)])
+        assert not tap.frames
+        tap.record([{"method": "Network.requestWillBeSent", "params": {"timestamp": 6.0, "wallTime": 1006.0}}])
+        assert [(frame.direction, frame.timestamp) for frame in tap.frames] == [("sent", 1005.0)]
+
+
+class TestWebsocketTapMeasure:
+
+    def test_latencies_are_taken_on_the_browser_clock(self):
+        # The mark is read in the page, 2 seconds after the time origin, i.e. at NavigationStart + 2 on the event clock
+        session = TapSession(500.0, TapDriver(1700000000000, 1700000002000, [1700000002300]))
+        tap = session.websocket_tap = WebsocketTap(session)
+        session.events = [frameEvent("Network.webSocketFrameReceived", 501.9)]
+        tap.mark()
+        session.events = [frameEvent("Network.webSocketFrameSent", 502.05),
+                          frameEvent("Network.webSocketFrameReceived", 502.25)]
+        latency = tap.measure()
+
+        assert latency.first_sent == pytest.approx(1700000002.05)
+        assert latency.response_seconds == pytest.approx(0.25)
+        assert latency.render_seconds == pytest.approx(0.05)
+
+
+class TestRequestRule:
+
+    def test_star_matches_any_characters(self):
+        rule = RequestRule("*/res/perspective/fonts/*")
+        assert rule.matches("http://gateway:8088/res/perspective/fonts/roboto.woff2")
+        assert not rule.matches("http://gateway:8088/res/perspective/js/client.js")
+
+    def test_pattern_must_match_the_whole_url(self):
+        assert not RequestRule("*.png").matches("http://gateway/icon.png?v=2")
+
+    def test_question_mark_and_bracket_are_literal(self):
+        rule = RequestRule("*/data?page=[1]")
+        assert rule.matches("http://gateway/data?page=[1]")
+        assert not rule.matches("http://gateway/dataXpage=1")
+
+
+def ruleSession(rules):
+    session = object.__new__(Session)
+    session.request_rules = rules
+    session._rule_requests = {}
+    return session
+
+
+def requestEvent(request_id, url):
+    return {"method": "Network.requestWillBeSent", "params": {"requestId": request_id, "request": {"url": url}}}
+
+
+class TestRequestRuleHits:
+
+    def test_every_matching_rule_counts_the_request(self):
+        observe = RequestRule("*.js", RequestRuleAction.OBSERVE)
+        block = RequestRule("*/analytics/*", RequestRuleAction.BLOCK)
+        ruleSession([observe, block])._countRequestRuleHits([requestEvent("1", "http://gateway/analytics/track.js")])
+        assert (observe.hits, block.hits) == (1, 1)
+
+    def test_bytes_are_added_when_loading_finishes(self):
+        rule = RequestRule("*.js", RequestRuleAction.OBSERVE)
+        session = ruleSession([rule])
+        session._countRequestRuleHits([
+            requestEvent("1", "http://gateway/client.js"),
+            requestEvent("2", "http://gateway/vendor.js"),
+            {"method": "Network.loadingFinished", "params": {"requestId": "1", "encodedDataLength": 1200}},
+            {"method": "Network.loadingFailed", "params": {"requestId": "2"}},
+            {"method": "Network.loadingFinished", "params": {"requestId": "2", "encodedDataLength": 500}},
+        ])
+        assert (rule.hits, rule.bytes) == (2, 1200)
+        assert session._rule_requests == {}
+
+
+def recycleSession(policy, command_count=0, seconds=0):
+    session = object.__new__(Session)
+    session.recycle_policy = policy
+    session._driver = object()
+    session.command_count = command_count
+    session._driver_started_at = time.perf_counter() - seconds
+    return session
+
+
+class TestRecycleReason:
+
+    def test_no_reason_without_a_policy_or_browser(self):
+        assert recycleSession(None, command_count=10 ** 6).getRecycleReason() is None
+        session = recycleSession(RecyclePolicy(max_commands=1), command_count=5)
+        session._driver = None
+        assert session.getRecycleReason() is None
+
+    def test_limits_are_checked_in_order(self):
+        policy = RecyclePolicy(max_commands=100, max_seconds=60, max_js_heap_bytes=1000)
+        assert recycleSession(policy, command_count=100, seconds=120).getRecycleReason(2000) == "commands"
+        assert recycleSession(policy, command_count=10, seconds=120).getRecycleReason(2000) == "seconds"
+        assert recycleSession(policy, command_count=10, seconds=1).getRecycleReason(2000) == "js_heap"
+        assert recycleSession(policy, command_count=10, seconds=1).getRecycleReason(10) is None
+
+
+class TestProfileClones:
+
+    def test_clones_are_removed_when_the_browser_quits(self, tmp_path, monkeypatch):
+        template = tmp_path / "template"
+        (template / "Default").mkdir(parents=True)
+        (template / "Default" / "Preferences").write_text("{}")
+        (template / "SingletonLock").symlink_to("elsewhere-1234")
+
+        clone = Path(automation.cloneProfileTemplate(str(template)))
+        assert sorted(path.name for path in clone.iterdir()) == ["Default"]
+
+        def crashedQuit(driver):
+            raise automation.WebDriverException("chrome not reachable")
+
+        monkeypatch.setattr(WebDriver, "quit", crashedQuit)
+        driver = object.__new__(automation.SharedServiceChrome)
+        driver.profile_clone_dir = str(clone)
+        with pytest.raises(automation.WebDriverException):
+            driver.quit()
+        assert not clone.parent.exists()
+
+    def test_other_directories_are_left_alone(self, tmp_path):
+        (tmp_path / "profile").mkdir()
+        automation.removeProfileClone(str(tmp_path / "profile"))
+        automation.removeProfileClone(None)
+        assert (tmp_path / "profile").exists()
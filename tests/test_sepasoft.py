@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+from selenium.webdriver.support.wait import WebDriverWait
+
+from perspective_automation.sepasoft import MESTable
+
+
+class ScriptDriver:
+    """Answers execute_script() calls from a mapping of script to result, counting the calls per script."""
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = {}
+
+    def execute_script(self, script, *args):
+        self.calls[script] = self.calls.get(script, 0) + 1
+        return self.results[script]
+
+
+class FakeMESTable(MESTable):
+    """A MESTable bound to a fake session, whose rows come from a list instead of scrolling the page."""
+
+    def __init__(self, headers, rows):
+        self.rows = rows
+        self.row_reads = 0
+        self._id = "mes-table"
+        driver = ScriptDriver({MESTable.HEADERS_SCRIPT: {"aria": True, "columns": headers, "headers": headers}})
+        self.session = SimpleNamespace(driver=driver, wait=WebDriverWait(driver, 1, poll_frequency=0.01))
+
+    def _readAllRows(self, timeout_in_seconds=None):
+        self.row_reads += 1
+        return self.rows
+
+
+class TestMESTable:
+
+    def test_headers_are_read_without_the_rows(self):
+        table = FakeMESTable(["Work Order", "State"], [])
+        assert table.getHeaderTexts() == ["Work Order", "State"]
+        assert table.row_reads == 0
+
+    def test_rows_are_read_once_until_refreshed(self):
+        table = FakeMESTable(["Work Order", "State"], [["WO-1", "Running"], ["WO-2", "Done"]])
+        assert table.getRowCount() == 2
+        assert table.getColumnTexts("State") == ["Running", "Done"]
+        assert table.findRows(State="Done") == [{"Work Order": "WO-2", "State": "Done"}]
+        assert table.row_reads == 1
+
+        table.rows = [["WO-3", "Held"]]
+        assert table.getRowCount(refresh=True) == 1
+        assert table.row_reads == 2